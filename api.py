@@ -1,7 +1,51 @@
+import urllib.parse
+from typing import Callable
+
+
 class Endpoints:
     info = "info"
     tasks = "tasks"
     robots = "robots"
+    stats = "stats"
+
+
+class Headers:
+    robot_name = "robot_name"
+    robot_id = "robot_id"
+    status = "status"
+    next_cursor = "next_cursor"
+    modification_time = "mod_time"
+    sync_mode = "sync_mode"
+    accept = "Accept"
+    accept_encoding = "Accept-Encoding"
+    content_type = "Content-Type"
+    content_encoding = "Content-Encoding"
+    content_length = "Content-Length"
+    vary = "Vary"
+    etag = "ETag"
+    if_none_match = "If-None-Match"
+
+
+class MockConstants:
+    fail_key = "mock_fail"
+    true = "True"
+    false = "False"
+    max_wait_timeout = 60.0
+
+
+class MediaTypes:
+    json = "application/json"
+    task_columns = "application/x-task-columns"
+
+
+class ContentEncodings:
+    gzip = "gzip"
+    identity = "identity"
+
+
+class SyncModes:
+    full = "full"
+    delta = "delta"
 
 
 class Query:
@@ -32,6 +76,10 @@ class Queries:
     def single_task(task_id: str) -> Query:
         return Query("id", task_id)
 
+    @staticmethod
+    def many_tasks(task_ids: list) -> Query:
+        return Query("ids", ",".join(str(task_id) for task_id in task_ids))
+
     @staticmethod
     def all_tasks() -> Query:
         return Query("q", "all")
@@ -40,13 +88,158 @@ class Queries:
     def recent_tasks() -> Query:
         return Query("q", "recent")
 
+    @staticmethod
+    def modified_since(modification_time: int) -> Query:
+        return Query("since", str(modification_time))
+
+    @staticmethod
+    def watched_tasks(task_ids: list) -> Query:
+        return Query("watch", ",".join(str(task_id) for task_id in task_ids))
+
+    @staticmethod
+    def wait_timeout(seconds: float) -> Query:
+        return Query("timeout", str(seconds))
+
+    @staticmethod
+    def clock_advancement() -> Query:
+        return Query("q", "advance_clock")
+
+    @staticmethod
+    def task_advancement() -> Query:
+        return Query("q", "advance")
+
+    @staticmethod
+    def bulk_creation() -> Query:
+        return Query("q", "bulk")
+
+    @staticmethod
+    def page_cursor(task_id: int) -> Query:
+        return Query("cursor", str(task_id))
+
+    @staticmethod
+    def page_limit(limit: int) -> Query:
+        return Query("limit", str(limit))
+
+    @staticmethod
+    def min_creation_time(creation_time: int) -> Query:
+        return Query("min_created", str(creation_time))
+
+    @staticmethod
+    def max_creation_time(creation_time: int) -> Query:
+        return Query("max_created", str(creation_time))
+
+    @staticmethod
+    def min_runs(run_count: int) -> Query:
+        return Query("min_runs", str(run_count))
+
+    @staticmethod
+    def max_runs(run_count: int) -> Query:
+        return Query("max_runs", str(run_count))
+
+    @staticmethod
+    def branch_prefix(prefix: str) -> Query:
+        return Query("branch_prefix", urllib.parse.quote(prefix, safe=""))
+
+    @staticmethod
+    def sort_field(field: str) -> Query:
+        return Query("sort", field)
+
+    @staticmethod
+    def sort_order(descending: bool) -> Query:
+        return Query("order", "desc" if descending else "asc")
+
+    @staticmethod
+    def projection(fields: list) -> Query:
+        return Query("fields", ",".join(fields))
+
+
+class TaskFilter:
+    """
+    Range, prefix, ordering, limit and projection parameters of the Task list query. Ranges
+    include both of their bounds, and None bounds are open. Tasks missing the sort field, like
+    the attempts of unfinished Tasks, come last in either order.
+    """
+
+    sort_fields = ("task_id", "creation_time", "runs", "attempts", "successes")
+
+    def __init__(self, min_creation_time: int = None, max_creation_time: int = None,
+                 min_runs: int = None, max_runs: int = None, branch_prefix: str = None,
+                 sort_field: str = "task_id", descending: bool = False, limit: int = None,
+                 fields: list = None) -> None:
+        """:param fields: names of the Task fields to return; all fields if None."""
+        self.min_creation_time = min_creation_time
+        self.max_creation_time = max_creation_time
+        self.min_runs = min_runs
+        self.max_runs = max_runs
+        self.branch_prefix = branch_prefix
+        self.sort_field = sort_field
+        self.descending = descending
+        self.limit = limit
+        self.fields = fields
+
+    def is_id_ordered(self) -> bool:
+        """:return: whether the Tasks are sorted by ascending id, allowing cursor pagination"""
+        return self.sort_field == "task_id" and not self.descending
+
+    def to_queries(self) -> list:
+        queries = []
+        optional_queries = [(self.min_creation_time, Queries.min_creation_time),
+                            (self.max_creation_time, Queries.max_creation_time),
+                            (self.min_runs, Queries.min_runs),
+                            (self.max_runs, Queries.max_runs),
+                            (self.branch_prefix, Queries.branch_prefix),
+                            (self.limit, Queries.page_limit),
+                            (self.fields, Queries.projection)]
+        for value, make_query in optional_queries:
+            if value is not None:
+                queries.append(make_query(value))
+        if not self.is_id_ordered():
+            queries += [Queries.sort_field(self.sort_field), Queries.sort_order(self.descending)]
+        return queries
+
+    def get_key(self) -> tuple:
+        """:return: hashable value, equal for filters selecting the same Tasks"""
+        return tuple(query.text() for query in self.to_queries())
+
+    @staticmethod
+    def from_query(query: dict) -> "TaskFilter":
+        """
+        :param query: dict of the decoded query string values.
+        :raises ValueError: if a value is invalid.
+        """
+        def get_int(make_query: Callable[[int], Query]) -> int:
+            key = make_query(0).key()
+            return int(query[key]) if key in query else None
+
+        sort_field = query.get(Queries.sort_field("").key(), "task_id")
+        order = query.get(Queries.sort_order(False).key(), "asc")
+        if sort_field not in TaskFilter.sort_fields or order not in ("asc", "desc"):
+            raise ValueError(f"Invalid sort order: {sort_field} {order}")
+        limit = get_int(Queries.page_limit)
+        if limit is not None and limit <= 0:
+            raise ValueError(f"Invalid limit: {limit}")
+        fields_key = Queries.projection([]).key()
+
+        return TaskFilter(min_creation_time=get_int(Queries.min_creation_time),
+                          max_creation_time=get_int(Queries.max_creation_time),
+                          min_runs=get_int(Queries.min_runs),
+                          max_runs=get_int(Queries.max_runs),
+                          branch_prefix=query.get(Queries.branch_prefix("").key()),
+                          sort_field=sort_field,
+                          descending=order == "desc",
+                          limit=limit,
+                          fields=query[fields_key].split(",") if fields_key in query else None)
+
 
 class RequestUrl:
-    def __init__(self, root: str, endpoint: str, query: Query = None):
+    def __init__(self, root: str, endpoint: str, query: Query = None, extra_queries: list = None):
         self._root = root
         self._endpoint = endpoint
         self._query = query
+        self._extra_queries = [] if extra_queries is None else extra_queries
         self._text = f"{root}/{endpoint}" if query is None else f"{root}/{endpoint}?{query}"
+        for extra_query in self._extra_queries:
+            self._text += f"&{extra_query}"
 
     def __repr__(self) -> str:
         return self.text()
@@ -60,6 +253,9 @@ class RequestUrl:
     def query(self) -> Query:
         return self._query
 
+    def extra_queries(self) -> list:
+        return self._extra_queries
+
     def text(self) -> str:
         return self._text
 
@@ -73,14 +269,66 @@ class RequestUrls:
     def get_robots(server_address: str) -> RequestUrl:
         return RequestUrl(server_address, Endpoints.robots, None)
 
+    @staticmethod
+    def get_fleet_stats(server_address: str) -> RequestUrl:
+        return RequestUrl(server_address, Endpoints.stats, None)
+
     @staticmethod
     def get_single_task(server_address: str, task_id: int) -> RequestUrl:
         return RequestUrl(server_address, Endpoints.tasks, Queries.single_task(str(task_id)))
 
     @staticmethod
-    def get_all_tasks(server_address: str) -> RequestUrl:
-        return RequestUrl(server_address, Endpoints.tasks, Queries.all_tasks())
+    def get_many_tasks(server_address: str, task_ids: list) -> RequestUrl:
+        return RequestUrl(server_address, Endpoints.tasks, Queries.many_tasks(task_ids))
+
+    @staticmethod
+    def get_all_tasks(server_address: str, task_filter: TaskFilter = None) -> RequestUrl:
+        filter_queries = None if task_filter is None else task_filter.to_queries()
+        return RequestUrl(server_address, Endpoints.tasks, Queries.all_tasks(), filter_queries)
+
+    @staticmethod
+    def get_task_page(server_address: str, cursor: int, limit: int,
+                      task_filter: TaskFilter = None) -> RequestUrl:
+        """
+        :param cursor: id of the last Task from the previous page, None for the first page.
+        :param task_filter: filter without a limit, sorting Tasks by ascending id.
+        """
+        page_queries = [Queries.page_limit(limit)]
+        if cursor is not None:
+            page_queries.insert(0, Queries.page_cursor(cursor))
+        if task_filter is not None:
+            page_queries += task_filter.to_queries()
+        return RequestUrl(server_address, Endpoints.tasks, Queries.all_tasks(), page_queries)
+
+    @staticmethod
+    def get_recent_tasks(server_address: str, modification_time: int) -> RequestUrl:
+        """:param modification_time: time of the last sync, None for a full sync."""
+        since_queries = [] if modification_time is None else \
+            [Queries.modified_since(modification_time)]
+        return RequestUrl(server_address, Endpoints.tasks, Queries.recent_tasks(), since_queries)
+
+    @staticmethod
+    def watch_tasks(server_address: str, task_ids: list, modification_time: int,
+                    timeout: float) -> RequestUrl:
+        """:param modification_time: time after which changes are awaited; None for no waiting."""
+        watch_queries = [Queries.wait_timeout(timeout)]
+        if modification_time is not None:
+            watch_queries.insert(0, Queries.modified_since(modification_time))
+        return RequestUrl(server_address, Endpoints.tasks, Queries.watched_tasks(task_ids),
+                          watch_queries)
 
     @staticmethod
     def create_task(server_address: str) -> RequestUrl:
         return RequestUrl(server_address, Endpoints.tasks, None)
+
+    @staticmethod
+    def create_many_tasks(server_address: str) -> RequestUrl:
+        return RequestUrl(server_address, Endpoints.tasks, Queries.bulk_creation())
+
+    @staticmethod
+    def advance_task(server_address: str) -> RequestUrl:
+        return RequestUrl(server_address, Endpoints.tasks, Queries.task_advancement())
+
+    @staticmethod
+    def advance_clock(server_address: str) -> RequestUrl:
+        return RequestUrl(server_address, Endpoints.info, Queries.clock_advancement())
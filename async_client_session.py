@@ -0,0 +1,65 @@
+import asyncio
+import concurrent.futures
+from typing import Any, Callable
+
+from client_session import ClientSession
+from exceptions import ExecutionError
+from task import Task
+
+
+class AsyncClientSession:
+    """
+    Coroutine interface of a ClientSession, for fanning out many requests at once.
+
+    Requests run on worker threads, at most max_concurrency at a time; the others wait for a
+    free thread. A request running longer than timeout seconds raises ExecutionError; its thread
+    is left to finish in the background. Usable from any number of event loops in turn.
+    """
+
+    def __init__(self, session: ClientSession, max_concurrency: int = 16,
+                 timeout: float = 10.0) -> None:
+        self._session = session
+        self._timeout = timeout
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def get_address(self) -> str:
+        return self._session.get_address()
+
+    def close(self) -> None:
+        """Releases the worker threads without waiting for timed out requests."""
+        self._executor.shutdown(wait=False)
+
+    async def get_server_modification_time(self, simulate_failure: bool = False) -> int:
+        return await self._run(self._session.get_server_modification_time, simulate_failure)
+
+    async def request_task_creation(self, robot_name: str, git_branch: str, run_count: int,
+                                    simulate_failure: bool = False) -> int:
+        """:return: Task id for the created Task"""
+        return await self._run(self._session.request_task_creation,
+                               robot_name, git_branch, run_count, simulate_failure)
+
+    async def get_robot_dict(self, simulate_failure: bool) -> dict:
+        return await self._run(self._session.get_robot_dict, simulate_failure)
+
+    async def get_task(self, task_id: int, simulate_failure: bool) -> Task:
+        return await self._run(self._session.get_task, task_id, simulate_failure)
+
+    async def get_many_tasks(self, robot_name: str, status: str, simulate_failure: bool) -> list:
+        """:return: list of Tasks"""
+        return await self._run(self._session.get_many_tasks, robot_name, status, simulate_failure)
+
+    async def _run(self, method: Callable, *arguments: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+
+        def run() -> Any:
+            loop.call_soon_threadsafe(started.set)
+            return method(*arguments)
+
+        request = loop.run_in_executor(self._executor, run)
+        # The timeout starts once a thread takes the request, not while it waits for one.
+        await started.wait()
+        try:
+            return await asyncio.wait_for(request, self._timeout)
+        except asyncio.TimeoutError:
+            raise ExecutionError(f"HTTP request timed out after {self._timeout} s.")
@@ -0,0 +1,138 @@
+import collections
+import concurrent.futures
+import json
+from typing import Any, Iterable, TextIO
+
+from commands.command_base import ItemResult
+from commands.command_registry import CommandRegistry
+from exceptions import ExecutionError, ParserExitWarning, ParsingError
+from task import Task
+
+
+class BatchRunner:
+    """
+    Runs command lines without prompts, printing one JSON object per command.
+
+    Read-only commands run concurrently on worker threads, sharing the client session. Commands
+    changing the session or the Server state wait for all earlier commands to finish, and the
+    later commands wait for them. Results are printed in the order of the command lines.
+    """
+
+    session_free_commands = {"connect", "stats"}
+    exclusive_commands = {"connect", "create_task", "create_tasks", "advance_task",
+                          "advance_clock"}
+
+    def __init__(self, commands: CommandRegistry, output: TextIO, worker_count: int = 8,
+                 keep_going: bool = False) -> None:
+        """:param keep_going: run the remaining commands after one fails, instead of stopping."""
+        self._commands = commands
+        self._output = output
+        self._worker_count = worker_count
+        self._keep_going = keep_going
+        self._client_session = None
+        self._failure_count = 0
+
+    def run(self, lines: Iterable[str]) -> int:
+        """:return: number of failed commands"""
+        pending_results = collections.deque()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._worker_count) as executor:
+            for line_number, line in enumerate(lines, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                command_name, _, arguments = line.partition(" ")
+                if command_name == "exit":
+                    break
+
+                if command_name in self.exclusive_commands:
+                    self._print_results(pending_results, wait_count=len(pending_results))
+                    if self._should_stop():
+                        break
+                    pending_results.append((line_number, line,
+                                            self._execute_now(command_name, arguments)))
+                else:
+                    pending_results.append((line_number, line, executor.submit(
+                        self._execute, command_name, arguments)))
+                self._print_results(pending_results, wait_count=0)
+                if self._should_stop():
+                    break
+
+            self._print_results(pending_results, wait_count=len(pending_results))
+        return self._failure_count
+
+    def _execute(self, command_name: str, arguments: str) -> Any:
+        """:return: JSON-compatible command result"""
+        if command_name not in self._commands:
+            raise ExecutionError(f"Unknown command: {command_name}")
+        command = self._commands[command_name]
+        if command_name == "connect":
+            result = command.execute(arguments)
+        elif command_name in self.session_free_commands:
+            result = command.execute(arguments, self._client_session)
+        elif self._client_session is None:
+            raise ExecutionError("Server connection required. Call \"connect\" first.")
+        else:
+            result = command.execute(arguments, self._client_session)
+
+        if command_name == "connect":
+            self._client_session = result
+            return {"address": result.get_address()}
+        return self._to_json_value(result)
+
+    def _execute_now(self, command_name: str, arguments: str) -> concurrent.futures.Future:
+        """:return: completed future, for exclusive commands run on the reading thread"""
+        future = concurrent.futures.Future()
+        try:
+            future.set_result(self._execute(command_name, arguments))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+    def _print_results(self, pending_results: collections.deque, wait_count: int) -> None:
+        """Prints the results of the oldest commands that are done, and of wait_count at least."""
+        while pending_results and (wait_count > 0 or pending_results[0][2].done()):
+            if self._should_stop():
+                # Commands after the failed one may have run already, but are not reported.
+                for _, _, future in pending_results:
+                    future.cancel()
+                pending_results.clear()
+                break
+            line_number, line, future = pending_results.popleft()
+            wait_count -= 1
+            record = {"line": line_number, "command": line}
+            try:
+                record["result"] = future.result()
+            except Exception as error:
+                # Unexpected errors are recorded too, so that one failing line does not end the run.
+                record["error"] = self._describe_error(error)
+                self._failure_count += 1
+            self._output.write(json.dumps(record) + "\n")
+        self._output.flush()
+
+    def _should_stop(self) -> bool:
+        return self._failure_count > 0 and not self._keep_going
+
+    @staticmethod
+    def _describe_error(error: Exception) -> str:
+        if isinstance(error, ExecutionError):
+            return error.message
+        if isinstance(error, ParsingError):
+            return "Invalid command arguments; type \"command --help\" for usage details."
+        if isinstance(error, ParserExitWarning):
+            return "Command exited without a result."
+        return f"Unexpected error: {type(error).__name__}: {error}"
+
+    @staticmethod
+    def _to_json_value(value: Any) -> Any:
+        """:return: the value with Tasks turned into dicts and iterators into lists"""
+        if isinstance(value, Task):
+            return value.to_dict()
+        if isinstance(value, ItemResult):
+            if value.error is not None:
+                return {"item": value.item, "error": value.error}
+            return {"item": value.item, "value": BatchRunner._to_json_value(value.value)}
+        if isinstance(value, dict):
+            return {key: BatchRunner._to_json_value(item) for key, item in value.items()}
+        if isinstance(value, (str, int, float, bool)) or value is None:
+            return value
+        return [BatchRunner._to_json_value(item) for item in value]
@@ -0,0 +1,118 @@
+"""
+Benchmarks of the client and mock Server hot paths.
+
+Run from the repository root:
+    python -m bench run -o results.json
+    python -m bench compare baseline.json results.json
+"""
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+
+from bench.scenarios import scenarios
+
+
+def summarize(durations: list) -> dict:
+    """:return: sample count, mean and nearest-rank percentiles of the durations, in seconds"""
+    ordered = sorted(durations)
+
+    def percentile(rank: float) -> float:
+        return ordered[min(len(ordered) - 1, int(rank / 100 * len(ordered)))]
+
+    return {"samples": len(ordered),
+            "mean": sum(ordered) / len(ordered),
+            "min": ordered[0],
+            "p50": percentile(50),
+            "p90": percentile(90),
+            "p99": percentile(99),
+            "max": ordered[-1]}
+
+
+def get_revision() -> str:
+    """:return: current git commit hash, or None outside of a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(arguments: argparse.Namespace) -> int:
+    selected_scenarios = arguments.scenario if arguments.scenario else list(scenarios)
+    results = {}
+    for scenario_name in selected_scenarios:
+        print(f"Running {scenario_name}...", file=sys.stderr)
+        for result_name, durations in scenarios[scenario_name](arguments.seed,
+                                                               arguments.samples).items():
+            results[result_name] = summarize(durations)
+
+    report = {"revision": get_revision(),
+              "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+              "python": platform.python_version(),
+              "seed": arguments.seed,
+              "results": results}
+    report_text = json.dumps(report, indent=2)
+    if arguments.output is None:
+        print(report_text)
+    else:
+        with open(arguments.output, "w") as output_file:
+            output_file.write(report_text + "\n")
+    return 0
+
+
+def compare(arguments: argparse.Namespace) -> int:
+    """:return: 1 if any result got slower than the threshold allows, 0 otherwise"""
+    with open(arguments.baseline) as baseline_file, open(arguments.current) as current_file:
+        baseline_results = json.load(baseline_file)["results"]
+        current_results = json.load(current_file)["results"]
+
+    regression_count = 0
+    for result_name in sorted(baseline_results.keys() & current_results.keys()):
+        baseline_value = baseline_results[result_name][arguments.statistic]
+        current_value = current_results[result_name][arguments.statistic]
+        change = current_value / baseline_value - 1 if baseline_value > 0 else 0.0
+        is_regression = change > arguments.threshold
+        regression_count += is_regression
+        print(f"{'REGRESSION' if is_regression else 'ok':<10} {result_name:<40} "
+              f"{baseline_value * 1000:10.3f} ms -> {current_value * 1000:10.3f} ms "
+              f"({change:+.1%})")
+
+    print(f"{regression_count} regression(s) above {arguments.threshold:.0%} "
+          f"in {arguments.statistic}")
+    return 1 if regression_count else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Runs scenarios and reports their timings.")
+    run_parser.add_argument("-s", "--scenario", action="append", choices=list(scenarios),
+                            help="Scenario to run; can be given many times. Runs all by default.")
+    run_parser.add_argument("-n", "--samples", type=int, default=50,
+                            help="Number of timed calls in each scenario.")
+    run_parser.add_argument("--seed", type=int, default=0,
+                            help="Seed of the simulated data and requests.")
+    run_parser.add_argument("-o", "--output", help="JSON file for the report; stdout by default.")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = subparsers.add_parser("compare",
+                                           help="Compares two reports to find regressions.")
+    compare_parser.add_argument("baseline", help="Report of the reference revision.")
+    compare_parser.add_argument("current", help="Report of the revision under test.")
+    compare_parser.add_argument("--statistic", default="p50",
+                                choices=["mean", "min", "p50", "p90", "p99", "max"])
+    compare_parser.add_argument("--threshold", type=float, default=0.1,
+                                help="Relative slowdown reported as regression.")
+    compare_parser.set_defaults(handler=compare)
+
+    arguments = parser.parse_args()
+    return arguments.handler(arguments)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
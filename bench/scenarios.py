@@ -0,0 +1,143 @@
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Callable
+
+import task_codec
+from client_session import ClientSession
+from mock_simulation import SimulationConfig
+from task import dict_list_to_task_list
+from transport import TransportConfig
+from user_interface import UserInterface
+
+# Session of each HTTP throughput worker process, connected by the pool initializer.
+_worker_session = None
+
+
+def time_calls(function: Callable[[], object], sample_count: int) -> list:
+    """:return: list of durations of the function calls, in seconds"""
+    durations = []
+    for _ in range(sample_count):
+        start_time = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start_time)
+    return durations
+
+
+def make_session(seed: int, task_count: int, robot_count: int = 20) -> ClientSession:
+    simulation = SimulationConfig(seed=seed, robot_count=robot_count, task_count=task_count)
+    return ClientSession("bench.local", 5000, False, simulation=simulation)
+
+
+def bench_get_task(seed: int, sample_count: int) -> dict:
+    session = make_session(seed, task_count=10000)
+    task_ids = random.Random(seed)
+    return {"get_task": time_calls(lambda: session.get_task(task_ids.randint(1, 10000), False),
+                                   sample_count)}
+
+
+def bench_get_many_tasks(seed: int, sample_count: int) -> dict:
+    """Covers growing Task counts and filters of decreasing selectivity."""
+    results = {}
+    for task_count in [1000, 10000, 50000]:
+        session = make_session(seed, task_count)
+        robot_name = session.get_robot_dict(False)[0]
+        filters = {"all": (None, None),
+                   "robot": (robot_name, None),
+                   "robot_status": (robot_name, "finished")}
+        for filter_name, (robot, status) in filters.items():
+            results[f"get_many_tasks/{task_count}/{filter_name}"] = time_calls(
+                lambda: session.get_many_tasks(robot, status, False), sample_count)
+    return results
+
+
+def bench_task_creation(seed: int, sample_count: int) -> dict:
+    session = make_session(seed, task_count=1000)
+    robot_name = session.get_robot_dict(False)[0]
+    return {"request_task_creation": time_calls(
+        lambda: session.request_task_creation(robot_name, "bench_branch", 10), sample_count)}
+
+
+def bench_deserialization(seed: int, sample_count: int) -> dict:
+    session = make_session(seed, task_count=10000)
+    task_dicts = [task.to_dict() for task in session.get_many_tasks(None, None, False)]
+    task_columns = task_codec.encode_task_dicts(task_dicts)
+    return {"dict_list_to_task_list/10000": time_calls(
+                lambda: dict_list_to_task_list(task_dicts), sample_count),
+            "decode_task_columns/10000": time_calls(
+                lambda: task_codec.decode_tasks(task_columns), sample_count)}
+
+
+def bench_command_dispatch(seed: int, sample_count: int) -> dict:
+    user_interface = UserInterface()
+    with contextlib.redirect_stdout(io.StringIO()):
+        user_interface.onecmd(f"connect --simulate-tasks 1000 --seed {seed}")
+        durations = time_calls(lambda: user_interface.onecmd("get_task 1"), sample_count)
+    return {"onecmd/get_task": durations}
+
+
+def bench_startup(seed: int, sample_count: int) -> dict:
+    """Measures new processes, as the program is started once per cron job."""
+    repository_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def run_process(arguments: list, script: str = None) -> None:
+        subprocess.run([sys.executable] + arguments, cwd=repository_path, input=script,
+                       capture_output=True, text=True, check=True)
+
+    return {"startup/import": time_calls(lambda: run_process(["-c", "import run"]),
+                                         sample_count),
+            "startup/script_get_robots": time_calls(
+                lambda: run_process(["run.py", "--script", "-"],
+                                    f"connect --simulate-tasks 100 --seed {seed}\nget_robots\n"),
+                sample_count)}
+
+
+def bench_http_throughput(seed: int, sample_count: int) -> dict:
+    """
+    Runs the mock Server over HTTP in its own process, and times batches of Task reads sent
+    concurrently by growing numbers of client processes. Each process reads the same number of
+    Tasks, so batch durations stay flat as long as the stack scales with the processes.
+    """
+    repository_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    server_process = subprocess.Popen([sys.executable, "mock_http_server.py", "--port", "0",
+                                       "--simulate-tasks", "10000", "--seed", str(seed)],
+                                      cwd=repository_path, stdout=subprocess.PIPE, text=True)
+    try:
+        port = int(server_process.stdout.readline().rsplit(":", 1)[1])
+        results = {}
+        for process_count in [1, 2, 4]:
+            with multiprocessing.Pool(process_count, initializer=_connect_worker,
+                                      initargs=(port,)) as pool:
+                worker_seeds = [[seed, worker] for worker in range(process_count)]
+                results[f"http_get_task/{process_count}_processes"] = time_calls(
+                    lambda: pool.map(_read_tasks_in_worker, worker_seeds), sample_count)
+        return results
+    finally:
+        server_process.terminate()
+        server_process.wait()
+
+
+def _connect_worker(port: int) -> None:
+    global _worker_session
+    _worker_session = ClientSession("127.0.0.1", port, False,
+                                    transport_config=TransportConfig(use_real_http=True))
+
+
+def _read_tasks_in_worker(worker_seed: list) -> None:
+    task_ids = random.Random(str(worker_seed))
+    for _ in range(50):
+        _worker_session.get_task(task_ids.randint(1, 10000), False)
+
+
+scenarios = {"get_task": bench_get_task,
+             "get_many_tasks": bench_get_many_tasks,
+             "task_creation": bench_task_creation,
+             "deserialization": bench_deserialization,
+             "command_dispatch": bench_command_dispatch,
+             "startup": bench_startup,
+             "http_throughput": bench_http_throughput}
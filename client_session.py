@@ -1,90 +1,543 @@
+import time
 import urllib.parse
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterator, Union
 
 import requests
 
-from api import RequestUrls
+import task_codec
+from api import Headers, MediaTypes, MockConstants, RequestUrls, SyncModes, TaskFilter
 from exceptions import ExecutionError
+from instrumentation import MetricsRegistry, registry
+from robot_registry import RobotRegistry
 from task import Task, dict_to_task, dict_list_to_task_list
-from server_mock import ServerMock, MockConstants
+from task_cache import TaskCache
+from task_replica import TaskReplica
+from transport import Transport, TransportConfig, get_shared_transport
+from validator_store import ValidatorStore
+
+if TYPE_CHECKING:
+    from local_store import LocalTaskStore
+    from mock_simulation import SimulationConfig
+    from task_table import TaskTable
 
 
 class ClientSession:
-    def __init__(self, host: str, port: int, simulate_failure: bool) -> None:
-        self._server_address = f"https-mock://{host}:{port}"
-        self._session = self._create_mock_server_session(self._server_address)
+    def __init__(self, host: str, port: int, simulate_failure: bool,
+                 cache: TaskCache = None, store: "LocalTaskStore" = None,
+                 sync_interval: float = 5.0, simulation: "SimulationConfig" = None,
+                 metrics: MetricsRegistry = None, transport_config: TransportConfig = None,
+                 task_list_format: str = MediaTypes.task_columns) -> None:
+        """
+        :param store: persistent store to load the Task replica from and to save it to. With it,
+            Tasks are served from the replica, resynced at most every sync_interval seconds.
+        :param simulation: configuration of the simulation run by the mock Server.
+        :param metrics: registry recording request phase timings, response sizes and status codes;
+            the shared registry by default.
+        :param transport_config: connection pool, retry, timeout and compression settings, and
+            whether to use real HTTP instead of a mock Server.
+        :param task_list_format: media type in which Task lists are requested; the columnar
+            encoding by default, falling back to JSON if the Server does not support it.
+        """
+        transport_config = TransportConfig() if transport_config is None else transport_config
+        self._server_address = f"{transport_config.get_scheme()}://{host}:{port}"
+        self._transport = self._create_transport(self._server_address, transport_config,
+                                                 simulation)
+        self._metrics = registry if metrics is None else metrics
+        self._task_list_accept = MediaTypes.json if task_list_format == MediaTypes.json \
+            else f"{task_list_format}, {MediaTypes.json};q=0.5"
+        self._cache = cache
+        self._validators = ValidatorStore()
+        self._robot_registry_entry = (None, None)
+        self._replica = TaskReplica()
+        self._store = store
+        self._sync_interval = sync_interval
+        self._last_sync_time = None
         self._test_server_connection(simulate_failure)
+        if store is not None:
+            self._load_store(simulate_failure)
 
     def get_address(self) -> str:
         return self._server_address
 
+    def get_metrics(self) -> MetricsRegistry:
+        """:return: registry recording the requests of the session"""
+        return self._metrics
+
+    def get_cache_stats(self) -> dict:
+        """:return: Task cache counters, or None if caching is disabled"""
+        if self._cache is None:
+            return None
+        return self._cache.get_stats()
+
     def get_server_modification_time(self, simulate_failure: bool = False) -> int:
         headers = self._make_basic_request_header(simulate_failure)
         request_url = RequestUrls.get_modification_time(self._server_address).text()
-        response = self._session.get(url=request_url, headers=headers)
-        self._abort_if_response_is_bad(response)
+        response = self._send("GET", request_url, headers)
         return int(response.text)
 
-    def request_task_creation(self, robot_name: str, git_branch: str, run_count: int,
+    def request_task_creation(self, robot: Union[str, int], git_branch: str, run_count: int,
                               simulate_failure: bool = False) -> int:
-        """:return: Task id for the created Task"""
-        request_data = {"robot_name": robot_name, "branch": git_branch, "runs": run_count}
+        """
+        :param robot: name of the robot, or its id if int.
+        :return: Task id for the created Task
+        """
+        request_data = {"robot_id" if isinstance(robot, int) else "robot_name": robot,
+                        "branch": git_branch,
+                        "runs": run_count}
         request_url = RequestUrls.create_task(self._server_address).text()
-        response = self._session.post(url=request_url,
-                                      headers=self._make_basic_request_header(simulate_failure),
-                                      json=request_data)
-
-        self._abort_if_response_is_bad(response)
+        request_headers = self._make_basic_request_header(simulate_failure)
+        response = self._send("POST", request_url, request_headers, request_data)
+        if self._cache is not None:
+            self._cache.clear()
         return int(response.text)
 
+    def request_bulk_task_creation(self, task_details: list,
+                                   simulate_failure: bool = False) -> list:
+        """
+        :param task_details: list of dicts with robot_name or robot_id, branch and runs keys.
+        :return: list of (Task id, None) or (None, rejection reason) tuples, one per record
+        """
+        request_url = RequestUrls.create_many_tasks(self._server_address).text()
+        request_headers = self._make_basic_request_header(simulate_failure)
+        response = self._send("POST", request_url, request_headers, task_details)
+        if self._cache is not None:
+            self._cache.clear()
+        return [(result.get("task_id"), result.get("error"))
+                for result in self._decode_json(response)]
+
     def get_robot_dict(self, simulate_failure: bool) -> dict:
+        return self.get_robot_registry(simulate_failure).to_dict()
+
+    def get_robot_registry(self, simulate_failure: bool,
+                           modification_time: int = None) -> RobotRegistry:
+        """
+        With a store, or a Server modification time known to the caller, the registry is reused
+        until that time changes, without any request. With a store, it is the time of the last
+        Task sync. Otherwise the registry is revalidated with its entity tag, so the robot list
+        is downloaded again only if it changed.
+
+        :param modification_time: Server modification time the caller has just learned, e.g.
+            by syncing.
+        :return: registry of the robot names and ids
+        """
+        if simulate_failure:
+            return self._request_robot_registry(simulate_failure)
+
+        if self._store is not None:
+            self._sync_if_stale(simulate_failure)
+            modification_time = self._replica.get_modification_time()
+        elif modification_time is None:
+            return self._request_robot_registry(simulate_failure)
+        cached_modification_time, robot_registry = self._robot_registry_entry
+        if robot_registry is not None and cached_modification_time == modification_time:
+            return robot_registry
+
+        robot_registry = None
+        if self._store is not None:
+            robot_dict = self._store.load_robots(self._server_address, modification_time)
+            if robot_dict:
+                robot_registry = RobotRegistry.from_dict(robot_dict)
+        if robot_registry is None:
+            robot_registry = self._request_robot_registry(simulate_failure)
+            if self._store is not None and modification_time is not None:
+                self._store.save_robots(self._server_address, robot_registry.to_dict(),
+                                        modification_time)
+        # Replaced as a whole, so that other threads never see a registry with a wrong time.
+        self._robot_registry_entry = (modification_time, robot_registry)
+        return robot_registry
+
+    def get_fleet_stats(self, simulate_failure: bool) -> dict:
+        """
+        :return: dict with the overall summary, the Task count of each status, and the summaries
+            per robot id and per branch, aggregated by the Server over all Tasks
+        """
         request_headers = self._make_basic_request_header(simulate_failure)
-        response = self._session.get(url=RequestUrls.get_robots(self._server_address).text(),
-                                     headers=request_headers)
+        request_url = RequestUrls.get_fleet_stats(self._server_address).text()
 
-        self._abort_if_response_is_bad(response)
+        def decode(response: requests.Response) -> dict:
+            fleet_stats = self._decode_json(response)
+            # JSON object keys are strings, so the robot ids are restored.
+            fleet_stats["robots"] = {int(robot_id): summary
+                                     for robot_id, summary in fleet_stats["robots"].items()}
+            return fleet_stats
 
-        robot_list = response.text.split()
-        robot_dict = {index: robot_name for index, robot_name in enumerate(robot_list)}
-        return robot_dict
+        return self._get_validated(request_url, request_headers, decode)
 
     def get_task(self, task_id: int, simulate_failure: bool) -> Task:
+        if self._store is not None and not simulate_failure:
+            self._sync_if_stale(simulate_failure)
+            task = self._replica.get(task_id)
+            if task is not None:
+                return task
+
+        return self._read_through_cache(("task", task_id),
+                                        lambda: self._request_task(task_id, simulate_failure),
+                                        simulate_failure)
+
+    def get_tasks(self, task_ids: list, simulate_failure: bool) -> tuple:
+        """
+        Requests all Tasks that are not cached in a single round trip.
+
+        :return: list of found Tasks in the requested order, and list of ids of missing Tasks
+        """
+        found_tasks = {}
+        if self._cache is not None and not simulate_failure:
+            for task_id in task_ids:
+                task = self._cache.get(("task", task_id), self.get_server_modification_time)
+                if task is not None:
+                    found_tasks[task_id] = task
+
+        missing_ids = []
+        uncached_ids = [task_id for task_id in task_ids if task_id not in found_tasks]
+        if uncached_ids:
+            requested_tasks, missing_ids = self._request_task_batch(uncached_ids, simulate_failure)
+            for task in requested_tasks:
+                found_tasks[task.task_id] = task
+                if self._cache is not None and not simulate_failure:
+                    self._cache.put(("task", task.task_id), task)
+
+        return [found_tasks[task_id] for task_id in task_ids if task_id in found_tasks], missing_ids
+
+    def get_many_tasks(self, robot_name: Union[str, int], status: str, simulate_failure: bool,
+                       as_table: bool = False,
+                       task_filter: TaskFilter = None) -> Union[list, "TaskTable"]:
+        """
+        :param robot_name: name of the robot, its id if int, or None for all robots.
+        :param as_table: bulk mode; the response is decoded into a columnar TaskTable
+            without creating Task objects. Not available with a projection.
+        :param task_filter: range filters, ordering, limit and projection applied by the Server.
+        :return: list of Tasks, list of dicts with the projected fields, or TaskTable in bulk mode
+        """
+        if as_table and task_filter is not None and task_filter.fields is not None:
+            raise ExecutionError("Projected Task fields cannot be read as a table.")
+        filter_key = None if task_filter is None else task_filter.get_key()
+        tasks = self._read_through_cache(
+            ("many", robot_name, status, as_table, filter_key),
+            lambda: self._request_many_tasks(robot_name, status, simulate_failure, as_table,
+                                             task_filter),
+            simulate_failure)
+        return tasks if as_table else list(tasks)
+
+    def iter_tasks(self, robot_name: Union[str, int], status: str, page_size: int,
+                   simulate_failure: bool, task_filter: TaskFilter = None) -> Iterator:
+        """
+        Queries Tasks page by page, requesting the next page only once the previous one has been
+        consumed.
+
+        :param robot_name: name of the robot, its id if int, or None for all robots.
+        :param task_filter: filter without a limit, sorting Tasks by ascending id.
+        :return: iterator over Tasks, or over dicts with the projected fields
+        """
+        if task_filter is not None and (task_filter.limit is not None or
+                                        not task_filter.is_id_ordered()):
+            raise ExecutionError("Paged queries cannot be limited or sorted; "
+                                 "query all Tasks at once instead.")
+        filter_key = None if task_filter is None else task_filter.get_key()
+        cursor = None
+        while True:
+            page_tasks, cursor = self._read_through_cache(
+                ("page", robot_name, status, cursor, page_size, filter_key),
+                lambda: self._request_task_page(robot_name, status, cursor, page_size,
+                                                simulate_failure, task_filter),
+                simulate_failure)
+            yield from page_tasks
+            if cursor is None:
+                return
+
+    def wait_for_tasks(self, task_ids: list, timeout: float, since: int = None,
+                       simulate_failure: bool = False) -> tuple:
+        """
+        Long-polls the Server until one of the Tasks changes after the since modification time,
+        or the timeout passes. Without since, returns the current state of all the Tasks at once.
+
+        :return: list of changed Tasks, and the modification time to pass as since in the next call
+        """
+        request_headers = self._make_basic_request_header(simulate_failure)
+        request_url = RequestUrls.watch_tasks(self._server_address, task_ids, since, timeout).text()
+        # The Server holds the request for up to the timeout when waiting for changes.
+        response = self._send("GET", request_url, self._accept_task_lists(request_headers),
+                              server_wait=0 if since is None else timeout)
+
+        return (self._decode_task_list(response),
+                int(response.headers[Headers.modification_time]))
+
+    def advance_mock_task(self, task_id: int, simulate_failure: bool = False) -> Task:
+        """Asks the mock Server to move the Task to its next status."""
+        request_url = RequestUrls.advance_task(self._server_address).text()
+        request_headers = self._make_basic_request_header(simulate_failure)
+        response = self._send("POST", request_url, request_headers, {"task_id": task_id})
+        if self._cache is not None:
+            self._cache.clear()
+        return self._make_task(self._decode_json(response))
+
+    def advance_mock_clock(self, seconds: int, simulate_failure: bool = False) -> int:
+        """
+        Asks the mock Server to move its simulation clock forward.
+
+        :return: number of Task state changes
+        """
+        request_url = RequestUrls.advance_clock(self._server_address).text()
+        request_headers = self._make_basic_request_header(simulate_failure)
+        response = self._send("POST", request_url, request_headers, {"seconds": seconds})
+        if self._cache is not None:
+            self._cache.clear()
+        return int(response.text)
+
+    def sync_tasks(self, simulate_failure: bool = False) -> int:
+        """
+        Brings the local Task replica up to date. Only Tasks created or changed since the last
+        sync are downloaded, and nothing but the modification time if the Server has not changed.
+        A Server behind the replica has lost its history, e.g. by restarting, so all Tasks are
+        downloaded again.
+
+        :return: number of Tasks received
+        """
+        modification_time = self.get_server_modification_time(simulate_failure)
+        self._last_sync_time = time.monotonic()
+        replica_modification_time = self._replica.get_modification_time()
+        if modification_time == replica_modification_time:
+            return 0
+        if replica_modification_time is not None and \
+                modification_time < replica_modification_time:
+            replica_modification_time = None
+
+        request_headers = self._make_basic_request_header(simulate_failure)
+        request_url = RequestUrls.get_recent_tasks(self._server_address,
+                                                   replica_modification_time).text()
+        response = self._send("GET", request_url, self._accept_task_lists(request_headers))
+
+        tasks = self._decode_task_list(response)
+        synced_modification_time = int(response.headers[Headers.modification_time])
+        is_full_sync = response.headers[Headers.sync_mode] == SyncModes.full
+        self._replica.apply_sync(tasks, synced_modification_time, is_full_sync)
+        if self._store is not None:
+            self._store.save_tasks(self._server_address, tasks, synced_modification_time,
+                                   is_full_sync)
+        return len(tasks)
+
+    def get_synced_tasks(self, robot_name: Union[str, int], status: str,
+                         simulate_failure: bool) -> list:
+        """
+        Syncs the local Task replica and queries it instead of the Server.
+
+        :param robot_name: name of the robot, its id if int, or None for all robots.
+        :return: list of Tasks
+        """
+        self.sync_tasks(simulate_failure)
+        robot_id = robot_name
+        if isinstance(robot_name, str):
+            robot_id = self.get_robot_registry(
+                simulate_failure, self._replica.get_modification_time()).get_id(robot_name)
+            if robot_id is None:
+                return []
+        return self._replica.select(robot_id, status)
+
+    def _load_store(self, simulate_failure: bool) -> None:
+        """Fills the Task replica from the store and revalidates it with the Server."""
+        tasks, modification_time = self._store.load_tasks(self._server_address)
+        if modification_time is not None:
+            self._replica.apply_sync(tasks, modification_time, is_full_sync=True)
+        self.sync_tasks(simulate_failure)
+
+    def _sync_if_stale(self, simulate_failure: bool) -> None:
+        if self._last_sync_time is None or \
+                time.monotonic() - self._last_sync_time >= self._sync_interval:
+            self.sync_tasks(simulate_failure)
+
+    def _read_through_cache(self, cache_key: tuple, request: Callable[[], Any],
+                            simulate_failure: bool) -> Any:
+        """Requests meant to fail on the mock Server always bypass the cache."""
+        if self._cache is None or simulate_failure:
+            return request()
+
+        value = self._cache.get(cache_key, self.get_server_modification_time)
+        if value is None:
+            value = request()
+            self._cache.put(cache_key, value)
+        return value
+
+    def _request_robot_registry(self, simulate_failure: bool) -> RobotRegistry:
+        request_headers = self._make_basic_request_header(simulate_failure)
+        request_url = RequestUrls.get_robots(self._server_address).text()
+        return self._get_validated(request_url, request_headers,
+                                   lambda response: RobotRegistry(response.text.split()))
+
+    def _request_task(self, task_id: int, simulate_failure: bool) -> Task:
         request_headers = self._make_basic_request_header(simulate_failure)
         request_url = RequestUrls.get_single_task(self._server_address, task_id).text()
-        response = self._session.get(url=request_url, headers=request_headers)
+        return self._get_validated(request_url, request_headers,
+                                   lambda response: self._make_task(self._decode_json(response)))
+
+    def _request_task_batch(self, task_ids: list, simulate_failure: bool) -> tuple:
+        request_headers = self._make_basic_request_header(simulate_failure)
+        request_url = RequestUrls.get_many_tasks(self._server_address, task_ids).text()
+
+        def decode(response: requests.Response) -> tuple:
+            response_content = self._decode_json(response)
+            return self._make_tasks(response_content["tasks"]), response_content["missing"]
+
+        return self._get_validated(request_url, request_headers, decode)
+
+    def _request_many_tasks(self, robot_name: str, status: str, simulate_failure: bool,
+                            as_table: bool, task_filter: TaskFilter) -> Union[list, "TaskTable"]:
+        request_headers = self._make_task_filter_header(robot_name, status, simulate_failure)
+        request_url = RequestUrls.get_all_tasks(self._server_address, task_filter).text()
+        return self._get_validated(
+            request_url, self._accept_task_lists(request_headers),
+            lambda response: self._decode_task_list(response, task_filter, as_table),
+            variant="table" if as_table else "list")
+
+    def _request_task_page(self, robot_name: str, status: str, cursor: int, page_size: int,
+                           simulate_failure: bool, task_filter: TaskFilter) -> tuple:
+        """:return: list of Tasks and the cursor of the next page, or None if it is the last one"""
+        request_headers = self._make_task_filter_header(robot_name, status, simulate_failure)
+        request_url = RequestUrls.get_task_page(self._server_address, cursor, page_size,
+                                                task_filter).text()
+
+        def decode(response: requests.Response) -> tuple:
+            next_cursor = response.headers.get(Headers.next_cursor)
+            next_cursor = None if next_cursor is None else int(next_cursor)
+            return self._decode_task_list(response, task_filter), next_cursor
+
+        return self._get_validated(request_url, self._accept_task_lists(request_headers), decode)
+
+    def _send(self, method: str, request_url: str, headers: dict,
+              json: Any = None, server_wait: float = 0) -> requests.Response:
+        """
+        Sends the request and records its round trip time, status code, response size and retries.
+
+        :param server_wait: seconds the Server may hold the request before responding.
+        :return: response, if it was successful
+        """
+        labels = {"endpoint": self._get_endpoint(request_url), "method": method}
+        try:
+            with self._metrics.time("client_request_seconds", labels):
+                response, retry_count = self._transport.request(method, request_url, headers,
+                                                                json, server_wait)
+        except requests.RequestException as error:
+            self._metrics.increment("client_request_errors_total", labels)
+            raise ExecutionError(f"HTTP request failed: {error}")
+
+        self._metrics.increment("client_responses_total",
+                                dict(labels, status=response.status_code))
+        # The Content-Length counts the bytes on the wire, before any decompression.
+        self._metrics.observe("client_response_bytes",
+                              int(response.headers.get(Headers.content_length,
+                                                       len(response.content))),
+                              labels, MetricsRegistry.size_bounds)
+        if retry_count > 0:
+            self._metrics.increment("client_retries_total", labels, retry_count)
 
         self._abort_if_response_is_bad(response)
+        return response
 
-        return dict_to_task(response.json())
+    def _get_validated(self, request_url: str, headers: dict,
+                       decode: Callable[[requests.Response], Any], variant: Hashable = None) -> Any:
+        """
+        Sends a conditional GET request with the entity tag of the last response to the same
+        request, and reuses the value decoded from that response if the Server answers 304.
 
-    def get_many_tasks(self, robot_name: str, status: str, simulate_failure: bool) -> list:
-        """:return: list of Tasks"""
-        request_headers = self._make_basic_request_header(simulate_failure)
-        request_headers["robot_name"] = robot_name
-        request_headers["status"] = status
-        request_url = RequestUrls.get_all_tasks(self._server_address).text()
-        response = self._session.get(url=request_url, headers=request_headers)
+        :param decode: callable making the returned value from a full response.
+        :param variant: distinguishes decoders making different values from the same response.
+        """
+        key = (request_url, tuple(sorted(headers.items())), variant)
+        entity_tag, value = self._validators.get(key)
+        if entity_tag is not None:
+            headers = dict(headers, **{Headers.if_none_match: entity_tag})
+        response = self._send("GET", request_url, headers)
+        if response.status_code == requests.codes.not_modified:
+            return value
+
+        value = decode(response)
+        if Headers.etag in response.headers:
+            self._validators.put(key, response.headers[Headers.etag], value)
+        return value
+
+    def _accept_task_lists(self, headers: dict) -> dict:
+        headers[Headers.accept] = self._task_list_accept
+        return headers
 
-        ClientSession._abort_if_response_is_bad(response)
+    def _decode_task_list(self, response: requests.Response, task_filter: TaskFilter = None,
+                          as_table: bool = False) -> Union[list, "TaskTable"]:
+        """
+        Columnar responses are decoded right into Tasks or table columns, without creating dicts.
 
-        return dict_list_to_task_list(response.json())
+        :param as_table: decode into a TaskTable instead of Tasks.
+        :return: list of Tasks, list of dicts if the filter projects Task fields, or TaskTable
+        """
+        is_projected = task_filter is not None and task_filter.fields is not None
+        if as_table:
+            # NumPy is only needed for the bulk mode, so it is not imported up front.
+            from task_table import TaskTable
+        if response.headers.get(Headers.content_type) != MediaTypes.task_columns:
+            task_dicts = self._decode_json(response)
+            if as_table:
+                with self._metrics.time("client_task_construction_seconds", {"format": "table"}):
+                    return TaskTable.from_dicts(task_dicts)
+            return task_dicts if is_projected else self._make_tasks(task_dicts)
+
+        with self._metrics.time("client_decode_seconds",
+                                {"endpoint": self._get_endpoint(response.url)}):
+            try:
+                if as_table:
+                    return TaskTable.from_columns(response.content)
+                if is_projected:
+                    return task_codec.decode_dicts(response.content)
+                return task_codec.decode_tasks(response.content)
+            except ValueError as error:
+                raise ExecutionError(f"Invalid Task list response: {error}")
+
+    def _decode_json(self, response: requests.Response) -> Any:
+        with self._metrics.time("client_decode_seconds",
+                                {"endpoint": self._get_endpoint(response.url)}):
+            return response.json()
+
+    def _make_task(self, task_dict: dict) -> Task:
+        with self._metrics.time("client_task_construction_seconds", {"format": "objects"}):
+            return dict_to_task(task_dict)
+
+    def _make_tasks(self, task_dicts: list) -> list:
+        with self._metrics.time("client_task_construction_seconds", {"format": "objects"}):
+            return dict_list_to_task_list(task_dicts)
 
     def _test_server_connection(self, simulate_failure: bool) -> None:
         self.get_server_modification_time(simulate_failure)
 
     @staticmethod
-    def _create_mock_server_session(server_address: str) -> requests.Session:
-        session = requests.session()
-        mock_server = ServerMock(server_address)
-        mock_adapter = mock_server.get_mock_adapter()
-        address_scheme = urllib.parse.urlparse(server_address).scheme
-        session.mount(prefix=address_scheme, adapter=mock_adapter)
-        return session
+    def _create_transport(server_address: str, config: TransportConfig,
+                          simulation: "SimulationConfig") -> Transport:
+        """
+        Real HTTP transports are shared by all sessions of the Server address, so that they reuse
+        pooled connections. Each mock transport serves its own mock Server, keeping the state of
+        separate sessions apart.
+        """
+        if config.use_real_http:
+            return get_shared_transport(server_address, config)
+        # The mock Server and requests_mock are only loaded for the mock scheme.
+        from server_mock import ServerMock
+        mock_server = ServerMock(server_address, simulation)
+        return Transport(config, mock_server.get_mock_adapter())
+
+    @staticmethod
+    def _get_endpoint(request_url: str) -> str:
+        return urllib.parse.urlparse(request_url).path.strip("/")
 
     @staticmethod
     def _make_basic_request_header(should_fail: bool) -> dict:
         """Makes a request header that can Signal mock Server to simulate request failure."""
         return {MockConstants.fail_key: MockConstants.true if should_fail else MockConstants.false}
 
+    @staticmethod
+    def _make_task_filter_header(robot: Union[str, int], status: str, should_fail: bool) -> dict:
+        """:param robot: name of the robot, its id if int, or None for all robots."""
+        request_headers = ClientSession._make_basic_request_header(should_fail)
+        if isinstance(robot, int):
+            request_headers[Headers.robot_id] = str(robot)
+        else:
+            request_headers[Headers.robot_name] = robot
+        request_headers[Headers.status] = status
+        return request_headers
+
     @staticmethod
     def _abort_if_response_is_bad(response: requests.Response) -> None:
         if not response.ok:
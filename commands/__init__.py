@@ -1,6 +1,49 @@
-from .connect import Connect
-from .create_task import CreateTask
-from .get_many_tasks import GetManyTasks
-from .get_modification_time import GetModificationTime
-from .get_robots import GetRobots
-from .get_task import GetTask
+"""
+Command classes are imported from their modules on first access, so that starting the program
+does not load the dependencies of every command.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .advance_clock import AdvanceClock
+    from .advance_task import AdvanceTask
+    from .connect import Connect
+    from .create_task import CreateTask
+    from .create_tasks import CreateTasks
+    from .get_cache_stats import GetCacheStats
+    from .get_fleet_stats import GetFleetStats
+    from .get_many_tasks import GetManyTasks
+    from .get_modification_time import GetModificationTime
+    from .get_robots import GetRobots
+    from .get_stats import GetStats
+    from .get_task import GetTask
+    from .get_task_stats import GetTaskStats
+    from .get_tasks import GetTasks
+    from .watch_tasks import WatchTasks
+
+_command_modules = {"AdvanceClock": "advance_clock",
+                    "AdvanceTask": "advance_task",
+                    "Connect": "connect",
+                    "CreateTask": "create_task",
+                    "CreateTasks": "create_tasks",
+                    "GetCacheStats": "get_cache_stats",
+                    "GetFleetStats": "get_fleet_stats",
+                    "GetManyTasks": "get_many_tasks",
+                    "GetModificationTime": "get_modification_time",
+                    "GetRobots": "get_robots",
+                    "GetStats": "get_stats",
+                    "GetTask": "get_task",
+                    "GetTaskStats": "get_task_stats",
+                    "GetTasks": "get_tasks",
+                    "WatchTasks": "watch_tasks"}
+
+__all__ = list(_command_modules)
+
+
+def __getattr__(name: str) -> type:
+    if name not in _command_modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    command_class = getattr(importlib.import_module(f".{_command_modules[name]}", __name__), name)
+    globals()[name] = command_class
+    return command_class
@@ -0,0 +1,15 @@
+from client_session import ClientSession
+from commands.command_base import CommandBase
+
+
+class AdvanceClock(CommandBase):
+    def __init__(self) -> None:
+        super().__init__("Moves the simulation clock of the mock Server forward.")
+        self._parser.add_argument("seconds",
+                                  help="Number of simulated seconds to pass.",
+                                  type=int)
+
+    def execute(self, arguments: str, session: ClientSession) -> int:
+        """:returns number of Task state changes"""
+        parsed_arguments = self._parse_arguments(arguments, session)
+        return session.advance_mock_clock(parsed_arguments.seconds, parsed_arguments.fail)
@@ -0,0 +1,15 @@
+from client_session import ClientSession
+from commands.command_base import CommandBase
+from task import Task
+
+
+class AdvanceTask(CommandBase):
+    def __init__(self) -> None:
+        super().__init__("Makes the mock Server move a Task to its next status.")
+        self._parser.add_argument("task_id",
+                                  help="The unique identifier of the Task to advance",
+                                  type=int)
+
+    def execute(self, arguments: str, session: ClientSession) -> Task:
+        parsed_arguments = self._parse_arguments(arguments, session)
+        return session.advance_mock_task(parsed_arguments.task_id, parsed_arguments.fail)
@@ -1,8 +1,14 @@
 import argparse
-from typing import NoReturn
+import concurrent.futures
+from typing import TYPE_CHECKING, Any, Callable, Iterator, NoReturn
 
+from exceptions import ExecutionError
 from exceptions import ParsingError
 from exceptions import ParserExitWarning
+from instrumentation import MetricsRegistry, registry
+
+if TYPE_CHECKING:
+    from client_session import ClientSession
 
 
 class CalmerParser(argparse.ArgumentParser):
@@ -15,6 +21,20 @@ class CalmerParser(argparse.ArgumentParser):
         raise ParsingError
 
 
+def get_metrics(session: "ClientSession" = None) -> MetricsRegistry:
+    """:return: metrics registry of the session, or the shared one if there is no session"""
+    return registry if session is None else session.get_metrics()
+
+
+class ItemResult:
+    """Outcome of a command for one of the items it was given; holds either a value or an error."""
+
+    def __init__(self, item: Any, value: Any = None, error: str = None) -> None:
+        self.item = item
+        self.value = value
+        self.error = error
+
+
 class CommandBase:
     def __init__(self, description: str) -> None:
         self._parser = CalmerParser()
@@ -26,3 +46,42 @@ class CommandBase:
 
     def get_description(self) -> str:
         return self._parser.description
+
+    def _parse_arguments(self, arguments: str,
+                         session: "ClientSession" = None) -> argparse.Namespace:
+        """
+        Parses the command line, recording the time it takes in the metrics registry.
+
+        :param session: session whose metrics registry is used instead of the shared one.
+        """
+        with get_metrics(session).time("command_parse_seconds",
+                                       {"command": type(self).__name__}):
+            return self._parser.parse_args(arguments.split())
+
+    def _add_parallel_argument(self) -> None:
+        self._parser.add_argument("--parallel",
+                                  help="Number of requests sent at the same time.",
+                                  type=int,
+                                  default=1)
+
+    @staticmethod
+    def _fan_out(function: Callable[[Any], Any], items: list,
+                 worker_count: int) -> Iterator[ItemResult]:
+        """
+        Calls the function for each item, on worker_count threads if it is greater than 1.
+        Execution errors are collected per item instead of stopping the remaining calls.
+
+        :return: iterator over ItemResults, in the order of the items
+        """
+        def call(item: Any) -> ItemResult:
+            try:
+                return ItemResult(item, value=function(item))
+            except ExecutionError as error:
+                return ItemResult(item, error=error.message)
+
+        if worker_count <= 1:
+            yield from map(call, items)
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=worker_count) as executor:
+            yield from executor.map(call, items)
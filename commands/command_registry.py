@@ -0,0 +1,36 @@
+import threading
+from typing import Iterator
+
+import commands
+from commands.command_base import CommandBase
+
+
+class CommandRegistry:
+    """
+    Command objects by command name, created on first use. Building every argument parser up
+    front would import the dependencies of all commands, even for a single command run.
+    """
+
+    def __init__(self, class_names: dict) -> None:
+        """:param class_names: name of the command class in the commands package, by command."""
+        self._class_names = class_names
+        self._commands = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, command_name: str) -> bool:
+        return command_name in self._class_names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._class_names)
+
+    def __getitem__(self, command_name: str) -> CommandBase:
+        with self._lock:
+            if command_name not in self._commands:
+                command_class = getattr(commands, self._class_names[command_name])
+                self._commands[command_name] = command_class()
+            return self._commands[command_name]
+
+    def items(self) -> Iterator[tuple]:
+        """Creates all of the commands."""
+        for command_name in self._class_names:
+            yield command_name, self[command_name]
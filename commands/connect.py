@@ -1,8 +1,20 @@
+import argparse
+from typing import TYPE_CHECKING
+
+from api import MediaTypes
 from commands.command_base import CommandBase
 from client_session import ClientSession
+from exceptions import ExecutionError, ParsingError
+from task_cache import TaskCache
+from transport import TransportConfig
+
+if TYPE_CHECKING:
+    from mock_simulation import SimulationConfig
 
 
 class Connect(CommandBase):
+    task_formats = {"columns": MediaTypes.task_columns, "json": MediaTypes.json}
+
     def __init__(self):
         super().__init__(
             "Creates client session connecting to given address for other commands to use.")
@@ -13,9 +25,132 @@ class Connect(CommandBase):
                                   help="Port number of the test server to send requests to.",
                                   type=int,
                                   default=5000)
+        self._parser.add_argument("--cache-size",
+                                  help="Maximum number of cached Server responses. "
+                                       "Caching is disabled by default.",
+                                  type=int,
+                                  default=0)
+        self._parser.add_argument("--cache-ttl",
+                                  help="Seconds for which cached responses are trusted before "
+                                       "revalidating them with the Server modification time.",
+                                  type=float,
+                                  default=5.0)
+        self._parser.add_argument("--store",
+                                  help="Path of a file persisting the Tasks and robots between "
+                                       "sessions; known Tasks are then read from it.")
+        self._parser.add_argument("--sync-interval",
+                                  help="Seconds for which the stored Tasks are trusted before "
+                                       "syncing them with the Server.",
+                                  type=float,
+                                  default=5.0)
+        self._parser.add_argument("--simulate-tasks",
+                                  help="Makes the mock Server simulate a robot fleet with a "
+                                       "history of given number of Tasks.",
+                                  type=int)
+        self._parser.add_argument("--simulate-robots",
+                                  help="Number of robots in the simulated fleet.",
+                                  type=int,
+                                  default=4)
+        self._parser.add_argument("--seed",
+                                  help="Seed of the simulation, for reproducible runs.",
+                                  type=int,
+                                  default=0)
+        self._parser.add_argument("--latency",
+                                  help="Simulated response latency of an endpoint, as "
+                                       "endpoint=seconds. Can be given many times.",
+                                  action="append",
+                                  default=[])
+        self._parser.add_argument("--failure-rate",
+                                  help="Simulated probability of requests to an endpoint failing, "
+                                       "as endpoint=probability. Can be given many times.",
+                                  action="append",
+                                  default=[])
+        self._parser.add_argument("--real-http",
+                                  help="Send requests over HTTP to a running Server, instead of "
+                                       "serving them by an in-process mock Server.",
+                                  action="store_true",
+                                  default=False)
+        self._parser.add_argument("--pool-size",
+                                  help="Maximum number of kept connections to the Server.",
+                                  type=int,
+                                  default=10)
+        self._parser.add_argument("--no-keep-alive",
+                                  help="Close the connection after each request.",
+                                  action="store_true",
+                                  default=False)
+        self._parser.add_argument("--retries",
+                                  help="Number of retries of GET requests failing with a server "
+                                       "error, a timeout or a connection error.",
+                                  type=int,
+                                  default=2)
+        self._parser.add_argument("--backoff",
+                                  help="Seconds before the first retry; doubled for each next one.",
+                                  type=float,
+                                  default=0.05)
+        self._parser.add_argument("--timeout",
+                                  help="Seconds to wait for the Server to connect and respond.",
+                                  type=float,
+                                  default=10.0)
+        self._parser.add_argument("--task-format",
+                                  help="Encoding in which Task lists are requested: compact "
+                                       "columns, or JSON objects.",
+                                  choices=self.task_formats,
+                                  default="columns")
+        self._parser.add_argument("--no-compression",
+                                  help="Ask the Server not to compress responses.",
+                                  action="store_true",
+                                  default=False)
 
     def execute(self, arguments: str) -> ClientSession:
-        parsed_arguments = self._parser.parse_args(arguments.split())
+        parsed_arguments = self._parse_arguments(arguments)
+        cache = None
+        if parsed_arguments.cache_size > 0:
+            cache = TaskCache(parsed_arguments.cache_size, parsed_arguments.cache_ttl)
+        store = None
+        if parsed_arguments.store is not None:
+            # SQLite is only loaded when a store is used.
+            import sqlite3
+            from local_store import LocalTaskStore
+            try:
+                store = LocalTaskStore(parsed_arguments.store)
+            except sqlite3.Error as error:
+                raise ExecutionError(f"Cannot open store {parsed_arguments.store}: {error}")
         return ClientSession(parsed_arguments.host,
                              parsed_arguments.port,
-                             parsed_arguments.fail)
+                             parsed_arguments.fail,
+                             cache,
+                             store,
+                             parsed_arguments.sync_interval,
+                             self._make_simulation_config(parsed_arguments),
+                             transport_config=TransportConfig(
+                                 pool_size=parsed_arguments.pool_size,
+                                 keep_alive=not parsed_arguments.no_keep_alive,
+                                 max_retries=parsed_arguments.retries,
+                                 backoff_factor=parsed_arguments.backoff,
+                                 timeout=parsed_arguments.timeout,
+                                 use_real_http=parsed_arguments.real_http,
+                                 compress=not parsed_arguments.no_compression),
+                             task_list_format=self.task_formats[parsed_arguments.task_format])
+
+    @staticmethod
+    def _make_simulation_config(parsed_arguments: argparse.Namespace) -> "SimulationConfig":
+        """:return: simulation config, or None if no simulation was requested"""
+        if parsed_arguments.simulate_tasks is None:
+            return None
+        from mock_simulation import SimulationConfig
+
+        def parse_endpoint_values(assignments: list) -> dict:
+            endpoint_values = {}
+            for assignment in assignments:
+                endpoint, _, value = assignment.partition("=")
+                try:
+                    endpoint_values[endpoint] = float(value)
+                except ValueError:
+                    raise ParsingError
+            return endpoint_values
+
+        return SimulationConfig(seed=parsed_arguments.seed,
+                                robot_count=parsed_arguments.simulate_robots,
+                                task_count=parsed_arguments.simulate_tasks,
+                                latencies=parse_endpoint_values(parsed_arguments.latency),
+                                failure_rates=parse_endpoint_values(parsed_arguments.failure_rate))
@@ -1,5 +1,6 @@
 from client_session import ClientSession
 from commands.command_base import CommandBase
+from exceptions import ParsingError
 
 
 class CreateTask(CommandBase):
@@ -7,6 +8,10 @@ class CreateTask(CommandBase):
         super().__init__("Sends Task creation request to the Server.")
         self._parser.add_argument("robot",
                                   help="Display name of the robot to create the Task for.")
+        self._parser.add_argument("--by-id",
+                                  help="Take the robot argument as the robot id instead of name.",
+                                  action="store_true",
+                                  default=False)
         self._parser.add_argument("branch",
                                   help="Name of the Git branch containing the robot configuration.")
         self._parser.add_argument("runs",
@@ -15,8 +20,14 @@ class CreateTask(CommandBase):
 
     def execute(self, arguments: str, session: ClientSession) -> int:
         """:returns Task id of the created Task"""
-        parsed_arguments = self._parser.parse_args(arguments.split())
-        return session.request_task_creation(parsed_arguments.robot,
+        parsed_arguments = self._parse_arguments(arguments, session)
+        robot = parsed_arguments.robot
+        if parsed_arguments.by_id:
+            try:
+                robot = int(robot)
+            except ValueError:
+                raise ParsingError
+        return session.request_task_creation(robot,
                                              parsed_arguments.branch,
                                              parsed_arguments.runs,
                                              parsed_arguments.fail)
@@ -0,0 +1,88 @@
+import csv
+import json
+import sys
+from typing import TextIO
+
+from client_session import ClientSession
+from commands.command_base import CommandBase
+from exceptions import ExecutionError
+
+
+class CreateTasks(CommandBase):
+    def __init__(self):
+        super().__init__("Sends Task creation requests for records of a CSV or JSON lines file.")
+        self._parser.add_argument("file",
+                                  help="Path of the file with Task records, or \"-\" for stdin. "
+                                       "Each record needs robot_name or robot_id, branch and runs "
+                                       "values; "
+                                       "CSV files need a header row.")
+        self._parser.add_argument("--format",
+                                  help="Record format; by default guessed from the file extension.",
+                                  choices=["csv", "jsonl"])
+        self._parser.add_argument("-c", "--chunk-size",
+                                  help="Number of records sent in a single request.",
+                                  type=int,
+                                  default=500)
+
+    def execute(self, arguments: str, session: ClientSession) -> list:
+        """
+        Requests for chunks rejected as a whole are reported for each of their records, and do not
+        stop the remaining chunks from being sent.
+
+        :returns list of (Task id, None) or (None, rejection reason) tuples, one per record
+        """
+        parsed_arguments = self._parse_arguments(arguments, session)
+        if parsed_arguments.chunk_size <= 0:
+            raise ExecutionError("Chunk size has to be positive.")
+
+        record_format = parsed_arguments.format
+        if record_format is None:
+            record_format = "csv" if parsed_arguments.file.endswith(".csv") else "jsonl"
+
+        if parsed_arguments.file == "-":
+            records = self._read_records(sys.stdin, record_format)
+        else:
+            try:
+                with open(parsed_arguments.file, newline="") as record_file:
+                    records = self._read_records(record_file, record_format)
+            except OSError as error:
+                raise ExecutionError(f"Cannot read {parsed_arguments.file}: {error.strerror}")
+
+        results = []
+        chunk_size = parsed_arguments.chunk_size
+        for chunk_start in range(0, len(records), chunk_size):
+            chunk = records[chunk_start:chunk_start + chunk_size]
+            try:
+                results += session.request_bulk_task_creation(chunk, parsed_arguments.fail)
+            except ExecutionError as error:
+                results += [(None, error.message)] * len(chunk)
+        return results
+
+    @staticmethod
+    def _read_records(record_file: TextIO, record_format: str) -> list:
+        """:return: list of Task details dicts"""
+        if record_format == "csv":
+            rows = list(csv.DictReader(record_file))
+        else:
+            rows = []
+            for line_number, line in enumerate(record_file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError:
+                    raise ExecutionError(f"Invalid JSON record in line {line_number}.")
+
+        records = []
+        for row_number, row in enumerate(rows, start=1):
+            try:
+                # CSV rows have empty robot_id values when only robot names are given.
+                if row.get("robot_id") not in (None, ""):
+                    robot = {"robot_id": int(row["robot_id"])}
+                else:
+                    robot = {"robot_name": row["robot_name"]}
+                records.append(dict(robot, branch=row["branch"], runs=int(row["runs"])))
+            except (KeyError, TypeError, ValueError):
+                raise ExecutionError(f"Invalid Task record {row_number}; "
+                                     f"expected robot_name or robot_id, branch and runs values.")
+        return records
@@ -0,0 +1,15 @@
+from client_session import ClientSession
+from commands.command_base import CommandBase
+from exceptions import ExecutionError
+
+
+class GetCacheStats(CommandBase):
+    def __init__(self) -> None:
+        super().__init__("Prints the Task cache hit, miss and eviction counters.")
+
+    def execute(self, arguments: str, session: ClientSession) -> dict:
+        self._parse_arguments(arguments, session)
+        cache_stats = session.get_cache_stats()
+        if cache_stats is None:
+            raise ExecutionError("Task cache is disabled; use \"connect --cache-size N\".")
+        return cache_stats
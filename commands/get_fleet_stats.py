@@ -0,0 +1,17 @@
+from client_session import ClientSession
+from commands.command_base import CommandBase
+
+
+class GetFleetStats(CommandBase):
+    def __init__(self) -> None:
+        super().__init__("Prints Task counts per status, and evaluation success rates and run "
+                         "totals of all Tasks per robot and per branch, aggregated by the Server.")
+
+    def execute(self, arguments: str, session: ClientSession) -> dict:
+        """:returns dict with the overall summary, status counts, and per robot and per branch
+            summaries"""
+        parsed_arguments = self._parse_arguments(arguments, session)
+        fleet_stats = session.get_fleet_stats(parsed_arguments.fail)
+        robot_dict = session.get_robot_dict(parsed_arguments.fail)
+        return dict(fleet_stats, robots={robot_dict.get(robot_id, robot_id): summary
+                                         for robot_id, summary in fleet_stats["robots"].items()})
@@ -1,18 +1,154 @@
+import argparse
+import time
+from typing import Callable, Iterator, Union
+
+from api import TaskFilter
 from client_session import ClientSession
-from commands.command_base import CommandBase
+from commands.command_base import CommandBase, ItemResult
+from exceptions import ExecutionError
 
 
 class GetManyTasks(CommandBase):
     def __init__(self):
         super().__init__("Queries Tasks using given filter parameters and prints them.")
         self._parser.add_argument("-r", "--robot",
-                                  help="Will return only the Tasks assigned to given Robot name.")
+                                  help="Will return only the Tasks assigned to given Robot name. "
+                                       "Can be given many times to query many Robots.",
+                                  action="append")
+        self._parser.add_argument("--robot-id",
+                                  help="Will return only the Tasks assigned to given Robot id. "
+                                       "Can be given many times to query many Robots.",
+                                  type=int,
+                                  action="append")
         self._parser.add_argument("-s", "--status",
                                   help="Will return only the Tasks with given status.",
                                   choices=["waiting", "running", "finished"])
+        self._parser.add_argument("-p", "--page-size",
+                                  help="Number of Tasks requested from the Server at a time.",
+                                  type=int,
+                                  default=100)
+        self._parser.add_argument("--sync",
+                                  help="Query a local replica of the Server Tasks, updated only "
+                                       "with the Tasks changed since its last sync.",
+                                  action="store_true",
+                                  default=False)
+        self._parser.add_argument("--min-creation-time",
+                                  help="Will return only the Tasks created at or after given "
+                                       "Unix time.",
+                                  type=int)
+        self._parser.add_argument("--max-creation-time",
+                                  help="Will return only the Tasks created at or before given "
+                                       "Unix time.",
+                                  type=int)
+        self._parser.add_argument("--max-age",
+                                  help="Will return only the Tasks created in the last given "
+                                       "number of seconds.",
+                                  type=int)
+        self._parser.add_argument("--min-runs",
+                                  help="Will return only the Tasks with at least given runs.",
+                                  type=int)
+        self._parser.add_argument("--max-runs",
+                                  help="Will return only the Tasks with at most given runs.",
+                                  type=int)
+        self._parser.add_argument("-b", "--branch-prefix",
+                                  help="Will return only the Tasks of branches starting with it.")
+        self._parser.add_argument("--sort",
+                                  help="Task field to sort by. Sorted queries are not paged.",
+                                  choices=TaskFilter.sort_fields,
+                                  default="task_id")
+        self._parser.add_argument("--desc",
+                                  help="Sort in descending order.",
+                                  action="store_true",
+                                  default=False)
+        self._parser.add_argument("-l", "--limit",
+                                  help="Maximum number of Tasks returned for each Robot. "
+                                       "Limited queries are not paged.",
+                                  type=int)
+        self._parser.add_argument("--fields",
+                                  help="Comma separated Task fields to return, e.g. "
+                                       "task_id,branch,successes.")
+        self._add_parallel_argument()
+
+    def execute(self, arguments: str, session: ClientSession) -> Iterator:
+        """
+        Each Robot is queried separately. Without --parallel the Tasks are returned as their
+        pages arrive; with it, the queries run at the same time and are each read whole.
+
+        :return: iterator over ItemResults with one Task each, or with the error of a Robot query;
+            with --fields, the values are dicts of the requested fields
+        """
+        parsed_arguments = self._parse_arguments(arguments, session)
+        robots = (parsed_arguments.robot or []) + (parsed_arguments.robot_id or []) or [None]
+        task_filter = self._make_task_filter(parsed_arguments)
 
-    def execute(self, arguments: str, session: ClientSession) -> list:
-        parsed_arguments = self._parser.parse_args(arguments.split())
-        return session.get_many_tasks(parsed_arguments.robot,
+        def query_robot_tasks(robot: Union[str, int]) -> Iterator:
+            if task_filter is not None and (task_filter.limit is not None or
+                                            not task_filter.is_id_ordered()):
+                return iter(session.get_many_tasks(robot,
+                                                   parsed_arguments.status,
+                                                   parsed_arguments.fail,
+                                                   task_filter=task_filter))
+            return session.iter_tasks(robot,
                                       parsed_arguments.status,
-                                      parsed_arguments.fail)
+                                      parsed_arguments.page_size,
+                                      parsed_arguments.fail,
+                                      task_filter)
+
+        if parsed_arguments.sync:
+            if task_filter is not None:
+                raise ExecutionError("The local replica supports only robot and status filters.")
+            return self._stream_tasks(
+                lambda robot: session.get_synced_tasks(robot,
+                                                            parsed_arguments.status,
+                                                            parsed_arguments.fail),
+                robots)
+
+        if parsed_arguments.parallel <= 1:
+            return self._stream_tasks(query_robot_tasks, robots)
+
+        query_results = self._fan_out(lambda robot: list(query_robot_tasks(robot)),
+                                      robots,
+                                      parsed_arguments.parallel)
+        return self._flatten_query_results(query_results)
+
+    @staticmethod
+    def _make_task_filter(parsed_arguments: argparse.Namespace) -> TaskFilter:
+        """:return: filter of the Server query, or None if only robot and status were given"""
+        min_creation_time = parsed_arguments.min_creation_time
+        if parsed_arguments.max_age is not None:
+            max_age_start = int(time.time()) - parsed_arguments.max_age
+            min_creation_time = max_age_start if min_creation_time is None else \
+                max(min_creation_time, max_age_start)
+        if parsed_arguments.limit is not None and parsed_arguments.limit <= 0:
+            raise ExecutionError("Limit has to be positive.")
+
+        task_filter = TaskFilter(min_creation_time=min_creation_time,
+                                 max_creation_time=parsed_arguments.max_creation_time,
+                                 min_runs=parsed_arguments.min_runs,
+                                 max_runs=parsed_arguments.max_runs,
+                                 branch_prefix=parsed_arguments.branch_prefix,
+                                 sort_field=parsed_arguments.sort,
+                                 descending=parsed_arguments.desc,
+                                 limit=parsed_arguments.limit,
+                                 fields=None if parsed_arguments.fields is None else
+                                 parsed_arguments.fields.split(","))
+        return task_filter if task_filter.to_queries() else None
+
+    @staticmethod
+    def _stream_tasks(query_robot_tasks: Callable[[str], Iterator],
+                      robots: list) -> Iterator[ItemResult]:
+        for robot in robots:
+            try:
+                for task in query_robot_tasks(robot):
+                    yield ItemResult(robot, value=task)
+            except ExecutionError as error:
+                yield ItemResult(robot, error=error.message)
+
+    @staticmethod
+    def _flatten_query_results(query_results: Iterator[ItemResult]) -> Iterator[ItemResult]:
+        for query_result in query_results:
+            if query_result.error is not None:
+                yield query_result
+                continue
+            for task in query_result.value:
+                yield ItemResult(query_result.item, value=task)
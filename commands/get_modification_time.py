@@ -7,5 +7,5 @@ class GetModificationTime(CommandBase):
         super().__init__("Prints the last modification timestamp of the Server.")
 
     def execute(self, arguments: str, session: ClientSession) -> int:
-        parsed_arguments = self._parser.parse_args(arguments.split())
+        parsed_arguments = self._parse_arguments(arguments, session)
         return session.get_server_modification_time(simulate_failure=parsed_arguments.fail)
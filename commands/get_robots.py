@@ -7,5 +7,5 @@ class GetRobots(CommandBase):
         super().__init__("Requests the list of known robots and prints it.")
 
     def execute(self, arguments: str, session: ClientSession) -> dict:
-        parsed_arguments = self._parser.parse_args(arguments.split())
+        parsed_arguments = self._parse_arguments(arguments, session)
         return session.get_robot_dict(simulate_failure=parsed_arguments.fail)
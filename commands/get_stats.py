@@ -0,0 +1,34 @@
+from typing import TYPE_CHECKING, Union
+
+from commands.command_base import CommandBase, get_metrics
+
+if TYPE_CHECKING:
+    from client_session import ClientSession
+
+
+class GetStats(CommandBase):
+    def __init__(self) -> None:
+        super().__init__("Prints request phase timings, response sizes and status code counts.")
+        self._parser.add_argument("--format",
+                                  help="Output format; prometheus is the text exposition format.",
+                                  choices=["json", "prometheus"],
+                                  default="json")
+        self._parser.add_argument("--reset",
+                                  help="Clear all recorded metrics after printing them.",
+                                  action="store_true",
+                                  default=False)
+
+    def execute(self, arguments: str, session: "ClientSession" = None) -> Union[dict, str]:
+        """
+        :param session: session whose metrics are printed; the shared registry is used without.
+        :return: dict of all metrics, or their Prometheus text
+        """
+        parsed_arguments = self._parse_arguments(arguments, session)
+        metrics = get_metrics(session)
+        if parsed_arguments.format == "prometheus":
+            stats = metrics.to_prometheus()
+        else:
+            stats = metrics.to_dict()
+        if parsed_arguments.reset:
+            metrics.clear()
+        return stats
@@ -1,15 +1,21 @@
+from typing import Iterator
+
 from client_session import ClientSession
 from commands.command_base import CommandBase
-from task import Task
 
 
 class GetTask(CommandBase):
     def __init__(self) -> None:
-        super().__init__("Requests one Task by its id and prints it.")
-        self._parser.add_argument("task_id",
-                                  help="The unique identifier of the requested Task",
-                                  type=int)
-
-    def execute(self, arguments: str, session: ClientSession) -> Task:
-        parsed_arguments = self._parser.parse_args(arguments.split())
-        return session.get_task(parsed_arguments.task_id, parsed_arguments.fail)
+        super().__init__("Requests Tasks one by one by their ids and prints them.")
+        self._parser.add_argument("task_ids",
+                                  help="The unique identifiers of the requested Tasks",
+                                  type=int,
+                                  nargs="+")
+        self._add_parallel_argument()
+
+    def execute(self, arguments: str, session: ClientSession) -> Iterator:
+        """:returns iterator over ItemResults with the Task for each id"""
+        parsed_arguments = self._parse_arguments(arguments, session)
+        return self._fan_out(lambda task_id: session.get_task(task_id, parsed_arguments.fail),
+                             parsed_arguments.task_ids,
+                             parsed_arguments.parallel)
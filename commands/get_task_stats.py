@@ -0,0 +1,39 @@
+from client_session import ClientSession
+from commands.command_base import CommandBase
+from exceptions import ExecutionError
+from task_statistics import TaskStatistics
+
+
+class GetTaskStats(CommandBase):
+    def __init__(self) -> None:
+        super().__init__("Prints evaluation success rates and run totals of the queried Tasks, "
+                         "per robot and per branch.")
+        self._parser.add_argument("-r", "--robot",
+                                  help="Will include only the Tasks assigned to given Robot name.")
+        self._parser.add_argument("-s", "--status",
+                                  help="Will include only the Tasks with given status.",
+                                  choices=["waiting", "running", "finished"])
+        self._parser.add_argument("--percentiles",
+                                  help="Percentiles of attempts per finished Task to compute.",
+                                  type=float,
+                                  nargs="+",
+                                  default=[50.0, 90.0, 99.0])
+
+    def execute(self, arguments: str, session: ClientSession) -> dict:
+        """:returns dict with the overall, per robot and per branch summaries"""
+        parsed_arguments = self._parse_arguments(arguments, session)
+        if not all(0 <= percentile <= 100 for percentile in parsed_arguments.percentiles):
+            raise ExecutionError("Percentiles have to be between 0 and 100.")
+        task_table = session.get_many_tasks(parsed_arguments.robot,
+                                            parsed_arguments.status,
+                                            parsed_arguments.fail,
+                                            as_table=True)
+        robot_dict = session.get_robot_dict(parsed_arguments.fail)
+        statistics = TaskStatistics(task_table)
+
+        robot_summaries = statistics.summarize_by("robot_id")
+        return {"total": statistics.summarize(),
+                "attempt_percentiles": statistics.attempt_percentiles(parsed_arguments.percentiles),
+                "robots": {robot_dict.get(robot_id, robot_id): summary
+                           for robot_id, summary in robot_summaries.items()},
+                "branches": statistics.summarize_by("branch")}
@@ -0,0 +1,16 @@
+from client_session import ClientSession
+from commands.command_base import CommandBase
+
+
+class GetTasks(CommandBase):
+    def __init__(self) -> None:
+        super().__init__("Requests many Tasks by their ids in a single request and prints them.")
+        self._parser.add_argument("task_ids",
+                                  help="The unique identifiers of the requested Tasks",
+                                  type=int,
+                                  nargs="+")
+
+    def execute(self, arguments: str, session: ClientSession) -> tuple:
+        """:returns list of found Tasks and list of ids of missing Tasks"""
+        parsed_arguments = self._parse_arguments(arguments, session)
+        return session.get_tasks(parsed_arguments.task_ids, parsed_arguments.fail)
@@ -0,0 +1,48 @@
+import time
+from typing import Iterator
+
+from client_session import ClientSession
+from commands.command_base import CommandBase
+
+
+class WatchTasks(CommandBase):
+    def __init__(self) -> None:
+        super().__init__("Prints the Tasks, and then each of their status changes, until all of "
+                         "them finish.")
+        self._parser.add_argument("task_ids",
+                                  help="The unique identifiers of the watched Tasks",
+                                  type=int,
+                                  nargs="+")
+        self._parser.add_argument("-t", "--timeout",
+                                  help="Seconds after which watching stops, even if some Tasks "
+                                       "have not finished.",
+                                  type=float,
+                                  default=60.0)
+        self._parser.add_argument("--poll-timeout",
+                                  help="Seconds for which a single request waits for changes.",
+                                  type=float,
+                                  default=10.0)
+
+    def execute(self, arguments: str, session: ClientSession) -> Iterator:
+        """:returns iterator over the initial states of the Tasks, followed by their changes"""
+        parsed_arguments = self._parse_arguments(arguments, session)
+        return self._watch(session, parsed_arguments.task_ids, parsed_arguments.timeout,
+                           parsed_arguments.poll_timeout, parsed_arguments.fail)
+
+    @staticmethod
+    def _watch(session: ClientSession, task_ids: list, timeout: float, poll_timeout: float,
+               simulate_failure: bool) -> Iterator:
+        deadline = time.monotonic() + timeout
+        tasks, modification_time = session.wait_for_tasks(task_ids, 0, None, simulate_failure)
+        statuses = {task.task_id: task.status for task in tasks}
+        yield from tasks
+
+        while any(status != "finished" for status in statuses.values()):
+            remaining_time = deadline - time.monotonic()
+            if remaining_time <= 0:
+                return
+            changed_tasks, modification_time = session.wait_for_tasks(
+                task_ids, min(poll_timeout, remaining_time), modification_time, simulate_failure)
+            for task in changed_tasks:
+                statuses[task.task_id] = task.status
+            yield from changed_tasks
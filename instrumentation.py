@@ -0,0 +1,150 @@
+import bisect
+import contextlib
+import threading
+import time
+from typing import Iterator
+
+
+class Histogram:
+    """Counts of observed values in buckets with given upper bounds, with their sum and range."""
+
+    def __init__(self, bounds: tuple) -> None:
+        self._bounds = bounds
+        self._bucket_counts = [0] * (len(bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._min = None
+        self._max = None
+
+    def observe(self, value: float) -> None:
+        self._bucket_counts[bisect.bisect_left(self._bounds, value)] += 1
+        self._count += 1
+        self._sum += value
+        self._min = value if self._min is None else min(self._min, value)
+        self._max = value if self._max is None else max(self._max, value)
+
+    def get_cumulative_counts(self) -> list:
+        """:return: list of (upper bound, count of values up to it) pairs, ending with infinity"""
+        cumulative_counts = []
+        total = 0
+        for bound, count in zip(self._bounds + (float("inf"),), self._bucket_counts):
+            total += count
+            cumulative_counts.append((bound, total))
+        return cumulative_counts
+
+    def estimate_percentile(self, percentile: float) -> float:
+        """:return: upper bound of the bucket holding the percentile, capped at the maximum"""
+        if self._count == 0:
+            return None
+        rank = percentile / 100 * self._count
+        for bound, cumulative_count in self.get_cumulative_counts():
+            if cumulative_count >= rank:
+                return min(bound, self._max)
+        return self._max
+
+    def get_stats(self) -> dict:
+        return {"count": self._count,
+                "sum": self._sum,
+                "min": self._min,
+                "max": self._max,
+                "mean": self._sum / self._count if self._count > 0 else None,
+                "p50": self.estimate_percentile(50),
+                "p90": self.estimate_percentile(90),
+                "p99": self.estimate_percentile(99)}
+
+
+class MetricsRegistry:
+    """
+    In-process store of labelled histograms and counters. Safe to share between threads.
+
+    Metrics are identified by name and a dict of label values, and are created when first
+    recorded.
+    """
+
+    latency_bounds = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                      0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    size_bounds = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    def observe(self, name: str, value: float, labels: dict = None,
+                bounds: tuple = latency_bounds) -> None:
+        """Adds the value to a histogram; bounds only apply when the histogram is created."""
+        key = self._make_key(labels)
+        with self._lock:
+            histograms = self._histograms.setdefault(name, {})
+            if key not in histograms:
+                histograms[key] = Histogram(bounds)
+            histograms[key].observe(value)
+
+    def increment(self, name: str, labels: dict = None, amount: int = 1) -> None:
+        key = self._make_key(labels)
+        with self._lock:
+            counters = self._counters.setdefault(name, {})
+            counters[key] = counters.get(key, 0) + amount
+
+    @contextlib.contextmanager
+    def time(self, name: str, labels: dict = None) -> Iterator[None]:
+        """Observes the duration of the with block in seconds, even if it raises."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start_time, labels)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def to_dict(self) -> dict:
+        """:return: JSON-compatible dict with the stats of each histogram and counter value"""
+        with self._lock:
+            return {"histograms": {name: [dict(labels=dict(key), **histogram.get_stats())
+                                          for key, histogram in sorted(histograms.items())]
+                                   for name, histograms in sorted(self._histograms.items())},
+                    "counters": {name: [{"labels": dict(key), "value": value}
+                                        for key, value in sorted(counters.items())]
+                                 for name, counters in sorted(self._counters.items())}}
+
+    def to_prometheus(self) -> str:
+        """:return: all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, histograms in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(histograms.items()):
+                    for bound, count in histogram.get_cumulative_counts():
+                        bucket_labels = key + (("le", "+Inf" if bound == float("inf")
+                                                else repr(bound)),)
+                        lines.append(f"{name}_bucket{self._format_labels(bucket_labels)} {count}")
+                    stats = histogram.get_stats()
+                    lines.append(f"{name}_sum{self._format_labels(key)} {stats['sum']!r}")
+                    lines.append(f"{name}_count{self._format_labels(key)} {stats['count']}")
+            for name, counters in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(counters.items()):
+                    lines.append(f"{name}{self._format_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _make_key(labels: dict) -> tuple:
+        return () if labels is None else tuple(sorted((name, str(value))
+                                                      for name, value in labels.items()))
+
+    @staticmethod
+    def _format_labels(key: tuple) -> str:
+        if not key:
+            return ""
+
+        def escape(value: str) -> str:
+            return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+        return "{" + ",".join(f"{name}=\"{escape(value)}\"" for name, value in key) + "}"
+
+
+# Shared by the client sessions and commands unless they are given another registry.
+registry = MetricsRegistry()
@@ -0,0 +1,76 @@
+import sqlite3
+import threading
+
+from task import Task
+
+
+class LocalTaskStore:
+    """
+    SQLite file holding the Tasks and robots of one Server, together with the Server modification
+    time they are up to date with. Lets a new client session start with the data of the last one.
+    """
+
+    _task_columns = Task.__slots__
+
+    def __init__(self, path: str) -> None:
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS tasks (task_id INTEGER PRIMARY KEY, "
+                "creation_time INTEGER, robot_id INTEGER, runs INTEGER, branch TEXT, "
+                "status TEXT, attempts INTEGER, successes INTEGER)")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS robots (robot_id INTEGER PRIMARY KEY, name TEXT)")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def load_tasks(self, server_address: str) -> tuple:
+        """:return: list of stored Tasks and their modification time; nothing if for other Server"""
+        with self._lock:
+            if self._get_meta("server_address") != server_address:
+                return [], None
+            rows = self._connection.execute(
+                f"SELECT {', '.join(self._task_columns)} FROM tasks ORDER BY task_id").fetchall()
+            modification_time = self._get_meta("modification_time")
+
+        tasks = [Task.from_dict(dict(zip(self._task_columns, row))) for row in rows]
+        return tasks, None if modification_time is None else int(modification_time)
+
+    def save_tasks(self, server_address: str, tasks: list, modification_time: int,
+                   is_full_sync: bool) -> None:
+        """A full sync replaces all stored Tasks; a delta sync inserts or overwrites Tasks."""
+        with self._lock, self._connection:
+            if is_full_sync or self._get_meta("server_address") != server_address:
+                self._connection.execute("DELETE FROM tasks")
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO tasks VALUES ({', '.join('?' * len(self._task_columns))})",
+                [[getattr(task, column) for column in self._task_columns] for task in tasks])
+            self._set_meta("server_address", server_address)
+            self._set_meta("modification_time", str(modification_time))
+
+    def load_robots(self, server_address: str, modification_time: int) -> dict:
+        """:return: dict of robot names by id; empty if not stored for this Server state"""
+        with self._lock:
+            if self._get_meta("robots_server_address") != server_address or \
+                    self._get_meta("robots_modification_time") != str(modification_time):
+                return {}
+            rows = self._connection.execute("SELECT robot_id, name FROM robots").fetchall()
+        return dict(rows)
+
+    def save_robots(self, server_address: str, robot_dict: dict, modification_time: int) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM robots")
+            self._connection.executemany("INSERT INTO robots VALUES (?, ?)", robot_dict.items())
+            self._set_meta("robots_server_address", server_address)
+            self._set_meta("robots_modification_time", str(modification_time))
+
+    def _get_meta(self, key: str) -> str:
+        row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._connection.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
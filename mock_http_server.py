@@ -0,0 +1,129 @@
+import argparse
+import http.server
+import threading
+
+import requests
+import requests_mock
+
+from mock_simulation import SimulationConfig
+from server_mock import ServerMock
+
+
+class MockHttpServer:
+    """
+    Serves a ServerMock over real HTTP on a local port, so that many client processes can share
+    it. Each connection is handled on its own thread, and requests are passed to the callbacks
+    of the mock adapter unchanged. Connections are kept alive between requests.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 5000,
+                 simulation: SimulationConfig = None) -> None:
+        """:param port: port to listen on; 0 picks a free port."""
+        self._http_server = http.server.ThreadingHTTPServer((host, port), self._make_handler())
+        self._http_server.daemon_threads = True
+        self._host = host
+        self._port = self._http_server.server_address[1]
+        self._server_mock = ServerMock(self.get_address(), simulation)
+        self._thread = None
+
+    def get_address(self) -> str:
+        return f"http://{self._host}:{self._port}"
+
+    def get_port(self) -> int:
+        return self._port
+
+    def get_server_mock(self) -> ServerMock:
+        return self._server_mock
+
+    def serve_forever(self) -> None:
+        # Short polls make stop return quickly.
+        self._http_server.serve_forever(poll_interval=0.1)
+
+    def start(self) -> None:
+        """Starts serving on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._http_server.shutdown()
+        self._http_server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _make_handler(self) -> type:
+        mock_http_server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately, which would otherwise wait for the
+            # delayed acknowledgement of the client on kept alive connections.
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                self._forward()
+
+            def do_POST(self) -> None:
+                self._forward()
+
+            def log_message(self, format: str, *args) -> None:
+                """Requests are not logged, as the Server is meant for load tests."""
+
+            def _forward(self) -> None:
+                body_length = int(self.headers.get("Content-Length", 0))
+                request = requests.Request(self.command, mock_http_server.get_address() + self.path,
+                                           headers=dict(self.headers.items()),
+                                           data=self.rfile.read(body_length) or None).prepare()
+                try:
+                    response = mock_http_server.get_server_mock().get_mock_adapter().send(request)
+                except requests_mock.NoMockAddress:
+                    self.send_error(requests.codes.not_found, "Unknown endpoint.")
+                    return
+
+                # The body is passed on as it is, compressed if the mock compressed it.
+                content = response.raw.read(decode_content=False)
+                self.send_response(response.status_code, response.reason)
+                for name, value in response.headers.items():
+                    if name.lower() not in ("content-length", "connection"):
+                        self.send_header(name, value)
+                # Responses with these statuses have no body, so sending one would be read as
+                # the start of the next response on the connection.
+                has_body = response.status_code >= 200 and response.status_code not in (
+                    requests.codes.no_content, requests.codes.not_modified)
+                if has_body:
+                    self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                if has_body:
+                    self.wfile.write(content)
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serves the mock Server over HTTP, for clients "
+                                                 "connecting with \"connect --real-http\".")
+    parser.add_argument("-a", "--host", help="Address to listen on.", default="127.0.0.1")
+    parser.add_argument("-p", "--port", help="Port to listen on.", type=int, default=5000)
+    parser.add_argument("--simulate-tasks",
+                        help="Simulate a robot fleet with a history of given number of Tasks, "
+                             "instead of serving the demo Tasks.",
+                        type=int)
+    parser.add_argument("--simulate-robots", help="Number of robots in the simulated fleet.",
+                        type=int, default=4)
+    parser.add_argument("--seed", help="Seed of the simulation, for reproducible runs.",
+                        type=int, default=0)
+    arguments = parser.parse_args()
+
+    simulation = None
+    if arguments.simulate_tasks is not None:
+        simulation = SimulationConfig(seed=arguments.seed, robot_count=arguments.simulate_robots,
+                                      task_count=arguments.simulate_tasks)
+    server = MockHttpServer(arguments.host, arguments.port, simulation)
+    print(f"Serving on {server.get_address()}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import math
+import random
+
+from task import Task
+
+
+class SimulationConfig:
+    """
+    Parameters of the mock Server simulation. All generated data depends only on them, so runs
+    with equal configs are reproducible.
+
+    :param latencies: seconds added to each response, by endpoint name.
+    :param failure_rates: probability of a request failing with a server error, by endpoint name.
+    """
+
+    def __init__(self, seed: int = 0, robot_count: int = 4, task_count: int = 100,
+                 history_seconds: int = 30 * 24 * 3600, seconds_per_run: int = 10,
+                 latencies: dict = None, failure_rates: dict = None) -> None:
+        self.seed = seed
+        self.robot_count = robot_count
+        self.task_count = task_count
+        self.history_seconds = history_seconds
+        self.seconds_per_run = seconds_per_run
+        self.latencies = {} if latencies is None else latencies
+        self.failure_rates = {} if failure_rates is None else failure_rates
+
+
+class TaskLifecycleSimulator:
+    """
+    Moves Tasks through waiting, running and finished states on a virtual clock.
+
+    Each robot evaluates one Task at a time, in Task id order, starting it no earlier than its
+    creation time. An evaluation takes seconds_per_run for each run, and ends with attempts and
+    successes drawn from the success probability of the robot.
+    """
+
+    def __init__(self, config: SimulationConfig, start_time: int) -> None:
+        self._config = config
+        self._clock = start_time
+        self._random = random.Random(config.seed)
+        self._success_probabilities = [self._random.uniform(0.5, 0.95)
+                                       for _ in range(config.robot_count)]
+        self._robot_free_times = {}
+        self._start_times = {}
+
+    def get_time(self) -> int:
+        return self._clock
+
+    def make_robot_names(self) -> list:
+        return [f"Robot{robot_id:04d}" for robot_id in range(self._config.robot_count)]
+
+    def make_history(self) -> dict:
+        """
+        Generates the configured number of Tasks created over the history period, and simulates
+        them up to the current clock time.
+
+        :return: dict of Tasks by id
+        """
+        history_start = self._clock - self._config.history_seconds
+        creation_times = sorted(self._random.randint(history_start, self._clock)
+                                for _ in range(self._config.task_count))
+        tasks = {}
+        for task_id, creation_time in enumerate(creation_times, start=1):
+            minor_version, patch_version = self._random.randint(0, 9), self._random.randint(0, 9)
+            tasks[task_id] = Task(task_id, creation_time,
+                                  robot_id=self._random.randrange(self._config.robot_count),
+                                  runs=self._random.randint(1, 100),
+                                  branch=f"configs_dev_0_{minor_version}_{patch_version}")
+
+        history_end = self._clock
+        self._clock = history_start
+        transitions = self.advance(tasks, history_end - history_start)
+        for task_id, status, attempts, successes in transitions:
+            self.apply_transition(tasks[task_id], status, attempts, successes)
+        return tasks
+
+    def advance(self, tasks: dict, seconds: int) -> list:
+        """
+        Moves the clock forward and works out the resulting Task state changes, without applying
+        them.
+
+        :param tasks: dict of all Tasks by id.
+        :return: list of (task_id, status, attempts, successes) transitions in time order
+        """
+        target_time = self._clock + seconds
+        pending_tasks_by_robot = {}
+        for task in tasks.values():
+            if task.status != "finished":
+                pending_tasks_by_robot.setdefault(task.robot_id, []).append(task)
+
+        timed_transitions = []
+        for robot_id, pending_tasks in pending_tasks_by_robot.items():
+            pending_tasks.sort(key=lambda pending_task: pending_task.task_id)
+            timed_transitions += self._advance_robot(robot_id, pending_tasks, target_time)
+
+        self._clock = target_time
+        timed_transitions.sort(key=lambda timed_transition: timed_transition[0])
+        return [transition for _, transition in timed_transitions]
+
+    @staticmethod
+    def apply_transition(task: Task, status: str, attempts: int, successes: int) -> None:
+        task.status = status
+        task.attempts = attempts
+        task.successes = successes
+
+    def _advance_robot(self, robot_id: int, pending_tasks: list, target_time: int) -> list:
+        """:return: list of (time, transition) pairs for the Tasks of one robot"""
+        timed_transitions = []
+        free_time = self._robot_free_times.get(robot_id, self._clock)
+        for task in pending_tasks:
+            if task.status == "running":
+                start_time = self._start_times.setdefault(task.task_id, free_time)
+            else:
+                start_time = max(free_time, task.creation_time)
+                if start_time > target_time:
+                    break
+                self._start_times[task.task_id] = start_time
+                timed_transitions.append((start_time, (task.task_id, "running", None, None)))
+
+            finish_time = start_time + task.runs * self._config.seconds_per_run
+            if finish_time > target_time:
+                free_time = finish_time
+                break
+            attempts, successes = self._make_results(robot_id, task)
+            timed_transitions.append((finish_time,
+                                      (task.task_id, "finished", attempts, successes)))
+            del self._start_times[task.task_id]
+            free_time = finish_time
+
+        self._robot_free_times[robot_id] = free_time
+        return timed_transitions
+
+    def _make_results(self, robot_id: int, task: Task) -> tuple:
+        """:return: attempts and successes, drawn from a generator seeded with the Task id"""
+        results = random.Random(f"{self._config.seed}:{task.task_id}")
+        success_probability = self._success_probabilities[robot_id] \
+            if robot_id < len(self._success_probabilities) else 0.5
+        attempts = task.runs + results.randint(0, task.runs)
+        expected_successes = attempts * success_probability
+        deviation = math.sqrt(attempts * success_probability * (1 - success_probability))
+        successes = round(results.gauss(expected_successes, deviation))
+        return attempts, min(attempts, max(0, successes))
@@ -0,0 +1,37 @@
+import contextlib
+import threading
+
+
+class ReadWriteLock:
+    """
+    Lets in either any number of readers at once, or a single writer. A waiting writer keeps new
+    readers out, so that a steady stream of readers cannot starve it. Writing is reentrant, and
+    a writer may also read, but a reader must not start writing.
+    """
+
+    def __init__(self, write_lock: threading.RLock = None) -> None:
+        """:param write_lock: lock held by writers, e.g. to share it with a Condition."""
+        self._write_lock = threading.RLock() if write_lock is None else write_lock
+        self._readers_done = threading.Condition(threading.Lock())
+        self._reader_count = 0
+
+    @contextlib.contextmanager
+    def reading(self):
+        # Passing through the writer lock waits for the current and any waiting writer.
+        with self._write_lock:
+            with self._readers_done:
+                self._reader_count += 1
+        try:
+            yield
+        finally:
+            with self._readers_done:
+                self._reader_count -= 1
+                if self._reader_count == 0:
+                    self._readers_done.notify_all()
+
+    @contextlib.contextmanager
+    def writing(self):
+        with self._write_lock:
+            with self._readers_done:
+                self._readers_done.wait_for(lambda: self._reader_count == 0)
+            yield
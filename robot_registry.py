@@ -0,0 +1,39 @@
+from typing import Iterator
+
+
+class RobotRegistry:
+    """Robot names and ids, looked up in constant time in both directions."""
+
+    def __init__(self, robot_names: list) -> None:
+        """:param robot_names: names of the robots, with their ids as indexes."""
+        self._names = list(robot_names)
+        self._ids = {robot_name: robot_id for robot_id, robot_name in enumerate(self._names)}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __contains__(self, robot_name: str) -> bool:
+        return robot_name in self._ids
+
+    def has_id(self, robot_id: int) -> bool:
+        return 0 <= robot_id < len(self._names)
+
+    def get_id(self, robot_name: str) -> int:
+        """:return: id of the robot, or None if there is no robot with the name"""
+        return self._ids.get(robot_name)
+
+    def get_name(self, robot_id: int) -> str:
+        """:return: name of the robot, or None if there is no robot with the id"""
+        return self._names[robot_id] if self.has_id(robot_id) else None
+
+    def to_dict(self) -> dict:
+        """:return: dict of robot names by id"""
+        return dict(enumerate(self._names))
+
+    @staticmethod
+    def from_dict(robot_dict: dict) -> "RobotRegistry":
+        """:param robot_dict: dict of robot names by ids, which have to be 0 to n - 1."""
+        return RobotRegistry([robot_dict[robot_id] for robot_id in range(len(robot_dict))])
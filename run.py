@@ -1,5 +1,41 @@
+import argparse
+import sys
+
+from batch_runner import BatchRunner
 from user_interface import UserInterface
 
 
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Robot Test API Demo")
+    parser.add_argument("--script",
+                        help="Run the commands of a file, or of stdin if \"-\", without prompts "
+                             "and print their results as JSON lines.")
+    parser.add_argument("--keep-going",
+                        help="In script mode, run the remaining commands after one fails.",
+                        action="store_true",
+                        default=False)
+    parser.add_argument("--jobs",
+                        help="In script mode, number of read-only commands run at the same time.",
+                        type=int,
+                        default=8)
+    return parser.parse_args()
+
+
+def run_script(arguments: argparse.Namespace) -> int:
+    """:return: process exit status; 1 if any command failed"""
+    runner = BatchRunner(UserInterface.build_command_registry(), sys.stdout, arguments.jobs,
+                         arguments.keep_going)
+    if arguments.script == "-":
+        failure_count = runner.run(sys.stdin)
+    else:
+        with open(arguments.script) as script_file:
+            failure_count = runner.run(script_file)
+    return 1 if failure_count > 0 else 0
+
+
 if __name__ == "__main__":
-    UserInterface().cmdloop()
+    parsed_arguments = parse_arguments()
+    if parsed_arguments.script is None:
+        UserInterface().cmdloop()
+    else:
+        sys.exit(run_script(parsed_arguments))
@@ -1,4 +1,11 @@
+import copy
+import gzip
+import heapq
+import itertools
+import json
+import random
 import re
+import threading
 import time
 from typing import Any, Union
 import urllib.parse
@@ -6,35 +13,150 @@ import urllib.parse
 import requests
 import requests_mock
 
-from api import Endpoints, RequestUrls, RequestUrl, Queries
+from api import ContentEncodings, Endpoints, Headers, MediaTypes, MockConstants, RequestUrls, \
+    RequestUrl, Queries, SyncModes, TaskFilter
+from mock_simulation import SimulationConfig, TaskLifecycleSimulator
+from read_write_lock import ReadWriteLock
+from robot_registry import RobotRegistry
+from task_aggregates import TaskAggregates
+import task_codec
 from task import Task
-
-
-class MockConstants:
-    fail_key = "mock_fail"
-    true = "True"
-    false = "False"
+from task_index import TaskIndex
+from task_store import TaskStore
 
 
 class ServerMock:
-    def __init__(self, server_address: str) -> None:
+    # Smaller bodies are sent uncompressed, as they would hardly shrink.
+    min_compressed_size = 1024
+    compression_level = 1
+
+    def __init__(self, server_address: str, simulation: SimulationConfig = None) -> None:
+        """
+        :param simulation: if given, robots and Task history are generated from it instead of
+            using the fixed demo data, and Tasks progress as the virtual clock is advanced.
+        """
         self._adapter = requests_mock.Adapter()
 
-        self._tasks = self._make_mock_tasks()
-        self._robots = ["Molly", "Bosco", "Doretta", "Karl"]
-        self._next_task_id = 1701
+        self._simulation = simulation
+        if simulation is None:
+            self._simulator = None
+            self._tasks = TaskStore(self._make_mock_tasks().values(), next_id=1701)
+            self._robot_registry = RobotRegistry(["Molly", "Bosco", "Doretta", "Karl"])
+        else:
+            self._simulator = TaskLifecycleSimulator(simulation, start_time=int(time.time()))
+            self._tasks = TaskStore(self._simulator.make_history().values())
+            self._robot_registry = RobotRegistry(self._simulator.make_robot_names())
+            self._failure_random = random.Random(simulation.seed)
+        # Version of the robot list in its entity tag, to be bumped if the list ever changes.
+        self._robot_list_version = 1
+        self._modification_time = int(time.time())
+        # Changes from before this time are unknown, so clients synced earlier need a full sync.
+        self._history_start_time = self._modification_time
+        all_tasks = self._tasks.snapshot().values()
+        self._task_aggregates = TaskAggregates(all_tasks)
+        self._task_index = TaskIndex(all_tasks)
+        for task in all_tasks:
+            self._task_index.record_modification(task.task_id, self._modification_time)
+        # Callbacks run concurrently when the mock is shared by many client threads. Changes to
+        # the Tasks, their index and aggregates are written together, and reads spanning many
+        # Tasks see them all before or all after a change, and skip the store shard locks, as
+        # every put is made while writing. Single Tasks are read from the store without the Task
+        # lock, as stored Tasks are replaced rather than changed.
+        self._write_lock = threading.RLock()
+        self._task_lock = ReadWriteLock(self._write_lock)
+        self._modified = threading.Condition(self._write_lock)
 
         self._make_mock_api(server_address)
 
     def get_mock_adapter(self) -> requests_mock.Adapter:
         return self._adapter
 
-    @staticmethod
-    def _should_response_fail(request: requests.Request) -> bool:
+    def advance_task(self, task_id: int) -> Task:
+        """
+        Moves the Task to its next status: waiting Tasks start running, and running Tasks finish
+        with made up evaluation results. Finished Tasks are left unchanged.
+
+        :return: the advanced Task
+        """
+        with self._task_lock.writing():
+            old_task = self._tasks.get(task_id)
+            if old_task.status == "finished":
+                return old_task
+            task = copy.copy(old_task)
+            if task.status == "waiting":
+                task.status = "running"
+            elif task.status == "running":
+                results = random.Random(task_id)
+                task.attempts = results.randint(task.runs, 3 * task.runs)
+                task.successes = results.randint(0, task.runs)
+                task.status = "finished"
+            self._replace_task(old_task, task)
+            self._mark_modified([task_id])
+            return task
+
+    def advance_clock(self, seconds: int) -> int:
+        """
+        Moves the simulation clock forward, updating the Tasks that start or finish meanwhile.
+
+        :return: number of Task state changes
+        """
+        with self._task_lock.writing():
+            transitions = self._simulator.advance(self._tasks.snapshot(), seconds)
+            for task_id, status, attempts, successes in transitions:
+                old_task = self._tasks.get(task_id)
+                task = copy.copy(old_task)
+                self._simulator.apply_transition(task, status, attempts, successes)
+                self._replace_task(old_task, task)
+            if transitions:
+                self._mark_modified(list(dict.fromkeys(task_id for task_id, *_ in transitions)))
+            return len(transitions)
+
+    def _should_response_fail(self, request: requests.Request) -> bool:
+        """
+        Delays the response by the simulated latency of the endpoint, and decides whether it
+        fails: on request with the fail header, or at random with the simulated failure rate.
+        """
+        if self._simulation is not None:
+            endpoint = urllib.parse.urlsplit(request.url).path.strip("/")
+            time.sleep(self._simulation.latencies.get(endpoint, 0))
+            failure_rate = self._simulation.failure_rates.get(endpoint, 0)
+            with self._write_lock:
+                if failure_rate > 0 and self._failure_random.random() < failure_rate:
+                    return True
+
         if MockConstants.fail_key not in request.headers.keys():
             return False
         return request.headers[MockConstants.fail_key] == MockConstants.true
 
+    def _get_current_time(self) -> int:
+        """:return: time of the simulation clock, or the real time if there is no simulation"""
+        return int(time.time()) if self._simulator is None else self._simulator.get_time()
+
+    def _advance_clock(self, request: requests.Request, context: Any) -> str:
+        """
+        Mock callback for advancing the simulation clock.
+
+        :return: number of Task state changes as string.
+        """
+        if self._should_response_fail(request):
+            context.status_code = requests.codes.server_error
+            context.reason = "Internal server error."
+            return context.reason
+        elif self._simulator is None:
+            context.status_code = requests.codes.bad_request
+            context.reason = "The Server runs no simulation."
+            return context.reason
+
+        body = self._read_json(request)
+        seconds = body.get("seconds") if isinstance(body, dict) else None
+        if not isinstance(seconds, int) or seconds < 0:
+            context.status_code = requests.codes.bad_request
+            context.reason = "Invalid number of seconds."
+            return context.reason
+
+        context.status_code = requests.codes.ok
+        return str(self.advance_clock(seconds))
+
     def _get_modification_timestamp(self, request: requests.Request, context: Any) -> str:
         """
         Mock callback for Server modification time requests.
@@ -47,8 +169,7 @@ class ServerMock:
         else:
             context.status_code = requests.codes.ok
 
-        current_time = str(int(time.time()))
-        return current_time
+        return str(self._modification_time)
 
     def _create_task(self, request: requests.Request, context: Any) -> str:
         """
@@ -56,29 +177,143 @@ class ServerMock:
 
         :return: Task id as string.
         """
-        requested_task_details = request.json()
+        requested_task_details = self._read_json(request)
 
         if self._should_response_fail(request):
             context.status_code = requests.codes.server_error
             context.reason = "Internal server error."
             return context.reason
-        elif requested_task_details["robot_name"] not in self._robots:
+
+        error_reason = self._validate_task_details(requested_task_details)
+        if error_reason is not None:
             context.status_code = requests.codes.bad_request
-            context.reason = "Invalid robot name requested."
+            context.reason = error_reason
             return context.reason
-        else:
-            context.status_code = requests.codes.ok
 
-        new_task = Task(task_id=self._next_task_id,
-                        creation_time=int(time.time()),
-                        robot_id=self._robots.index(requested_task_details["robot_name"]),
-                        branch=requested_task_details["branch"],
-                        runs=requested_task_details["runs"])
-        self._tasks[self._next_task_id] = new_task
-        self._next_task_id += 1
+        context.status_code = requests.codes.ok
+        with self._task_lock.writing():
+            new_task = self._add_task(requested_task_details)
+            self._mark_modified([new_task.task_id])
 
         return str(new_task.task_id)
 
+    def _create_many_tasks(self, request: requests.Request, context: Any) -> list:
+        """
+        Mock callback for bulk Task creation requests. Invalid records are reported back
+        instead of failing the whole request.
+
+        :return: list with a dict holding either the Task id or the error reason for each record
+        """
+        if self._should_response_fail(request):
+            context.status_code = requests.codes.server_error
+            context.reason = "Internal server error."
+            return []
+
+        requested_task_details = self._read_json(request)
+        if not isinstance(requested_task_details, list):
+            context.status_code = requests.codes.bad_request
+            context.reason = "Expected a list of Task details."
+            return []
+
+        context.status_code = requests.codes.ok
+        results = []
+        # The created Tasks appear to readers all at once.
+        with self._task_lock.writing():
+            for task_details in requested_task_details:
+                error_reason = self._validate_task_details(task_details)
+                if error_reason is None:
+                    results.append({"task_id": self._add_task(task_details).task_id})
+                else:
+                    results.append({"error": error_reason})
+
+            created_task_ids = [result["task_id"] for result in results if "task_id" in result]
+            if created_task_ids:
+                self._mark_modified(created_task_ids)
+        return results
+
+    def _advance_task(self, request: requests.Request, context: Any) -> dict:
+        """
+        Mock callback for moving a Task to its next status, for exercising status changes.
+
+        :return: dict representation of the advanced Task
+        """
+        if self._should_response_fail(request):
+            context.status_code = requests.codes.server_error
+            context.reason = "Internal server error."
+            return {}
+
+        body = self._read_json(request)
+        if not isinstance(body, dict):
+            context.status_code = requests.codes.bad_request
+            context.reason = "Expected a JSON object with the Task id."
+            return {}
+        task_id = body.get("task_id")
+        if task_id not in self._tasks:
+            context.status_code = requests.codes.not_found
+            context.reason = "Invalid Task Id."
+            return {}
+
+        context.status_code = requests.codes.ok
+        return self.advance_task(task_id).to_dict()
+
+    def _validate_task_details(self, task_details: Any) -> Union[str, None]:
+        """
+        Tasks are assigned to robots by robot_id, or by robot_name if there is no id.
+
+        :return: reason for rejecting the Task details, or None if they are valid
+        """
+        if not isinstance(task_details, dict) or \
+                not {"branch", "runs"}.issubset(task_details.keys()) or \
+                not {"robot_name", "robot_id"} & task_details.keys():
+            return "Incomplete Task details."
+        elif "robot_id" in task_details and (not isinstance(task_details["robot_id"], int) or
+                                             not self._robot_registry.has_id(
+                                                 task_details["robot_id"])):
+            return "Invalid robot id requested."
+        elif "robot_id" not in task_details and \
+                task_details["robot_name"] not in self._robot_registry:
+            return "Invalid robot name requested."
+        elif not isinstance(task_details["runs"], int) or isinstance(task_details["runs"], bool) \
+                or task_details["runs"] <= 0:
+            return "Invalid run count requested."
+        elif not isinstance(task_details["branch"], str):
+            return "Invalid branch requested."
+        return None
+
+    def _add_task(self, task_details: dict) -> Task:
+        new_task = Task(task_id=self._tasks.allocate_id(),
+                        creation_time=self._get_current_time(),
+                        robot_id=task_details["robot_id"] if "robot_id" in task_details
+                        else self._robot_registry.get_id(task_details["robot_name"]),
+                        branch=task_details["branch"],
+                        runs=task_details["runs"])
+        with self._task_lock.writing():
+            # Stored last, so that a failing update does not leave a Task readers can find.
+            self._task_index.add(new_task)
+            self._task_aggregates.add(new_task)
+            self._tasks.put(new_task)
+        return new_task
+
+    def _replace_task(self, old_task: Task, new_task: Task) -> None:
+        """Stores the changed copy of a Task, updating the index and aggregates."""
+        with self._task_lock.writing():
+            self._task_index.update_status(old_task.task_id, old_task.status, new_task.status)
+            self._task_aggregates.remove(old_task)
+            self._task_aggregates.add(new_task)
+            self._tasks.put(new_task)
+
+    def _mark_modified(self, task_ids: list) -> None:
+        """
+        Advances the modification timestamp and records it as the modification time of the Tasks.
+        It is kept strictly increasing, so that clients can rely on it to detect changes made
+        within the same second.
+        """
+        with self._task_lock.writing():
+            self._modification_time = max(self._modification_time + 1, int(time.time()))
+            for task_id in task_ids:
+                self._task_index.record_modification(task_id, self._modification_time)
+            self._modified.notify_all()
+
     def _get_robot_list(self, request: requests.Request, context: Any) -> str:
         """
         Mock callback for robot list requests.
@@ -88,9 +323,67 @@ class ServerMock:
         if self._should_response_fail(request):
             context.status_code = requests.codes.im_a_teapot
             context.reason = "The robots have rebelled."
+            return " ".join(self._robot_registry)
+
+        entity_tag = f"\"robots-{self._robot_list_version}\""
+        context.headers[Headers.etag] = entity_tag
+        if self._is_not_modified(request, entity_tag):
+            context.status_code = requests.codes.not_modified
+            return ""
+        context.status_code = requests.codes.ok
+        return " ".join(self._robot_registry)
+
+    def _get_fleet_stats(self, request: requests.Request, context: Any) -> str:
+        """
+        Mock callback for fleet statistics requests. They are served from aggregates kept up to
+        date as Tasks change, so their cost does not depend on the number of Tasks. Tagged with
+        the Server modification time, like the Task lists.
+
+        :return: JSON object with the overall summary, the Task count of each status, and the
+            summaries per robot id and per branch; empty if not modified.
+        """
+        if self._should_response_fail(request):
+            context.status_code = requests.codes.server_error
+            context.reason = "Internal server error."
+            return context.reason
+
+        with self._task_lock.reading():
+            entity_tag = f"\"stats-{self._modification_time}\""
+            fleet_stats = self._task_aggregates.to_dict()
+        context.headers[Headers.etag] = entity_tag
+        if self._is_not_modified(request, entity_tag):
+            context.status_code = requests.codes.not_modified
+            return ""
+        context.status_code = requests.codes.ok
+        context.headers[Headers.content_type] = MediaTypes.json
+        return json.dumps(fleet_stats)
+
+    def _get_encoded_tasks(self, request: requests.Request, context: Any) -> bytes:
+        """
+        Mock callback for Task requests, negotiating the response format. Task lists are encoded
+        as columns if the Accept header lists their media type, and everything else as JSON.
+        Bodies of at least min_compressed_size bytes are compressed if Accept-Encoding allows gzip.
+
+        :return: response body
+        """
+        result = self._get_tasks(request, context)
+        if context.status_code == requests.codes.not_modified:
+            return b""
+        if isinstance(result, list) and context.status_code == requests.codes.ok and \
+                MediaTypes.task_columns in self._get_accepted_values(request, Headers.accept):
+            body = task_codec.encode_task_dicts(result)
+            context.headers[Headers.content_type] = MediaTypes.task_columns
         else:
-            context.status_code = requests.codes.ok
-        return " ".join(self._robots)
+            body = json.dumps(result).encode()
+            context.headers[Headers.content_type] = MediaTypes.json
+        context.headers[Headers.vary] = f"{Headers.accept}, {Headers.accept_encoding}"
+
+        if len(body) >= self.min_compressed_size and ContentEncodings.gzip in \
+                self._get_accepted_values(request, Headers.accept_encoding):
+            body = gzip.compress(body, compresslevel=self.compression_level)
+            context.headers[Headers.content_encoding] = ContentEncodings.gzip
+        context.headers[Headers.content_length] = str(len(body))
+        return body
 
     def _get_tasks(self, request: requests.Request, context: Any) -> Union[dict, list]:
         """
@@ -119,49 +412,282 @@ class ServerMock:
 
         :return: dict or list of dict representing the Task(s)
         """
-        query_key, query_value = query_string.split('=')
-        if query_key == Queries.single_task("").key():
-            return self._get_single_task(context, query_value)
-        elif query_string == Queries.all_tasks().text():
-            return self._get_filtered_task_list(request, context, query_value)
+        query = dict(urllib.parse.parse_qsl(query_string))
+        entity_tag = self._get_task_entity_tag(request, query)
+        if entity_tag is not None:
+            context.headers[Headers.etag] = entity_tag
+            if self._is_not_modified(request, entity_tag):
+                context.status_code = requests.codes.not_modified
+                return {}
+
+        single_task_key = Queries.single_task("").key()
+        many_tasks_key = Queries.many_tasks([]).key()
+        all_tasks_query = Queries.all_tasks()
+        recent_tasks_query = Queries.recent_tasks()
+        watched_tasks_key = Queries.watched_tasks([]).key()
+        if single_task_key in query:
+            return self._get_single_task(context, query[single_task_key])
+        elif many_tasks_key in query:
+            return self._get_task_batch(context, query[many_tasks_key])
+        elif watched_tasks_key in query:
+            return self._watch_tasks(context, query)
+        elif query.get(recent_tasks_query.key()) == recent_tasks_query.value():
+            return self._get_recently_modified_tasks(context, query)
+        elif query.get(all_tasks_query.key()) == all_tasks_query.value():
+            return self._get_filtered_task_list(request, context, query)
         else:
             context.status_code = requests.codes.bad_request
             context.reason = "Invalid query."
             return {}
 
+    def _get_task_entity_tag(self, request: requests.Request, query: dict) -> Union[str, None]:
+        """
+        Single Tasks are tagged with their own version, Task batches with the latest version of
+        the found Tasks and their count, and filtered Task lists with the Server modification
+        time, as a change to any Task may add it to or remove it from the list. Versions are the
+        modification times, which increase with every change. They are read before the response
+        is made, so a change in between makes the tag outdated rather than the response.
+
+        :return: entity tag, or None for queries that are not tagged, like syncs and watches
+        """
+        single_task_key = Queries.single_task("").key()
+        many_tasks_key = Queries.many_tasks([]).key()
+        all_tasks_query = Queries.all_tasks()
+        try:
+            if single_task_key in query:
+                task_id = int(query[single_task_key])
+                return f"\"task-{task_id}-{self._task_index.get_modification_time(task_id)}\""
+            elif many_tasks_key in query:
+                task_ids = [int(task_id) for task_id in query[many_tasks_key].split(",")]
+                versions = [self._task_index.get_modification_time(task_id)
+                            for task_id in task_ids if task_id in self._tasks]
+                return f"\"tasks-{max(versions, default=0)}-{len(versions)}\""
+            elif query.get(all_tasks_query.key()) == all_tasks_query.value():
+                accepts_columns = MediaTypes.task_columns in \
+                    self._get_accepted_values(request, Headers.accept)
+                return f"\"tasks-{self._modification_time}-" \
+                       f"{'columns' if accepts_columns else 'json'}\""
+        except (KeyError, ValueError):
+            # Unknown or just created Tasks, and malformed ids, get no tag.
+            pass
+        return None
+
     def _get_single_task(self, response_context: Any, query_value: str) -> dict:
         """:return: dict representation of the Task"""
-        task_id = int(query_value)
-        if task_id not in self._tasks.keys():
+        task = self._tasks.get(int(query_value))
+        if task is None:
             response_context.status_code = requests.codes.not_found
             response_context.reason = "Invalid Task Id."
             return {}
         response_context.status_code = requests.codes.ok
-        return self._tasks[task_id].__dict__
+        return task.to_dict()
 
-    def _get_filtered_task_list(self, request: requests.Request, response_context: Any,
-                                query_value: str) -> list:
-        """:return: list of Tasks represented as dicts"""
+    def _get_task_batch(self, response_context: Any, query_value: str) -> dict:
+        """
+        Ids of Tasks that do not exist are reported back instead of failing the whole request.
+
+        :return: dict with the list of found Tasks represented as dicts and the list of missing ids
+        """
+        try:
+            task_ids = [int(task_id) for task_id in query_value.split(",")]
+        except ValueError:
+            response_context.status_code = requests.codes.bad_request
+            response_context.reason = "Invalid Task Id."
+            return {}
+
+        tasks = self._tasks.get_many(task_ids)
+        response_context.status_code = requests.codes.ok
+        return {"tasks": [task.to_dict() for task in tasks if task is not None],
+                "missing": [task_id for task_id, task in zip(task_ids, tasks) if task is None]}
+
+    def _watch_tasks(self, response_context: Any, query: dict) -> list:
+        """
+        Long-polls the watched Tasks: blocks until one of them changes after the modification
+        time given in the query, or the timeout passes. Without the modification time, returns
+        all watched Tasks at once. The modification time the response is up to date with is sent
+        back in a response header.
 
-        tasks = list(self._tasks.values())
+        :return: list of changed Tasks represented as dicts; empty if the timeout passed
+        """
+        try:
+            task_ids = [int(task_id) for task_id in
+                        query[Queries.watched_tasks([]).key()].split(",")]
+            since_key = Queries.modified_since(0).key()
+            since = int(query[since_key]) if since_key in query else None
+            timeout = min(float(query.get(Queries.wait_timeout(0).key(), 0)),
+                          MockConstants.max_wait_timeout)
+        except ValueError:
+            response_context.status_code = requests.codes.bad_request
+            response_context.reason = "Invalid watch query."
+            return []
+
+        def select_changed_task_ids() -> list:
+            return [task_id for task_id in task_ids if task_id in self._tasks and
+                    (since is None or self._task_index.get_modification_time(task_id) > since)]
+
+        with self._modified:
+            if since is not None:
+                self._modified.wait_for(select_changed_task_ids, timeout)
+            changed_task_dicts = [task.to_dict()
+                                  for task in self._tasks.get_many(select_changed_task_ids())]
+            modification_time = self._modification_time
+
+        response_context.headers[Headers.modification_time] = str(modification_time)
+        response_context.status_code = requests.codes.ok
+        return changed_task_dicts
 
-        if "robot_name" in list(request.headers.keys()):
-            robot_name = request.headers["robot_name"]
-            tasks = self._filter_task_list_by_robot_name(tasks, robot_name)
+    def _get_recently_modified_tasks(self, response_context: Any, query: dict) -> list:
+        """
+        Returns the Tasks created or changed after the modification time given in the query,
+        or all Tasks if it is missing, predates the known history or is ahead of the Server, like
+        after a restart. The kind of sync and the modification time the response is up to date
+        with are sent back in response headers.
 
-        if "status" in list(request.headers.keys()):
-            status = request.headers["status"]
-            tasks = [task for task in tasks if task.status == status]
+        :return: list of Tasks represented as dicts
+        """
+        since_key = Queries.modified_since(0).key()
+        try:
+            since = int(query[since_key]) if since_key in query else None
+        except ValueError:
+            response_context.status_code = requests.codes.bad_request
+            response_context.reason = "Invalid modification time."
+            return []
+
+        with self._task_lock.reading():
+            modification_time = self._modification_time
+            if since is None or not self._history_start_time <= since <= modification_time:
+                task_ids = self._task_index.select()
+                response_context.headers[Headers.sync_mode] = SyncModes.full
+            else:
+                task_ids = self._task_index.select_modified_after(since)
+                response_context.headers[Headers.sync_mode] = SyncModes.delta
+            tasks = self._tasks.get_many_unlocked(task_ids)
+        response_context.headers[Headers.modification_time] = str(modification_time)
 
         response_context.status_code = requests.codes.ok
-        task_dicts = [task.__dict__ for task in tasks]
-        return task_dicts
+        return [task.to_dict() for task in tasks]
+
+    def _get_filtered_task_list(self, request: requests.Request, response_context: Any,
+                                query: dict) -> list:
+        """
+        Tasks are filtered with the robot and status headers and the TaskFilter query parameters.
+
+        Supports cursor pagination of Tasks sorted by ascending id: if the page limit cuts the
+        result short, the id of the last returned Task is sent back in a response header, to be
+        used as the next page cursor.
+
+        :return: list of Tasks represented as dicts, with only the requested fields
+        """
+        robot_id = None
+        if Headers.robot_id in request.headers.keys():
+            try:
+                robot_id = int(request.headers[Headers.robot_id])
+            except ValueError:
+                pass
+        elif Headers.robot_name in request.headers.keys():
+            robot_id = self._robot_registry.get_id(request.headers[Headers.robot_name])
+
+        status = None
+        if Headers.status in request.headers.keys():
+            status = request.headers[Headers.status]
+
+        cursor_key = Queries.page_cursor(0).key()
+        try:
+            cursor = int(query[cursor_key]) if cursor_key in query else None
+            task_filter = TaskFilter.from_query(query)
+        except ValueError:
+            cursor, task_filter = None, None
+        if task_filter is None or (cursor is not None and not task_filter.is_id_ordered()) or \
+                (task_filter.fields is not None and
+                 not set(task_filter.fields).issubset(Task.__slots__)):
+            response_context.status_code = requests.codes.bad_request
+            response_context.reason = "Invalid page cursor, limit, sort order or fields."
+            return []
+
+        limit = task_filter.limit
+        filter_arguments = {"creation_time_range": (task_filter.min_creation_time,
+                                                    task_filter.max_creation_time),
+                            "runs_range": (task_filter.min_runs, task_filter.max_runs),
+                            "branch_prefix": task_filter.branch_prefix}
+        # The index and the Tasks are read together, so that writes in between cannot make them
+        # disagree. Stored Tasks are not changed in place, so they are serialized outside.
+        with self._task_lock.reading():
+            if task_filter.is_id_ordered():
+                # One extra id is selected to learn whether another page follows.
+                task_ids = self._task_index.select(robot_id, status, cursor,
+                                                   None if limit is None else limit + 1,
+                                                   **filter_arguments)
+                if limit is not None and len(task_ids) > limit:
+                    task_ids = task_ids[:limit]
+                    response_context.headers[Headers.next_cursor] = str(task_ids[-1])
+                tasks = self._tasks.get_many_unlocked(task_ids)
+            else:
+                tasks = self._sort_tasks(self._task_index.select(robot_id, status,
+                                                                 **filter_arguments),
+                                         task_filter.sort_field, task_filter.descending, limit)
+
+        response_context.status_code = requests.codes.ok
+        if task_filter.fields is None:
+            return [task.to_dict() for task in tasks]
+        return [{field: getattr(task, field) for field in task_filter.fields} for task in tasks]
+
+    def _sort_tasks(self, task_ids: list, field: str, descending: bool, limit: int) -> list:
+        """
+        Walks the sorted index of the field when it is indexed and most Tasks match, and sorts the
+        matching Tasks otherwise, keeping only the first limit of them.
+
+        Only to be called while reading under the Task lock.
 
-    def _filter_task_list_by_robot_name(self, task_list: list, robot_name: str) -> list:
-        if robot_name not in self._robots:
-            return task_list
-        robot_id = self._robots.index(robot_name)
-        return [task for task in task_list if task.robot_id == robot_id]
+        :param task_ids: ids of the matching Tasks in ascending order.
+        :return: Tasks ordered by the field and then by id, with Tasks missing the field last
+        """
+        if field == "task_id":
+            return self._tasks.get_many_unlocked(task_ids[::-1][:limit])
+
+        if field in TaskIndex.ordered_fields and len(task_ids) * 8 >= len(self._tasks):
+            matching_ids = set(task_ids)
+            ordered_ids = (task_id for task_id in self._task_index.iter_ordered(field, descending)
+                           if task_id in matching_ids)
+            return self._tasks.get_many_unlocked(list(itertools.islice(ordered_ids, limit)))
+
+        def sort_key(task: Task) -> tuple:
+            value = getattr(task, field)
+            # Missing values sort as the greatest in ascending and the least in descending order.
+            return (value is None) != descending, 0 if value is None else value, task.task_id
+
+        tasks = self._tasks.get_many_unlocked(task_ids)
+        if limit is None:
+            return sorted(tasks, key=sort_key, reverse=descending)
+        select_first = heapq.nlargest if descending else heapq.nsmallest
+        return select_first(limit, tasks, key=sort_key)
+
+    @staticmethod
+    def _read_json(request: requests.Request) -> Any:
+        """:return: decoded JSON body of the request, or None if it is missing or malformed"""
+        try:
+            return request.json()
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _is_not_modified(request: requests.Request, entity_tag: str) -> bool:
+        """:return: whether If-None-Match holds the tag, compared weakly, or matches any tag"""
+        requested_tags = {requested_tag.strip().removeprefix("W/") for requested_tag in
+                          request.headers.get(Headers.if_none_match, "").split(",")}
+        return "*" in requested_tags or entity_tag.removeprefix("W/") in requested_tags
+
+    @staticmethod
+    def _get_accepted_values(request: requests.Request, header: str) -> set:
+        """:return: media types or content codings listed in the header, except those with q=0"""
+        accepted_values = set()
+        for item in request.headers.get(header, "").split(","):
+            value, _, parameters = item.partition(";")
+            name, _, weight = parameters.partition("=")
+            if name.strip() == "q" and re.fullmatch(r"\s*0(\.0*)?\s*", weight):
+                continue
+            if value.strip():
+                accepted_values.add(value.strip())
+        return accepted_values
 
     @staticmethod
     def _make_mock_tasks() -> dict:
@@ -200,10 +726,27 @@ class ServerMock:
                                    url=RequestUrls.create_task(server_address).text(),
                                    text=self._create_task)
 
+        self._adapter.register_uri(method="POST",
+                                   url=RequestUrls.create_many_tasks(server_address).text(),
+                                   json=self._create_many_tasks)
+
+        self._adapter.register_uri(method="POST",
+                                   url=RequestUrls.advance_task(server_address).text(),
+                                   json=self._advance_task)
+
+        self._adapter.register_uri(method="POST",
+                                   url=RequestUrls.advance_clock(server_address).text(),
+                                   text=self._advance_clock)
+
         self._adapter.register_uri(method="GET",
                                    url=RequestUrls.get_robots(server_address).text(),
                                    text=self._get_robot_list)
 
+        self._adapter.register_uri(method="GET",
+                                   url=RequestUrls.get_fleet_stats(server_address).text(),
+                                   text=self._get_fleet_stats)
+
         task_endpoint_url = RequestUrl(root=server_address, endpoint=Endpoints.tasks).text()
         match_all_task_get_requests = re.compile(task_endpoint_url)
-        self._adapter.register_uri("GET", match_all_task_get_requests, json=self._get_tasks)
+        self._adapter.register_uri("GET", match_all_task_get_requests,
+                                   content=self._get_encoded_tasks)
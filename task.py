@@ -1,4 +1,7 @@
 class Task:
+    __slots__ = ("task_id", "creation_time", "robot_id", "runs", "branch", "status", "attempts",
+                 "successes")
+
     def __init__(self,
                  task_id: int,
                  creation_time: int,
@@ -15,18 +18,37 @@ class Task:
         self.attempts = None
         self.successes = None
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Task):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __hash__(self) -> int:
+        # The id is the only field that never changes, and equal Tasks have equal ids.
+        return hash(self.task_id)
+
+    def __repr__(self) -> str:
+        return f"Task({self.to_dict()})"
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in Task.__slots__}
+
+    @staticmethod
+    def from_dict(input_dict: dict) -> "Task":
+        task = Task(input_dict["task_id"],
+                    input_dict["creation_time"],
+                    input_dict["robot_id"],
+                    input_dict["runs"],
+                    input_dict["branch"])
+        task.status = input_dict["status"]
+        task.attempts = input_dict["attempts"]
+        task.successes = input_dict["successes"]
+        return task
+
 
 def dict_to_task(input_dict: dict) -> Task:
-    task = Task(input_dict["task_id"],
-                input_dict["creation_time"],
-                input_dict["robot_id"],
-                input_dict["runs"],
-                input_dict["branch"])
-    task.status = input_dict["status"]
-    task.attempts = input_dict["attempts"]
-    task.successes = input_dict["successes"]
-    return task
+    return Task.from_dict(input_dict)
 
 
 def dict_list_to_task_list(dict_list: list) -> list:
-    return [dict_to_task(task_dict) for task_dict in dict_list]
+    return [Task.from_dict(task_dict) for task_dict in dict_list]
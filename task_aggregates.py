@@ -0,0 +1,64 @@
+import collections
+
+from task import Task
+
+
+def make_summary(task_count: int, finished_count: int, runs: int, attempts: int,
+                 successes: int) -> dict:
+    return {"tasks": task_count,
+            "finished": finished_count,
+            "runs": runs,
+            "attempts": attempts,
+            "successes": successes,
+            "success_rate": successes / attempts if attempts > 0 else None}
+
+
+class TaskAggregates:
+    """
+    Task counts per status, and Task, run, attempt and success totals per robot and per branch,
+    kept up to date in constant time per Task change. A changing Task is removed with its old
+    values and added back with the new ones. Not thread-safe; the owner has to lock around it.
+    """
+
+    def __init__(self, tasks: list = ()) -> None:
+        self._status_counts = collections.Counter()
+        # Totals are [tasks, finished tasks, runs, attempts, successes] lists.
+        self._totals = [0] * 5
+        self._robot_totals = {}
+        self._branch_totals = {}
+        for task in tasks:
+            self.add(task)
+
+    def add(self, task: Task) -> None:
+        self._apply(task, 1)
+
+    def remove(self, task: Task) -> None:
+        self._apply(task, -1)
+
+    def to_dict(self) -> dict:
+        """
+        :return: dict with the overall summary, the Task count of each status, and the summaries
+            per robot id and per branch
+        """
+        return {"total": make_summary(*self._totals),
+                "statuses": {status: count for status, count in self._status_counts.items()
+                             if count > 0},
+                "robots": {robot_id: make_summary(*totals)
+                           for robot_id, totals in sorted(self._robot_totals.items())},
+                "branches": {branch: make_summary(*totals)
+                             for branch, totals in sorted(self._branch_totals.items())}}
+
+    def _apply(self, task: Task, sign: int) -> None:
+        self._status_counts[task.status] += sign
+        # Like in the Task tables, Tasks with results count as finished.
+        has_results = task.attempts is not None
+        contribution = (sign,
+                        sign if has_results else 0,
+                        sign * task.runs,
+                        sign * task.attempts if has_results else 0,
+                        sign * task.successes if has_results else 0)
+        for totals in (self._totals,
+                       self._robot_totals.setdefault(task.robot_id, [0] * 5),
+                       self._branch_totals.setdefault(task.branch, [0] * 5)):
+            for index, value in enumerate(contribution):
+                totals[index] += value
@@ -0,0 +1,82 @@
+import collections
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+
+class TaskCache:
+    """
+    Bounded LRU cache for Server responses, validated with the Server modification time.
+
+    Entries are trusted for ttl seconds after the last validation. After that, the next lookup
+    requests the Server modification time and drops all entries if it has changed.
+    Safe to share between threads.
+    """
+
+    def __init__(self, max_size: int, ttl: float,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self._entries = collections.OrderedDict()
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._validated_mod_time = None
+        self._validated_at = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key: Hashable, fetch_mod_time: Callable[[], int]) -> Any:
+        """
+        Revalidates the cache if needed and looks up the entry.
+
+        :param fetch_mod_time: callable returning the current Server modification time.
+        :return: cached value, or None if there is no valid entry for the key.
+        """
+        self._validate(fetch_mod_time)
+        with self._lock:
+            if key not in self._entries:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._entries:
+                self._invalidations += 1
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries),
+                    "max_size": self._max_size,
+                    "ttl": self._ttl,
+                    "hits": self._hits,
+                    "misses": self._misses,
+                    "evictions": self._evictions,
+                    "invalidations": self._invalidations}
+
+    def _validate(self, fetch_mod_time: Callable[[], int]) -> None:
+        """The Server is asked outside of the lock, so that slow requests don't block hits."""
+        now = self._clock()
+        with self._lock:
+            if self._validated_at is not None and now - self._validated_at < self._ttl:
+                return
+
+        mod_time = fetch_mod_time()
+        with self._lock:
+            if mod_time != self._validated_mod_time:
+                self.clear()
+            self._validated_mod_time = mod_time
+            self._validated_at = now
@@ -0,0 +1,172 @@
+"""
+Columnar binary encoding of Task lists, sent instead of JSON when the client accepts it.
+
+The body starts with the byte length of a UTF-8 JSON header, as a little-endian uint32. The
+header holds the row count, the name and type of each column, and the distinct values of the
+dictionary-encoded columns. The columns follow one after another as little-endian integer
+arrays. Branch and status are stored as indexes into their dictionaries, and missing attempts
+and successes of unfinished Tasks as -1.
+"""
+
+import array
+import contextlib
+import gc
+import json
+import struct
+import sys
+import threading
+
+from task import Task
+
+encoded_fields = ("branch", "status")
+optional_fields = ("attempts", "successes")
+missing_value = -1
+
+_value_type = "<i8"
+_code_type = "<i4"
+_array_typecodes = {_value_type: "q", _code_type: "i"}
+_header_length_format = "<I"
+
+_gc_pause_lock = threading.Lock()
+_gc_pause_count = 0
+_gc_was_enabled = False
+
+
+def encode_task_dicts(task_dicts: list) -> bytes:
+    """:param task_dicts: dicts with the same keys, all Task fields or a projection of them."""
+    fields = list(task_dicts[0]) if task_dicts else list(Task.__slots__)
+    columns = []
+    dictionaries = {}
+    buffers = []
+    for field in fields:
+        values = [task_dict[field] for task_dict in task_dicts]
+        if field in encoded_fields:
+            codes_by_value = {}
+            column = array.array(_array_typecodes[_code_type],
+                                 [codes_by_value.setdefault(value, len(codes_by_value))
+                                  for value in values])
+            dictionaries[field] = list(codes_by_value)
+            columns.append((field, _code_type))
+        else:
+            column = array.array(_array_typecodes[_value_type],
+                                 [missing_value if value is None else value for value in values])
+            columns.append((field, _value_type))
+        if sys.byteorder == "big":
+            column.byteswap()
+        buffers.append(column.tobytes())
+
+    header = json.dumps({"count": len(task_dicts), "columns": columns,
+                         "dictionaries": dictionaries}).encode()
+    return struct.pack(_header_length_format, len(header)) + header + b"".join(buffers)
+
+
+def read_buffers(content: bytes) -> tuple:
+    """
+    :return: decoded header, and dict of (memoryview of the column bytes, type) pairs by column
+        name, with types in NumPy dtype notation
+    :raises ValueError: if the content is truncated or malformed.
+    """
+    try:
+        (header_length,) = struct.unpack_from(_header_length_format, content)
+        header_start = struct.calcsize(_header_length_format)
+        header = json.loads(bytes(content[header_start:header_start + header_length]))
+        count = header["count"]
+        column_types = header["columns"]
+    except (struct.error, KeyError, TypeError, UnicodeDecodeError) as error:
+        raise ValueError(f"Invalid Task columns header: {error}")
+
+    view = memoryview(content)
+    offset = header_start + header_length
+    buffers = {}
+    for field, column_type in column_types:
+        if column_type not in _array_typecodes:
+            raise ValueError(f"Unknown Task column type: {column_type}")
+        size = count * array.array(_array_typecodes[column_type]).itemsize
+        if offset + size > len(view):
+            raise ValueError("Truncated Task columns.")
+        buffers[field] = (view[offset:offset + size], column_type)
+        offset += size
+    return header, buffers
+
+
+def decode_columns(content: bytes) -> dict:
+    """
+    :return: dict of column value lists by field name, in the encoded column order
+    :raises ValueError: if the content is malformed.
+    """
+    header, buffers = read_buffers(content)
+    columns = {}
+    for field, (buffer, column_type) in buffers.items():
+        column = array.array(_array_typecodes[column_type])
+        column.frombytes(buffer)
+        if sys.byteorder == "big":
+            column.byteswap()
+        if field in encoded_fields:
+            try:
+                dictionary = header["dictionaries"][field]
+                if column and min(column) < 0:
+                    raise IndexError("negative code")
+                columns[field] = [dictionary[code] for code in column]
+            except (KeyError, IndexError, TypeError) as error:
+                raise ValueError(f"Invalid dictionary of Task column {field}: {error}")
+        elif field in optional_fields:
+            columns[field] = [None if value == missing_value else value for value in column]
+        else:
+            columns[field] = column.tolist()
+    return columns
+
+
+def decode_tasks(content: bytes) -> list:
+    """
+    Builds the Tasks right from the columns, without intermediate dicts.
+
+    :return: list of Tasks
+    :raises ValueError: if the content is malformed or lacks Task fields.
+    """
+    columns = decode_columns(content)
+    try:
+        rows = zip(*(columns[field] for field in Task.__slots__))
+    except KeyError as error:
+        raise ValueError(f"Missing Task column: {error}")
+
+    tasks = []
+    new_task = Task.__new__
+    with _paused_garbage_collection():
+        for row in rows:
+            # Every slot is assigned, so the constructor defaults are not needed.
+            task = new_task(Task)
+            (task.task_id, task.creation_time, task.robot_id, task.runs, task.branch, task.status,
+             task.attempts, task.successes) = row
+            tasks.append(task)
+    return tasks
+
+
+def decode_dicts(content: bytes) -> list:
+    """:return: list of dicts with the encoded fields, for projected Task lists"""
+    columns = decode_columns(content)
+    fields = list(columns)
+    return [dict(zip(fields, row)) for row in zip(*columns.values())]
+
+
+@contextlib.contextmanager
+def _paused_garbage_collection():
+    """
+    Collections triggered by allocating many Tasks cannot free anything, as Tasks form no
+    reference cycles, but take most of the decode time when many objects are alive.
+
+    The collector is switched for the whole process, so concurrent decodes are counted: the
+    first one pauses it, and the last one restores the state from before the first.
+    """
+    global _gc_pause_count, _gc_was_enabled
+    with _gc_pause_lock:
+        if _gc_pause_count == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pause_count += 1
+    try:
+        yield
+    finally:
+        with _gc_pause_lock:
+            _gc_pause_count -= 1
+            if _gc_pause_count == 0 and _gc_was_enabled:
+                gc.enable()
@@ -0,0 +1,115 @@
+import bisect
+import collections
+from typing import Iterable, Iterator
+
+from task import Task
+
+
+class TaskIndex:
+    """Secondary indexes over the Server Task store, answering filtered queries without scans."""
+
+    ordered_fields = ("creation_time", "runs")
+
+    def __init__(self, tasks: Iterable[Task] = ()) -> None:
+        """
+        :param tasks: Tasks to index at once; each ordered index is sorted once, instead of
+            inserting into it Task by Task as add does.
+        """
+        self._task_ids = []
+        self._ids_by_robot = collections.defaultdict(set)
+        self._ids_by_status = collections.defaultdict(set)
+        self._creation_time_index = []
+        self._runs_index = []
+        self._branch_index = []
+        self._modification_times = {}
+        self._modification_log = []
+        for task in tasks:
+            self._task_ids.append(task.task_id)
+            self._ids_by_robot[task.robot_id].add(task.task_id)
+            self._ids_by_status[task.status].add(task.task_id)
+            self._creation_time_index.append((task.creation_time, task.task_id))
+            self._runs_index.append((task.runs, task.task_id))
+            self._branch_index.append((task.branch, task.task_id))
+        for index in (self._task_ids, self._creation_time_index, self._runs_index,
+                      self._branch_index):
+            index.sort()
+
+    def add(self, task: Task) -> None:
+        bisect.insort(self._task_ids, task.task_id)
+        self._ids_by_robot[task.robot_id].add(task.task_id)
+        self._ids_by_status[task.status].add(task.task_id)
+        bisect.insort(self._creation_time_index, (task.creation_time, task.task_id))
+        bisect.insort(self._runs_index, (task.runs, task.task_id))
+        bisect.insort(self._branch_index, (task.branch, task.task_id))
+
+    def update_status(self, task_id: int, old_status: str, new_status: str) -> None:
+        self._ids_by_status[old_status].discard(task_id)
+        self._ids_by_status[new_status].add(task_id)
+
+    def record_modification(self, task_id: int, modification_time: int) -> None:
+        """Modification times have to be recorded in non-decreasing order."""
+        self._modification_times[task_id] = modification_time
+        self._modification_log.append((modification_time, task_id))
+
+    def get_modification_time(self, task_id: int) -> int:
+        return self._modification_times[task_id]
+
+    def select_modified_after(self, modification_time: int) -> list:
+        """:return: ids of the Tasks modified after given time, in modification order"""
+        first = bisect.bisect_right(self._modification_log, (modification_time, float("inf")))
+        # Tasks modified many times are only returned at the position of their last change.
+        return [task_id for logged_time, task_id in self._modification_log[first:]
+                if self._modification_times[task_id] == logged_time]
+
+    def select(self, robot_id: int = None, status: str = None, after_id: int = None,
+               limit: int = None, creation_time_range: tuple = (None, None),
+               runs_range: tuple = (None, None), branch_prefix: str = None) -> list:
+        """
+        :param after_id: if given, only Tasks with greater ids are selected.
+        :param limit: maximum number of ids to return.
+        :param creation_time_range: lowest and highest creation time; None bounds are open.
+        :param runs_range: lowest and highest run count; None bounds are open.
+        :param branch_prefix: if given, only Tasks with branches starting with it are selected.
+        :return: sorted ids of the Tasks matching all given filters
+        """
+        candidate_sets = []
+        if robot_id is not None:
+            candidate_sets.append(self._ids_by_robot.get(robot_id, set()))
+        if status is not None:
+            candidate_sets.append(self._ids_by_status.get(status, set()))
+        if creation_time_range != (None, None):
+            candidate_sets.append(self._select_range(self._creation_time_index,
+                                                     *creation_time_range))
+        if runs_range != (None, None):
+            candidate_sets.append(self._select_range(self._runs_index, *runs_range))
+        if branch_prefix is not None:
+            # All strings starting with the prefix sort below the prefix followed by the
+            # highest code point.
+            candidate_sets.append(self._select_range(self._branch_index, branch_prefix,
+                                                     branch_prefix + chr(0x10FFFF)))
+
+        if candidate_sets:
+            candidate_sets.sort(key=len)
+            matching_ids = sorted(candidate_sets[0].intersection(*candidate_sets[1:]))
+        else:
+            matching_ids = self._task_ids
+
+        first = 0 if after_id is None else bisect.bisect_right(matching_ids, after_id)
+        last = len(matching_ids) if limit is None else first + limit
+        return matching_ids[first:last]
+
+    def iter_ordered(self, field: str, descending: bool = False) -> Iterator[int]:
+        """
+        :param field: one of the ordered_fields.
+        :return: iterator over all Task ids, ordered by the field and then by id
+        """
+        index = self._creation_time_index if field == "creation_time" else self._runs_index
+        ordered_entries = reversed(index) if descending else iter(index)
+        return (task_id for _, task_id in ordered_entries)
+
+    @staticmethod
+    def _select_range(index: list, low: object, high: object) -> set:
+        """:return: ids of the (value, id) index entries with values in [low, high]"""
+        first = 0 if low is None else bisect.bisect_left(index, (low,))
+        last = len(index) if high is None else bisect.bisect_right(index, (high, float("inf")))
+        return {task_id for _, task_id in index[first:last]}
@@ -0,0 +1,38 @@
+import threading
+
+from task import Task
+
+
+class TaskReplica:
+    """Local copy of the Server Task store, kept up to date by applying incremental syncs."""
+
+    def __init__(self) -> None:
+        self._tasks = {}
+        self._modification_time = None
+        self._lock = threading.Lock()
+
+    def get_modification_time(self) -> int:
+        """:return: Server modification time the replica is up to date with, None if never synced"""
+        return self._modification_time
+
+    def apply_sync(self, tasks: list, modification_time: int, is_full_sync: bool) -> None:
+        """A full sync replaces all Tasks; a delta sync adds and overwrites the Tasks it holds."""
+        with self._lock:
+            if is_full_sync:
+                self._tasks = {}
+            for task in tasks:
+                self._tasks[task.task_id] = task
+            self._modification_time = modification_time
+
+    def get(self, task_id: int) -> Task:
+        """:return: the Task, or None if it is not in the replica"""
+        return self._tasks.get(task_id)
+
+    def select(self, robot_id: int = None, status: str = None) -> list:
+        """:return: Tasks matching all given filters, sorted by id"""
+        with self._lock:
+            tasks = list(self._tasks.values())
+        return sorted((task for task in tasks
+                       if (robot_id is None or task.robot_id == robot_id)
+                       and (status is None or task.status == status)),
+                      key=lambda task: task.task_id)
@@ -0,0 +1,55 @@
+import numpy
+
+from task_aggregates import make_summary
+from task_table import TaskTable
+
+
+class TaskStatistics:
+    """Vectorized evaluation result aggregates over a TaskTable."""
+
+    def __init__(self, table: TaskTable) -> None:
+        self._table = table
+        self._has_results = table.column("attempts") != TaskTable.missing_value
+        self._attempts = numpy.where(self._has_results, table.column("attempts"), 0)
+        self._successes = numpy.where(self._has_results, table.column("successes"), 0)
+
+    def summarize(self) -> dict:
+        """:return: Task count, run count, attempt and success totals and the success rate"""
+        return make_summary(task_count=len(self._table),
+                            finished_count=int(self._has_results.sum()),
+                            runs=int(self._table.column("runs").sum()),
+                            attempts=int(self._attempts.sum()),
+                            successes=int(self._successes.sum()))
+
+    def summarize_by(self, group_name: str) -> dict:
+        """:return: summary for each distinct value of the grouping column"""
+        # Robot ids and dictionary codes are small non-negative integers, so they index the
+        # bincount results directly, without sorting the column to find the distinct values.
+        group_codes = self._table.column(group_name)
+
+        def group_sums(weights: numpy.ndarray = None) -> numpy.ndarray:
+            return numpy.bincount(group_codes, weights=weights)
+
+        task_counts = group_sums()
+        groups = numpy.flatnonzero(task_counts)
+        task_counts = task_counts[groups]
+        finished_counts = group_sums(self._has_results.astype(numpy.int64))[groups]
+        runs = group_sums(self._table.column("runs"))[groups]
+        attempts = group_sums(self._attempts)[groups]
+        successes = group_sums(self._successes)[groups]
+
+        if group_name in TaskTable.encoded_columns:
+            groups = numpy.array(self._table.get_dictionary(group_name), dtype=object)[groups]
+
+        return {group.item() if isinstance(group, numpy.generic) else group:
+                make_summary(int(task_counts[index]), int(finished_counts[index]),
+                             int(runs[index]), int(attempts[index]), int(successes[index]))
+                for index, group in enumerate(groups)}
+
+    def attempt_percentiles(self, percentiles: list) -> dict:
+        """:return: percentiles of attempts per finished Task, or None values if there are none"""
+        finished_attempts = self._attempts[self._has_results]
+        if len(finished_attempts) == 0:
+            return {percentile: None for percentile in percentiles}
+        values = numpy.percentile(finished_attempts, percentiles)
+        return {percentile: float(value) for percentile, value in zip(percentiles, values)}
@@ -0,0 +1,100 @@
+import contextlib
+import threading
+from typing import Iterable
+
+from task import Task
+
+
+class TaskStore:
+    """
+    Tasks by id, split into shards by id, each with its own lock, so that threads getting and
+    putting single Tasks rarely wait for each other. Task ids are allocated atomically.
+
+    Stored Tasks are never changed in place: a changed Task is stored as a new object replacing
+    the old one, so a Task read from the store stays consistent while other threads update it.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = (), shard_count: int = 16,
+                 next_id: int = None) -> None:
+        """:param next_id: first id to allocate; by default the one after the greatest Task id."""
+        self._shards = [{} for _ in range(shard_count)]
+        self._shard_locks = [threading.Lock() for _ in range(shard_count)]
+        for task in tasks:
+            self._shards[task.task_id % shard_count][task.task_id] = task
+        if next_id is None:
+            next_id = max((max(shard, default=0) for shard in self._shards), default=0) + 1
+        self._next_id = next_id
+        self._id_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def __contains__(self, task_id: object) -> bool:
+        # Like a dict, answers for ids of any type, e.g. when taken from a request unchecked.
+        return isinstance(task_id, int) and self.get(task_id) is not None
+
+    def allocate_id(self) -> int:
+        """:return: an id no other call returns"""
+        with self._id_lock:
+            task_id = self._next_id
+            self._next_id += 1
+            return task_id
+
+    def get(self, task_id: int) -> Task:
+        """:return: the Task, or None if there is no Task with the id"""
+        shard_index = task_id % len(self._shards)
+        with self._shard_locks[shard_index]:
+            return self._shards[shard_index].get(task_id)
+
+    def get_many(self, task_ids: list) -> list:
+        """
+        Takes the lock of each shard once, rather than once per Task, and reads all Tasks at the
+        same moment.
+
+        :return: list of the Tasks with given ids in the same order, with None for missing ids
+        """
+        with self._locked_shards():
+            shards = self._shards
+            shard_count = len(shards)
+            return [shards[task_id % shard_count].get(task_id) for task_id in task_ids]
+
+    def get_many_unlocked(self, task_ids: list) -> list:
+        """
+        Like get_many, but without taking the shard locks, so that concurrent callers do not
+        wait for each other. Only for callers that otherwise keep all puts out while reading,
+        e.g. by holding the read side of a ReadWriteLock whose write side every put is made under.
+
+        :return: list of the Tasks with given ids in the same order, with None for missing ids
+        """
+        shards = self._shards
+        shard_count = len(shards)
+        return [shards[task_id % shard_count].get(task_id) for task_id in task_ids]
+
+    def put(self, task: Task) -> None:
+        """Adds the Task, or replaces the stored Task with the same id."""
+        shard_index = task.task_id % len(self._shards)
+        with self._shard_locks[shard_index]:
+            self._shards[shard_index][task.task_id] = task
+
+    def snapshot(self) -> dict:
+        """
+        Holds the locks of all shards while copying, so the copy reflects a single moment even
+        while Tasks are put concurrently.
+
+        :return: dict of all Tasks by id
+        """
+        with self._locked_shards():
+            tasks = {}
+            for shard in self._shards:
+                tasks.update(shard)
+            return tasks
+
+    @contextlib.contextmanager
+    def _locked_shards(self):
+        """
+        Locks are taken in shard order, and writers hold at most one, so this cannot deadlock.
+        """
+        with contextlib.ExitStack() as stack:
+            for shard_lock in self._shard_locks:
+                stack.enter_context(shard_lock)
+            yield
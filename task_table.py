@@ -0,0 +1,140 @@
+from typing import Iterator
+
+import numpy
+
+import task_codec
+from task import Task
+
+
+class TaskTable:
+    """
+    Columnar storage of many Tasks, with one NumPy array per field.
+
+    Branch and status are dictionary-encoded: their columns hold indexes into lists of the
+    distinct values. Missing attempts and successes of unfinished Tasks are stored as -1.
+    """
+
+    numeric_columns = ("task_id", "creation_time", "robot_id", "runs", "attempts", "successes")
+    encoded_columns = ("branch", "status")
+    missing_value = task_codec.missing_value
+
+    def __init__(self, columns: dict, dictionaries: dict) -> None:
+        """
+        :param columns: NumPy array for each of the numeric and encoded columns.
+        :param dictionaries: list of distinct values for each of the encoded columns.
+        """
+        self._columns = columns
+        self._dictionaries = dictionaries
+
+    def __len__(self) -> int:
+        return len(self._columns["task_id"])
+
+    def __iter__(self) -> Iterator[Task]:
+        decoded_columns = {name: self.decode(name) for name in self.encoded_columns}
+        for row in range(len(self)):
+            task = Task(int(self._columns["task_id"][row]),
+                        int(self._columns["creation_time"][row]),
+                        int(self._columns["robot_id"][row]),
+                        int(self._columns["runs"][row]),
+                        decoded_columns["branch"][row])
+            task.status = decoded_columns["status"][row]
+            task.attempts = self._to_optional_int(self._columns["attempts"][row])
+            task.successes = self._to_optional_int(self._columns["successes"][row])
+            yield task
+
+    @staticmethod
+    def from_dicts(task_dicts: list) -> "TaskTable":
+        columns = {}
+        for name in TaskTable.numeric_columns:
+            columns[name] = numpy.fromiter(
+                (TaskTable.missing_value if task_dict[name] is None else task_dict[name]
+                 for task_dict in task_dicts),
+                dtype=numpy.int64, count=len(task_dicts))
+
+        dictionaries = {}
+        for name in TaskTable.encoded_columns:
+            values = numpy.array([task_dict[name] for task_dict in task_dicts], dtype=object)
+            dictionary, codes = numpy.unique(values.astype(str), return_inverse=True)
+            dictionaries[name] = dictionary.tolist()
+            columns[name] = codes.astype(numpy.int32)
+
+        return TaskTable(columns, dictionaries)
+
+    @staticmethod
+    def from_columns(content: bytes) -> "TaskTable":
+        """
+        Wraps the columns of a columnar encoded Task list without copying them.
+
+        :raises ValueError: if the content is malformed or lacks Task fields.
+        """
+        header, buffers = task_codec.read_buffers(content)
+        missing_names = set(TaskTable.numeric_columns + TaskTable.encoded_columns) - set(buffers)
+        if missing_names:
+            raise ValueError(f"Missing Task columns: {sorted(missing_names)}")
+        columns = {name: numpy.frombuffer(buffer, dtype=column_type)
+                   for name, (buffer, column_type) in buffers.items()}
+        return TaskTable(columns, {name: header["dictionaries"][name]
+                                   for name in TaskTable.encoded_columns})
+
+    @staticmethod
+    def from_tasks(tasks: list) -> "TaskTable":
+        return TaskTable.from_dicts([task.to_dict() for task in tasks])
+
+    def column(self, name: str) -> numpy.ndarray:
+        """:return: array of the column; codes into get_dictionary(name) for encoded columns"""
+        return self._columns[name]
+
+    def get_dictionary(self, name: str) -> list:
+        return self._dictionaries[name]
+
+    def decode(self, name: str) -> numpy.ndarray:
+        """:return: array of the actual values of an encoded column"""
+        return numpy.array(self._dictionaries[name], dtype=object)[self._columns[name]]
+
+    def filter(self, mask: numpy.ndarray) -> "TaskTable":
+        """:return: table with the rows for which the boolean mask is true"""
+        return TaskTable({name: column[mask] for name, column in self._columns.items()},
+                         self._dictionaries)
+
+    def where(self, robot_id: int = None, status: str = None, branch: str = None) -> "TaskTable":
+        """:return: table with the rows matching all given values"""
+        mask = numpy.ones(len(self), dtype=bool)
+        if robot_id is not None:
+            mask &= self._columns["robot_id"] == robot_id
+        if status is not None:
+            mask &= self._columns["status"] == self._encode("status", status)
+        if branch is not None:
+            mask &= self._columns["branch"] == self._encode("branch", branch)
+        return self.filter(mask)
+
+    def sum(self, name: str) -> int:
+        """:return: sum of a numeric column, skipping missing values"""
+        column = self._columns[name]
+        return int(column[column != self.missing_value].sum())
+
+    def group_sum(self, group_name: str, value_name: str) -> dict:
+        """
+        :return: sums of a numeric column, skipping missing values, for each distinct value
+            of the grouping column
+        """
+        groups, group_codes = numpy.unique(self._columns[group_name], return_inverse=True)
+        values = self._columns[value_name]
+        weights = numpy.where(values == self.missing_value, 0, values)
+        sums = numpy.bincount(group_codes.ravel(), weights=weights, minlength=len(groups))
+
+        if group_name in self.encoded_columns:
+            groups = numpy.array(self._dictionaries[group_name], dtype=object)[groups]
+        return {self._to_python(group): int(total) for group, total in zip(groups, sums)}
+
+    def _encode(self, name: str, value: str) -> int:
+        """:return: code of the value, or -1 (matching no rows) if it is absent from the table"""
+        dictionary = self._dictionaries[name]
+        return dictionary.index(value) if value in dictionary else -1
+
+    @staticmethod
+    def _to_optional_int(value: numpy.int64) -> int:
+        return None if value == TaskTable.missing_value else int(value)
+
+    @staticmethod
+    def _to_python(value: object) -> object:
+        return value.item() if isinstance(value, numpy.generic) else value
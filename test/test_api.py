@@ -1,6 +1,7 @@
 import unittest
+import urllib.parse
 
-from api import Query
+from api import Query, RequestUrls, TaskFilter
 
 
 class QueryTests(unittest.TestCase):
@@ -10,5 +11,21 @@ class QueryTests(unittest.TestCase):
         self.assertEqual(test_query.text(), expected_string_representation)
 
 
+class TaskFilterTests(unittest.TestCase):
+    def test_is_parsed_back_from_request_url(self):
+        task_filter = TaskFilter(min_runs=3, branch_prefix="dev&test", sort_field="runs",
+                                 descending=True, limit=5, fields=["task_id", "runs"])
+        request_url = RequestUrls.get_all_tasks("https-mock://server.ai:5000", task_filter).text()
+
+        query = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(request_url).query))
+        parsed_filter = TaskFilter.from_query(query)
+
+        self.assertEqual(parsed_filter.get_key(), task_filter.get_key())
+        self.assertEqual(parsed_filter.branch_prefix, "dev&test")
+
+    def test_rejects_unknown_sort_field(self):
+        self.assertRaises(ValueError, TaskFilter.from_query, {"sort": "robot_name"})
+
+
 if __name__ == '__main__':
     unittest.main()
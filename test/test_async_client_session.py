@@ -0,0 +1,69 @@
+import asyncio
+import time
+import unittest
+
+from async_client_session import AsyncClientSession
+from commands import Connect
+from exceptions import ExecutionError
+
+
+class SlowSession:
+    """Stands in for a ClientSession whose Task requests take the Task id in seconds."""
+
+    def get_task(self, task_id: float, simulate_failure: bool) -> float:
+        time.sleep(task_id)
+        return task_id
+
+
+class TestAsyncClientSession(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.session = AsyncClientSession(Connect().execute(arguments=""), max_concurrency=4)
+        self.addCleanup(self.session.close)
+
+    async def test_gathers_tasks_in_requested_order(self):
+        task_ids = [1, 8, 117, 213, 503, 789, 1024]
+
+        tasks = await asyncio.gather(*(self.session.get_task(task_id, False)
+                                       for task_id in task_ids))
+
+        self.assertEqual([task.task_id for task in tasks], task_ids)
+
+    async def test_assigns_unique_ids_to_concurrently_created_tasks(self):
+        created_task_ids = await asyncio.gather(
+            *(self.session.request_task_creation("Karl", "git_branch", 1) for _ in range(20)))
+
+        self.assertEqual(sorted(created_task_ids), list(range(1701, 1721)))
+
+    async def test_raises_execution_error_if_failure_requested(self):
+        with self.assertRaises(ExecutionError):
+            await self.session.get_robot_dict(simulate_failure=True)
+
+
+class TestAsyncClientSessionLimits(unittest.TestCase):
+    def test_runs_in_consecutive_event_loops(self):
+        session = AsyncClientSession(Connect().execute(arguments=""), max_concurrency=2)
+        self.addCleanup(session.close)
+
+        async def get_tasks() -> list:
+            tasks = await asyncio.gather(*(session.get_task(task_id, False)
+                                           for task_id in [1, 8, 117, 213, 503]))
+            return [task.task_id for task in tasks]
+
+        self.assertEqual(asyncio.run(get_tasks()), [1, 8, 117, 213, 503])
+        self.assertEqual(asyncio.run(get_tasks()), [1, 8, 117, 213, 503])
+
+    def test_does_not_count_waiting_for_a_thread_against_timeout(self):
+        session = AsyncClientSession(SlowSession(), max_concurrency=1, timeout=0.3)
+        self.addCleanup(session.close)
+
+        async def get_tasks() -> float:
+            with self.assertRaises(ExecutionError):
+                await session.get_task(0.5, False)
+            # Waits for the thread of the timed out request, and then runs within the timeout.
+            return await session.get_task(0.2, False)
+
+        self.assertEqual(asyncio.run(get_tasks()), 0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
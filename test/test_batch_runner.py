@@ -0,0 +1,74 @@
+import io
+import json
+import unittest
+
+from batch_runner import BatchRunner
+from client_session import ClientSession
+from commands import Connect, GetRobots
+from user_interface import UserInterface
+
+
+class BrokenGetRobots(GetRobots):
+    def execute(self, arguments: str, session: ClientSession) -> dict:
+        raise ValueError("broken")
+
+
+class TestBatchRunner(unittest.TestCase):
+    def run_lines(self, lines: list, keep_going: bool = False) -> tuple:
+        """:return: failure count and list of printed records"""
+        output = io.StringIO()
+        runner = BatchRunner(UserInterface.build_command_registry(), output, worker_count=4,
+                             keep_going=keep_going)
+        failure_count = runner.run(lines)
+        return failure_count, [json.loads(line) for line in output.getvalue().splitlines()]
+
+    def test_prints_results_as_json_lines_in_command_order(self):
+        failure_count, records = self.run_lines(["connect", "", "# comment", "get_task 8 1",
+                                                 "get_modification_time"])
+
+        self.assertEqual(failure_count, 0)
+        self.assertEqual([record["line"] for record in records], [1, 4, 5])
+        self.assertEqual([result["item"] for result in records[1]["result"]], [8, 1])
+        self.assertEqual(records[1]["result"][0]["value"]["task_id"], 8)
+        self.assertIsInstance(records[2]["result"], int)
+
+    def test_commands_after_state_change_see_it(self):
+        _, records = self.run_lines(["connect", "create_task Karl git_branch 10",
+                                     "get_task 1701"])
+
+        self.assertEqual(records[1]["result"], 1701)
+        self.assertEqual(records[2]["result"][0]["value"]["branch"], "git_branch")
+
+    def test_stops_at_first_failure(self):
+        failure_count, records = self.run_lines(["connect", "get_task x", "create_task",
+                                                 "get_robots"])
+
+        self.assertEqual(failure_count, 1)
+        self.assertEqual(len(records), 2)
+        self.assertIn("Invalid command arguments", records[1]["error"])
+
+    def test_keeps_going_after_failures_if_requested(self):
+        failure_count, records = self.run_lines(["get_robots", "connect", "unknown",
+                                                 "get_robots"], keep_going=True)
+
+        self.assertEqual(failure_count, 2)
+        self.assertEqual(records[0]["error"],
+                         "Server connection required. Call \"connect\" first.")
+        self.assertEqual(records[2]["error"], "Unknown command: unknown")
+        self.assertEqual(records[3]["result"]["0"], "Molly")
+
+    def test_records_unexpected_errors_and_keeps_going(self):
+        output = io.StringIO()
+        runner = BatchRunner({"connect": Connect(), "get_robots": BrokenGetRobots()}, output,
+                             keep_going=True)
+
+        failure_count = runner.run(["connect", "get_robots", "get_robots"])
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(failure_count, 2)
+        self.assertEqual([record["line"] for record in records], [1, 2, 3])
+        self.assertEqual(records[1]["error"], "Unexpected error: ValueError: broken")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,22 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
 import time
 import unittest
 
-from commands import Connect, CreateTask, GetTask
+from commands import AdvanceClock, AdvanceTask, Connect, CreateTask, CreateTasks, GetCacheStats, \
+    GetFleetStats, GetManyTasks, GetStats, GetTask, GetTasks, GetTaskStats, WatchTasks
+import task_codec
+from api import MediaTypes, RequestUrls, TaskFilter
+from client_session import ClientSession
 from exceptions import ExecutionError
+from instrumentation import MetricsRegistry, registry
+from mock_simulation import SimulationConfig
+from server_mock import ServerMock
 from task import Task
+from transport import Transport, TransportConfig
 
 
 class TestConnect(unittest.TestCase):
@@ -23,6 +36,38 @@ class TestConnect(unittest.TestCase):
 
         self.assertRaises(ExecutionError, Connect().execute, arguments)
 
+    def test_raises_execution_error_if_real_server_is_unreachable(self):
+        arguments = "--real-http --host 127.0.0.1 --port 9 --retries 0 --timeout 1"
+
+        self.assertRaises(ExecutionError, Connect().execute, arguments)
+
+    def test_serves_tasks_from_store_of_previous_session(self):
+        file_descriptor, path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(file_descriptor)
+        self.addCleanup(os.remove, path)
+        Connect().execute(f"--store {path}")
+
+        session = Connect().execute(f"--store {path}")
+        results = list(GetTask().execute("1 8", session))
+
+        self.assertEqual([result.value.task_id for result in results], [1, 8])
+        self.assertEqual(session.get_robot_dict(False)[0], "Molly")
+
+    def test_resyncs_all_tasks_from_restarted_server(self):
+        file_descriptor, path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(file_descriptor)
+        self.addCleanup(os.remove, path)
+        session = Connect().execute(f"--store {path}")
+        for _ in range(3):
+            CreateTask().execute("Karl git_branch 3", session)
+        session.sync_tasks()
+
+        restarted_session = Connect().execute(f"--store {path}")
+        tasks = restarted_session.get_synced_tasks(None, None, False)
+
+        self.assertEqual(len(tasks), 7)
+        self.assertIsNotNone(next(GetTask().execute("1701", restarted_session)).error)
+
 
 class WithClientSessionFixture(unittest.TestCase):
     def setUp(self):
@@ -48,13 +93,618 @@ class TestCreateTask(WithClientSessionFixture):
         arguments = f"Molly {expected_task.branch} {expected_task.runs}"
 
         created_task_id = CreateTask().execute(arguments, self.session)
-        created_task = GetTask().execute(str(created_task_id), self.session)
+        created_task = next(GetTask().execute(str(created_task_id), self.session)).value
 
         current_timestamp = int(time.time())
         self.assertAlmostEqual(current_timestamp, created_task.creation_time)
 
         expected_task.creation_time = created_task.creation_time
-        self.assertDictEqual(created_task.__dict__, expected_task.__dict__)
+        self.assertDictEqual(created_task.to_dict(), expected_task.to_dict())
+
+    def test_rejects_invalid_branch_and_run_count(self):
+        results = self.session.request_bulk_task_creation(
+            [{"robot_id": 0, "branch": 5, "runs": 1},
+             {"robot_id": 0, "branch": "b", "runs": 0},
+             {"robot_id": 0, "branch": "b", "runs": True}])
+
+        self.assertEqual(results, [(None, "Invalid branch requested."),
+                                   (None, "Invalid run count requested."),
+                                   (None, "Invalid run count requested.")])
+        self.assertEqual(len(self.session.get_many_tasks(None, None, False)), 7)
+        self.assertEqual(self.session.get_fleet_stats(False)["total"]["tasks"], 7)
+
+    def test_creates_task_for_robot_id(self):
+        created_task_id = CreateTask().execute("--by-id 2 git_branch 10", self.session)
+
+        created_task = next(GetTask().execute(str(created_task_id), self.session)).value
+        self.assertEqual(created_task.robot_id, 2)
+        self.assertRaises(ExecutionError, CreateTask().execute, "--by-id 4 git_branch 10",
+                          self.session)
+
+
+class TestCreateTasks(WithClientSessionFixture):
+    def write_record_file(self, suffix: str, content: str) -> str:
+        file_descriptor, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(file_descriptor, "w") as record_file:
+            record_file.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_returns_ids_in_record_order_across_chunks(self):
+        path = self.write_record_file(".csv", "robot_name,branch,runs\n"
+                                              "Molly,branch_a,10\n"
+                                              "Bosco,branch_b,5\n"
+                                              "Karl,branch_c,1\n")
+
+        results = CreateTasks().execute(f"{path} --chunk-size 2", self.session)
+
+        self.assertEqual(results, [(1701, None), (1702, None), (1703, None)])
+
+    def test_reports_rejected_records(self):
+        path = self.write_record_file(".jsonl",
+                                      '{"robot_name": "Molly", "branch": "a", "runs": 1}\n'
+                                      '{"robot_name": "BadRobot", "branch": "b", "runs": 1}\n')
+
+        results = CreateTasks().execute(path, self.session)
+
+        self.assertEqual(results, [(1701, None), (None, "Invalid robot name requested.")])
+
+    def test_raises_if_record_is_incomplete(self):
+        path = self.write_record_file(".jsonl", '{"robot_name": "Molly"}\n')
+
+        self.assertRaises(ExecutionError, CreateTasks().execute, path, self.session)
+
+
+class TestGetTask(WithClientSessionFixture):
+    def test_returns_tasks_in_requested_order_in_parallel_mode(self):
+        results = GetTask().execute("1024 8 1 117 --parallel 4", self.session)
+
+        self.assertEqual([result.value.task_id for result in results], [1024, 8, 1, 117])
+
+    def test_collects_errors_without_aborting_other_ids(self):
+        results = list(GetTask().execute("1 2 8 --parallel 2", self.session))
+
+        self.assertEqual([result.item for result in results], [1, 2, 8])
+        self.assertIsNone(results[0].error)
+        self.assertIsNotNone(results[1].error)
+        self.assertEqual(results[2].value.task_id, 8)
+
+
+class TestGetTasks(WithClientSessionFixture):
+    def test_returns_tasks_in_requested_order(self):
+        task_list, missing_ids = GetTasks().execute("117 1 8", self.session)
+
+        self.assertEqual([task.task_id for task in task_list], [117, 1, 8])
+        self.assertEqual(missing_ids, [])
+
+    def test_reports_missing_ids(self):
+        task_list, missing_ids = GetTasks().execute("1 2 3", self.session)
+
+        self.assertEqual([task.task_id for task in task_list], [1])
+        self.assertEqual(missing_ids, [2, 3])
+
+
+class TestGetManyTasks(WithClientSessionFixture):
+    def test_returns_tasks_matching_robot_and_status(self):
+        results = GetManyTasks().execute("-r Molly -s finished", self.session)
+
+        self.assertEqual([result.value.task_id for result in results], [1, 8])
+
+    def test_includes_created_task_in_status_filter(self):
+        created_task_id = CreateTask().execute("Karl git_branch 10", self.session)
+
+        results = GetManyTasks().execute("-r Karl -s waiting", self.session)
+
+        self.assertEqual([result.value.task_id for result in results], [created_task_id])
+
+    def test_returns_all_tasks_across_pages(self):
+        all_results = GetManyTasks().execute("", self.session)
+        all_task_ids = [result.value.task_id for result in all_results]
+
+        paged_results = GetManyTasks().execute("-p 2", self.session)
+        paged_task_ids = [result.value.task_id for result in paged_results]
+
+        self.assertEqual(paged_task_ids, all_task_ids)
+        self.assertEqual(len(paged_task_ids), 7)
+
+    def test_reports_error_if_failure_requested(self):
+        results = list(GetManyTasks().execute("--fail", self.session))
+
+        self.assertEqual(len(results), 1)
+        self.assertIsNotNone(results[0].error)
+
+    def test_returns_tasks_of_robot_ids(self):
+        results = GetManyTasks().execute("--robot-id 2 -r Molly -s finished", self.session)
+
+        self.assertEqual([(result.item, result.value.task_id) for result in results],
+                         [("Molly", 1), ("Molly", 8), (2, 213)])
+
+    def test_keeps_robot_order_in_parallel_mode(self):
+        results = GetManyTasks().execute("-r Doretta -r Molly --parallel 2", self.session)
+
+        self.assertEqual([result.value.task_id for result in results], [213, 789, 1, 8, 1024])
+
+    def test_returns_the_same_tasks_in_sync_mode(self):
+        results = GetManyTasks().execute("-r Molly", self.session)
+        synced_results = GetManyTasks().execute("-r Molly --sync", self.session)
+
+        self.assertEqual([result.value for result in synced_results],
+                         [result.value for result in results])
+
+
+class TestGetManyTasksWithTaskFilter(WithClientSessionFixture):
+    def get_task_ids(self, arguments: str) -> list:
+        return [result.value.task_id for result in GetManyTasks().execute(arguments, self.session)]
+
+    def test_filters_by_creation_time_and_run_ranges_including_bounds(self):
+        self.assertEqual(self.get_task_ids("--min-creation-time 1612017000 "
+                                           "--max-creation-time 1613707000"), [8, 213, 503])
+        self.assertEqual(self.get_task_ids("--min-runs 5 --max-runs 20"), [1, 8, 117, 213])
+
+    def test_filters_by_branch_prefix_across_pages(self):
+        self.assertEqual(self.get_task_ids("-b configs_dev_0_2"), [8, 117])
+        self.assertEqual(self.get_task_ids("-b configs_dev_0_ --min-runs 20 -p 1"),
+                         [213, 789, 1024])
+
+    def test_sorts_and_limits_on_server(self):
+        self.assertEqual(self.get_task_ids("--sort runs --desc -l 2"), [789, 1024])
+        self.assertEqual(self.get_task_ids("-s finished --sort creation_time -l 2"), [1, 8])
+
+    def test_sorts_tasks_missing_the_field_last(self):
+        self.assertEqual(self.get_task_ids("--sort attempts"), [503, 8, 1, 213, 117, 789, 1024])
+        self.assertEqual(self.get_task_ids("--sort attempts --desc"),
+                         [213, 1, 8, 503, 1024, 789, 117])
+
+    def test_returns_only_projected_fields(self):
+        results = GetManyTasks().execute("-r Molly --fields task_id,successes", self.session)
+
+        self.assertEqual([result.value for result in results],
+                         [{"task_id": 1, "successes": 18}, {"task_id": 8, "successes": 5},
+                          {"task_id": 1024, "successes": None}])
+
+    def test_reports_error_for_unknown_field(self):
+        results = list(GetManyTasks().execute("--fields task_id,nope", self.session))
+
+        self.assertIn("400", results[0].error)
+
+    def test_raises_for_range_filter_in_sync_mode(self):
+        self.assertRaises(ExecutionError, GetManyTasks().execute, "--min-runs 5 --sync",
+                          self.session)
+
+
+class TestClientSessionSync(WithClientSessionFixture):
+    def test_downloads_only_changed_tasks(self):
+        initial_task_count = self.session.sync_tasks()
+        created_task_id = CreateTask().execute("Karl git_branch 10", self.session)
+
+        changed_task_count = self.session.sync_tasks()
+        synced_task_ids = [task.task_id for task in
+                           self.session.get_synced_tasks("Karl", None, False)]
+
+        self.assertEqual(initial_task_count, 7)
+        self.assertEqual(changed_task_count, 1)
+        self.assertEqual(synced_task_ids, [503, created_task_id])
+
+    def test_skips_sync_if_server_has_not_changed(self):
+        self.session.sync_tasks()
+
+        self.assertEqual(self.session.sync_tasks(), 0)
+
+
+class TestClientSessionRobotRegistry(WithClientSessionFixture):
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+
+    def get_request_counts(self) -> dict:
+        """:return: dict of counts of responses by endpoint and status"""
+        return {(counter["labels"]["endpoint"], counter["labels"]["status"]): counter["value"]
+                for counter in registry.to_dict()["counters"]["client_responses_total"]}
+
+    def test_revalidates_registry_with_its_entity_tag(self):
+        robot_registry = self.session.get_robot_registry(False)
+
+        self.assertIs(self.session.get_robot_registry(False), robot_registry)
+        CreateTask().execute("Karl git_branch 10", self.session)
+        # The robot list has not changed with the Tasks.
+        self.assertIs(self.session.get_robot_registry(False), robot_registry)
+        robot_counts = {key: count for key, count in self.get_request_counts().items()
+                        if key[0] in ("robots", "info")}
+        self.assertEqual(robot_counts, {("robots", "200"): 1, ("robots", "304"): 2})
+        self.assertEqual(robot_registry.get_id("Doretta"), 2)
+        self.assertEqual(robot_registry.get_name(3), "Karl")
+
+    def test_synced_queries_reuse_registry_without_requests(self):
+        self.session.get_synced_tasks("Karl", None, False)
+        registry.clear()
+
+        tasks = self.session.get_synced_tasks("Doretta", None, False)
+
+        self.assertEqual([task.task_id for task in tasks], [213, 789])
+        self.assertEqual(self.get_request_counts(), {("info", "200"): 1})
+
+
+class TestConditionalRequests(WithClientSessionFixture):
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+
+    def get_status_counts(self) -> dict:
+        return {counter["labels"]["status"]: counter["value"]
+                for counter in registry.to_dict()["counters"]["client_responses_total"]
+                if counter["labels"]["endpoint"] == "tasks" and
+                counter["labels"]["method"] == "GET"}
+
+    def test_unchanged_task_is_not_sent_again(self):
+        task = self.session.get_task(8, False)
+
+        self.assertIs(self.session.get_task(8, False), task)
+        self.assertEqual(self.get_status_counts(), {"200": 1, "304": 1})
+
+    def test_changed_task_is_sent_again(self):
+        self.session.get_task(789, False)
+        AdvanceTask().execute("789", self.session)
+
+        self.assertEqual(self.session.get_task(789, False).status, "finished")
+        self.assertEqual(self.session.get_task(8, False).status, "finished")
+        self.assertEqual(self.get_status_counts(), {"200": 3})
+
+    def test_task_list_is_validated_as_a_whole(self):
+        tasks = self.session.get_many_tasks("Doretta", None, False)
+        self.assertEqual(self.session.get_many_tasks("Doretta", None, False), tasks)
+
+        CreateTask().execute("Molly git_branch 10", self.session)
+        self.assertEqual(self.session.get_many_tasks("Doretta", None, False), tasks)
+        self.assertEqual(self.get_status_counts(), {"200": 2, "304": 1})
+
+    def test_table_is_not_answered_with_value_decoded_as_list(self):
+        tasks = self.session.get_many_tasks(None, None, False)
+
+        table = self.session.get_many_tasks(None, None, False, as_table=True)
+
+        self.assertIsInstance(tasks, list)
+        self.assertEqual(len(table), len(tasks))
+        self.assertEqual(GetTaskStats().execute("", self.session)["total"]["tasks"], len(tasks))
+        self.assertEqual(self.get_status_counts(), {"200": 2, "304": 1})
+
+    def test_batch_is_sent_again_once_missing_task_is_created(self):
+        self.assertEqual(self.session.get_tasks([8, 1701], False)[1], [1701])
+        self.assertEqual(self.session.get_tasks([8, 1701], False)[1], [1701])
+
+        CreateTask().execute("Molly git_branch 10", self.session)
+        self.assertEqual(self.session.get_tasks([8, 1701], False)[1], [])
+        self.assertEqual(self.get_status_counts(), {"200": 2, "304": 1})
+
+
+class TestClientSessionBulkMode(WithClientSessionFixture):
+    def test_returns_table_with_the_same_tasks(self):
+        task_list = self.session.get_many_tasks("Molly", None, False)
+
+        task_table = self.session.get_many_tasks("Molly", None, False, as_table=True)
+
+        self.assertEqual(list(task_table), task_list)
+
+
+class TestConcurrentServerAccess(unittest.TestCase):
+    def test_concurrent_writers_get_unique_ids_and_readers_consistent_lists(self):
+        server_address = "https-mock://server.ai:5000"
+        server = ServerMock(server_address)
+        created_task_ids = []
+        read_failures = []
+        writers_done = threading.Event()
+
+        def create_tasks():
+            transport = Transport(TransportConfig(), server.get_mock_adapter())
+            for _ in range(50):
+                response, _ = transport.request("POST",
+                                                RequestUrls.create_task(server_address).text(),
+                                                {}, {"robot_id": 1, "branch": "b", "runs": 1})
+                created_task_ids.append(int(response.text))
+
+        def read_tasks():
+            transport = Transport(TransportConfig(), server.get_mock_adapter())
+            while not writers_done.is_set():
+                response, _ = transport.request("GET",
+                                                RequestUrls.get_all_tasks(server_address).text(),
+                                                {"Accept": MediaTypes.json})
+                task_ids = [task_dict["task_id"] for task_dict in response.json()]
+                if response.status_code != 200 or task_ids != sorted(set(task_ids)):
+                    read_failures.append(response.status_code)
+
+        reader = threading.Thread(target=read_tasks)
+        reader.start()
+        writers = [threading.Thread(target=create_tasks) for _ in range(8)]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+        writers_done.set()
+        reader.join()
+
+        self.assertEqual(sorted(created_task_ids), list(range(1701, 2101)))
+        self.assertEqual(read_failures, [])
+        stats_response, _ = Transport(TransportConfig(), server.get_mock_adapter()).request(
+            "GET", RequestUrls.get_fleet_stats(server_address).text(), {})
+        self.assertEqual(stats_response.json()["total"]["tasks"], 407)
+
+
+class TestTaskListFormats(unittest.TestCase):
+    def setUp(self):
+        self.session = Connect().execute("--simulate-tasks 500")
+
+    def test_server_encodes_task_lists_as_accepted(self):
+        server_address = "https-mock://server.ai:5000"
+        server = ServerMock(server_address, SimulationConfig(task_count=500))
+        transport = Transport(TransportConfig(), server.get_mock_adapter())
+        request_url = RequestUrls.get_all_tasks(server_address).text()
+
+        json_response, _ = transport.request("GET", request_url,
+                                             {"Accept": MediaTypes.json,
+                                              "Accept-Encoding": "identity"})
+        columns_response, _ = transport.request("GET", request_url,
+                                                {"Accept": MediaTypes.task_columns,
+                                                 "Accept-Encoding": "gzip"})
+
+        self.assertEqual(json_response.headers["Content-Type"], MediaTypes.json)
+        self.assertNotIn("Content-Encoding", json_response.headers)
+        self.assertEqual(columns_response.headers["Content-Type"], MediaTypes.task_columns)
+        self.assertEqual(columns_response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(task_codec.decode_tasks(columns_response.content),
+                         [Task.from_dict(task_dict) for task_dict in json_response.json()])
+
+    def test_columns_decode_to_equal_tasks_and_tables(self):
+        tasks = self.session.get_many_tasks(None, None, False)
+
+        self.assertEqual(len(tasks), 500)
+        self.assertEqual(list(self.session.get_many_tasks(None, None, False, as_table=True)),
+                         tasks)
+        self.assertEqual(list(self.session.iter_tasks(None, None, 200, False)), tasks)
+
+    def test_columns_hold_projected_fields(self):
+        task_filter = TaskFilter(fields=["task_id", "status"], limit=3)
+
+        projected_tasks = self.session.get_many_tasks(None, None, False, task_filter=task_filter)
+
+        self.assertEqual(projected_tasks,
+                         [{"task_id": task.task_id, "status": task.status}
+                          for task in self.session.get_many_tasks(None, None, False)[:3]])
+
+    def test_compression_and_columns_reduce_response_size(self):
+        def get_response_bytes(task_list_format: str, compress: bool) -> float:
+            metrics = MetricsRegistry()
+            session = ClientSession("server.ai", 5000, False,
+                                    simulation=SimulationConfig(task_count=1000), metrics=metrics,
+                                    transport_config=TransportConfig(compress=compress),
+                                    task_list_format=task_list_format)
+            session.get_many_tasks(None, None, False)
+            return [histogram["sum"] for histogram in
+                    metrics.to_dict()["histograms"]["client_response_bytes"]
+                    if histogram["labels"]["endpoint"] == "tasks"][0]
+
+        plain_bytes = get_response_bytes(MediaTypes.json, compress=False)
+        compressed_bytes = get_response_bytes(MediaTypes.json, compress=True)
+        columns_bytes = get_response_bytes(MediaTypes.task_columns, compress=False)
+        compressed_columns_bytes = get_response_bytes(MediaTypes.task_columns, compress=True)
+
+        self.assertLess(compressed_bytes * 4, plain_bytes)
+        self.assertLess(columns_bytes * 2, plain_bytes)
+        self.assertLess(compressed_columns_bytes, compressed_bytes)
+
+
+class TestAdvanceTask(WithClientSessionFixture):
+    def test_moves_task_through_all_statuses(self):
+        created_task_id = CreateTask().execute("Karl git_branch 10", self.session)
+
+        running_task = AdvanceTask().execute(str(created_task_id), self.session)
+        finished_task = AdvanceTask().execute(str(created_task_id), self.session)
+
+        self.assertEqual(running_task.status, "running")
+        self.assertEqual(finished_task.status, "finished")
+        self.assertLessEqual(finished_task.successes, finished_task.attempts)
+
+
+class TestAdvanceClock(unittest.TestCase):
+    def setUp(self):
+        self.session = Connect().execute(arguments="--simulate-tasks 50 --simulate-robots 2")
+
+    def test_finishes_created_task(self):
+        robot_name = self.session.get_robot_dict(False)[0]
+        created_task_id = CreateTask().execute(f"{robot_name} git_branch 1", self.session)
+
+        AdvanceClock().execute(str(30 * 24 * 3600), self.session)
+
+        self.assertEqual(self.session.get_task(created_task_id, False).status, "finished")
+
+    def test_raises_if_server_runs_no_simulation(self):
+        session = Connect().execute(arguments="")
+
+        self.assertRaises(ExecutionError, AdvanceClock().execute, "60", session)
+
+    def test_injects_configured_failures(self):
+        session = Connect().execute(arguments="--simulate-tasks 1 --failure-rate robots=1")
+
+        self.assertRaises(ExecutionError, session.get_robot_dict, False)
+
+
+class TestWatchTasks(WithClientSessionFixture):
+    def test_returns_status_changes_until_tasks_finish(self):
+        def advance_tasks_later():
+            time.sleep(0.1)
+            self.session.advance_mock_task(789)
+            self.session.advance_mock_task(1024)
+
+        advancing_thread = threading.Thread(target=advance_tasks_later)
+        advancing_thread.start()
+        self.addCleanup(advancing_thread.join)
+
+        tasks = list(WatchTasks().execute("789 1024 --timeout 5", self.session))
+
+        self.assertEqual([task.status for task in tasks[:2]], ["running", "running"])
+        self.assertEqual({task.task_id for task in tasks[2:]}, {789, 1024})
+        self.assertTrue(all(task.status == "finished" for task in tasks[2:]))
+
+    def test_stops_after_timeout(self):
+        start_time = time.monotonic()
+
+        tasks = list(WatchTasks().execute("1024 --timeout 0.2", self.session))
+
+        self.assertEqual([task.task_id for task in tasks], [1024])
+        self.assertLess(time.monotonic() - start_time, 2)
+
+
+class TestGetTaskStats(WithClientSessionFixture):
+    def test_computes_success_rates_per_robot(self):
+        task_stats = GetTaskStats().execute("", self.session)
+
+        molly_summary = task_stats["robots"]["Molly"]
+        self.assertEqual(molly_summary["tasks"], 3)
+        self.assertEqual(molly_summary["runs"], 65)
+        self.assertAlmostEqual(molly_summary["success_rate"], (18 + 5) / (23 + 16))
+        self.assertEqual(task_stats["total"]["finished"], 4)
+
+    def test_computes_attempt_percentiles_of_finished_tasks(self):
+        task_stats = GetTaskStats().execute("--percentiles 0 100", self.session)
+
+        self.assertEqual(task_stats["attempt_percentiles"], {0.0: 6.0, 100.0: 75.0})
+
+    def test_raises_if_percentile_is_out_of_range(self):
+        self.assertRaises(ExecutionError, GetTaskStats().execute, "--percentiles 50 150",
+                          self.session)
+        self.assertRaises(ExecutionError, GetTaskStats().execute, "--percentiles -1",
+                          self.session)
+
+
+class TestGetFleetStats(unittest.TestCase):
+    def test_matches_stats_computed_from_all_tasks(self):
+        session = Connect().execute("--simulate-tasks 300 --simulate-robots 3")
+        AdvanceClock().execute("3600", session)
+        CreateTask().execute("Robot0001 git_branch 10", session)
+
+        fleet_stats = GetFleetStats().execute("", session)
+
+        task_stats = GetTaskStats().execute("", session)
+        self.assertEqual(fleet_stats["total"], task_stats["total"])
+        self.assertEqual(fleet_stats["robots"], task_stats["robots"])
+        self.assertEqual(fleet_stats["branches"], task_stats["branches"])
+        self.assertEqual(sum(fleet_stats["statuses"].values()), 301)
+
+    def test_follows_advanced_task(self):
+        session = Connect().execute("")
+        AdvanceTask().execute("789", session)
+
+        fleet_stats = GetFleetStats().execute("", session)
+
+        self.assertEqual(fleet_stats["statuses"], {"finished": 5, "waiting": 1, "running": 1})
+        self.assertEqual(fleet_stats["robots"]["Doretta"]["finished"], 2)
+
+
+class TestGetCacheStats(unittest.TestCase):
+    def test_counts_repeated_lookup_as_hit(self):
+        session = Connect().execute(arguments="--cache-size 10")
+
+        list(GetTask().execute("1", session))
+        list(GetTask().execute("1", session))
+        cache_stats = GetCacheStats().execute("", session)
+
+        self.assertEqual(cache_stats["misses"], 1)
+        self.assertEqual(cache_stats["hits"], 1)
+
+    def test_created_task_is_visible_in_cached_query(self):
+        session = Connect().execute(arguments="--cache-size 10")
+        task_count = len(list(GetManyTasks().execute("", session)))
+
+        CreateTask().execute("Karl git_branch 10", session)
+
+        self.assertEqual(len(list(GetManyTasks().execute("", session))), task_count + 1)
+
+    def test_advanced_task_is_visible_in_cached_lookup(self):
+        session = Connect().execute(arguments="--cache-size 10 --cache-ttl 60")
+        list(GetTask().execute("789", session))
+
+        AdvanceTask().execute("789", session)
+
+        self.assertEqual(next(GetTask().execute("789", session)).value.status, "finished")
+
+    def test_task_changed_by_clock_is_visible_in_cached_lookup(self):
+        session = Connect().execute(arguments="--cache-size 10 --cache-ttl 60 "
+                                              "--simulate-tasks 50 --simulate-robots 2")
+        created_task_id = CreateTask().execute("Robot0000 git_branch 1", session)
+        list(GetTask().execute(str(created_task_id), session))
+
+        AdvanceClock().execute(str(30 * 24 * 3600), session)
+
+        self.assertEqual(next(GetTask().execute(str(created_task_id), session)).value.status,
+                         "finished")
+
+    def test_raises_if_cache_disabled(self):
+        session = Connect().execute(arguments="")
+
+        self.assertRaises(ExecutionError, GetCacheStats().execute, "", session)
+
+
+class TestGetStats(unittest.TestCase):
+    def setUp(self):
+        registry.clear()
+        self.session = Connect().execute(arguments="")
+
+    def test_records_request_phases_and_status_codes(self):
+        list(GetTask().execute("1 2", self.session))
+
+        stats = GetStats().execute("")
+
+        request_counts = {histogram["labels"]["endpoint"]: histogram["count"]
+                          for histogram in stats["histograms"]["client_request_seconds"]}
+        self.assertEqual(request_counts, {"info": 1, "tasks": 2})
+        parsed_commands = [histogram["labels"]["command"]
+                           for histogram in stats["histograms"]["command_parse_seconds"]]
+        self.assertIn("GetTask", parsed_commands)
+        task_status_counts = {counter["labels"]["status"]: counter["value"]
+                              for counter in stats["counters"]["client_responses_total"]
+                              if counter["labels"]["endpoint"] == "tasks"}
+        self.assertEqual(task_status_counts, {"200": 1, "404": 1})
+
+    def test_reports_metrics_of_session_with_own_registry(self):
+        metrics = MetricsRegistry()
+        session = ClientSession("server.ai", 5000, False, metrics=metrics)
+        list(GetTask().execute("1", session))
+
+        stats = GetStats().execute("", session)
+
+        parsed_commands = [histogram["labels"]["command"]
+                           for histogram in stats["histograms"]["command_parse_seconds"]]
+        self.assertEqual(sorted(parsed_commands), ["GetStats", "GetTask"])
+        self.assertEqual(stats, metrics.to_dict())
+        self.assertNotIn("GetTask", [histogram["labels"]["command"] for histogram in
+                                     registry.to_dict()["histograms"]["command_parse_seconds"]])
+
+    def test_exports_prometheus_text_and_resets(self):
+        prometheus_text = GetStats().execute("--format prometheus --reset")
+
+        self.assertIn("# TYPE client_request_seconds histogram", prometheus_text)
+        self.assertIn('client_request_seconds_count{endpoint="info",method="GET"} 1',
+                      prometheus_text)
+        self.assertEqual(GetStats().execute("")["counters"], {})
+
+
+class TestLazyLoading(unittest.TestCase):
+    def test_startup_loads_no_command_dependencies(self):
+        check = "import sys, run; print(sorted({'requests', 'numpy', 'server_mock', " \
+                "'commands.get_task_stats'} & set(sys.modules)))"
+        repository_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+        output = subprocess.run([sys.executable, "-c", check], cwd=repository_path,
+                                capture_output=True, text=True, check=True).stdout
+
+        self.assertEqual(output.strip(), "[]")
+
+    def test_connects_with_lazily_created_command(self):
+        from user_interface import UserInterface
+        command_registry = UserInterface.build_command_registry()
+
+        session = command_registry["connect"].execute("")
+
+        self.assertIs(command_registry["connect"], command_registry["connect"])
+        self.assertEqual(command_registry["get_robots"].execute("", session)[3], "Karl")
 
 
 if __name__ == '__main__':
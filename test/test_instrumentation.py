@@ -0,0 +1,66 @@
+import unittest
+
+from instrumentation import Histogram, MetricsRegistry
+
+
+class TestHistogram(unittest.TestCase):
+    def test_counts_values_in_buckets_up_to_their_bounds(self):
+        histogram = Histogram(bounds=(1, 10))
+        for value in [0.5, 1, 5, 20]:
+            histogram.observe(value)
+
+        self.assertEqual(histogram.get_cumulative_counts(), [(1, 2), (10, 3), (float("inf"), 4)])
+
+    def test_estimates_percentiles_with_bucket_bounds_capped_at_maximum(self):
+        histogram = Histogram(bounds=(1, 10))
+        for value in [0.5, 0.6, 0.7, 4]:
+            histogram.observe(value)
+
+        stats = histogram.get_stats()
+
+        self.assertEqual(stats["p50"], 1)
+        self.assertEqual(stats["p99"], 4)
+        self.assertEqual(stats["count"], 4)
+        self.assertAlmostEqual(stats["mean"], 1.45)
+
+    def test_has_no_percentiles_without_values(self):
+        self.assertIsNone(Histogram(bounds=(1,)).get_stats()["p50"])
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_keeps_separate_metrics_per_label_values(self):
+        registry = MetricsRegistry()
+        registry.increment("responses", {"status": 200})
+        registry.increment("responses", {"status": 200})
+        registry.increment("responses", {"status": 404})
+
+        counters = registry.to_dict()["counters"]["responses"]
+
+        self.assertEqual(counters, [{"labels": {"status": "200"}, "value": 2},
+                                    {"labels": {"status": "404"}, "value": 1}])
+
+    def test_times_block_even_if_it_raises(self):
+        registry = MetricsRegistry()
+
+        with self.assertRaises(ValueError):
+            with registry.time("phase"):
+                raise ValueError
+
+        self.assertEqual(registry.to_dict()["histograms"]["phase"][0]["count"], 1)
+
+    def test_formats_prometheus_histogram_with_escaped_labels(self):
+        registry = MetricsRegistry()
+        registry.observe("size", 300, {"name": 'a"b'}, bounds=(256, 1024))
+
+        lines = registry.to_prometheus().splitlines()
+
+        self.assertEqual(lines, ["# TYPE size histogram",
+                                 'size_bucket{name="a\\"b",le="256"} 0',
+                                 'size_bucket{name="a\\"b",le="1024"} 1',
+                                 'size_bucket{name="a\\"b",le="+Inf"} 1',
+                                 'size_sum{name="a\\"b"} 300.0',
+                                 'size_count{name="a\\"b"} 1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from local_store import LocalTaskStore
+from task import Task
+
+
+class TestLocalTaskStore(unittest.TestCase):
+    def setUp(self):
+        file_descriptor, self.path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(file_descriptor)
+        self.addCleanup(os.remove, self.path)
+        self.store = LocalTaskStore(self.path)
+        self.addCleanup(self.store.close)
+        self.tasks = [Task(1, 100, 0, 10, "dev"), Task(2, 200, 1, 5, "main")]
+
+    def test_loads_saved_tasks_after_reopening(self):
+        self.store.save_tasks("server", self.tasks, 300, is_full_sync=True)
+        self.store.close()
+
+        reopened_store = LocalTaskStore(self.path)
+        self.addCleanup(reopened_store.close)
+
+        self.assertEqual(reopened_store.load_tasks("server"), (self.tasks, 300))
+
+    def test_delta_sync_overwrites_changed_tasks(self):
+        self.store.save_tasks("server", self.tasks, 300, is_full_sync=True)
+        changed_task = Task(2, 200, 1, 5, "main")
+        changed_task.status = "running"
+
+        self.store.save_tasks("server", [changed_task], 301, is_full_sync=False)
+
+        self.assertEqual(self.store.load_tasks("server"), ([self.tasks[0], changed_task], 301))
+
+    def test_loads_nothing_for_other_server(self):
+        self.store.save_tasks("server", self.tasks, 300, is_full_sync=True)
+        self.store.save_robots("server", {0: "Molly"}, 300)
+
+        self.assertEqual(self.store.load_tasks("other_server"), ([], None))
+        self.assertEqual(self.store.load_robots("other_server", 300), {})
+
+    def test_loads_robots_only_for_the_same_modification_time(self):
+        self.store.save_robots("server", {0: "Molly", 1: "Bosco"}, 300)
+
+        self.assertEqual(self.store.load_robots("server", 300), {0: "Molly", 1: "Bosco"})
+        self.assertEqual(self.store.load_robots("server", 301), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import http.client
+import unittest
+
+import requests
+
+from api import RequestUrls
+from commands import Connect, CreateTask, GetTask
+from mock_http_server import MockHttpServer
+from mock_simulation import SimulationConfig
+
+
+class TestMockHttpServer(unittest.TestCase):
+    def setUp(self):
+        self.server = MockHttpServer(port=0)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.session = Connect().execute(f"--real-http --host 127.0.0.1 "
+                                         f"--port {self.server.get_port()}")
+
+    def test_serves_sessions_over_http(self):
+        task_id = CreateTask().execute("Karl git_branch 10", self.session)
+
+        other_session = Connect().execute(f"--real-http --host 127.0.0.1 "
+                                          f"--port {self.server.get_port()}")
+        results = list(GetTask().execute(f"1 {task_id}", other_session))
+
+        self.assertEqual(self.session.get_address(), self.server.get_address())
+        self.assertEqual([result.value.task_id for result in results], [1, task_id])
+        self.assertEqual(results[1].value.robot_id, 3)
+
+    def test_passes_on_compressed_columns(self):
+        server = MockHttpServer(port=0, simulation=SimulationConfig(task_count=500))
+        server.start()
+        self.addCleanup(server.stop)
+        arguments = f"--real-http --host 127.0.0.1 --port {server.get_port()}"
+        columns_session = Connect().execute(arguments)
+        json_session = Connect().execute(f"{arguments} --task-format json --no-compression")
+
+        tasks = columns_session.get_many_tasks(None, None, False)
+
+        self.assertEqual(len(tasks), 500)
+        self.assertEqual(tasks, json_session.get_many_tasks(None, None, False))
+
+    def test_reports_unknown_endpoints_and_tasks(self):
+        response = requests.get(f"{self.server.get_address()}/unknown")
+        self.assertEqual(response.status_code, 404)
+
+        results = list(GetTask().execute("9999", self.session))
+        self.assertIsNotNone(results[0].error)
+
+    def test_keeps_connection_usable_after_not_modified_response(self):
+        connection = http.client.HTTPConnection("127.0.0.1", self.server.get_port(), timeout=5)
+        self.addCleanup(connection.close)
+        connection.request("GET", "/stats")
+        response = connection.getresponse()
+        entity_tag = response.getheader("ETag")
+        response.read()
+
+        connection.request("GET", "/stats", headers={"If-None-Match": entity_tag})
+        not_modified_response = connection.getresponse()
+        not_modified_body = not_modified_response.read()
+        connection.request("GET", "/robots")
+        robots_response = connection.getresponse()
+
+        self.assertEqual(not_modified_response.status, 304)
+        self.assertEqual(not_modified_body, b"")
+        self.assertIsNone(not_modified_response.getheader("Content-Length"))
+        self.assertEqual(robots_response.status, 200)
+        self.assertEqual(robots_response.read(), b"Molly Bosco Doretta Karl")
+
+    def test_rejects_malformed_advance_request_bodies(self):
+        url = RequestUrls.advance_task(self.server.get_address()).text()
+
+        for body in (b"{", b"[1]", b"7"):
+            with self.subTest(body=body):
+                response = requests.post(url, data=body,
+                                         headers={"Content-Type": "application/json"})
+                self.assertEqual(response.status_code, 400)
+
+        task_id = CreateTask().execute("Karl git_branch 10", self.session)
+        self.assertEqual(requests.post(url, json={"task_id": task_id}).status_code, 200)
@@ -0,0 +1,43 @@
+import unittest
+
+from mock_simulation import SimulationConfig, TaskLifecycleSimulator
+from task import Task
+
+
+class TestTaskLifecycleSimulator(unittest.TestCase):
+    def setUp(self):
+        self.config = SimulationConfig(seed=7, robot_count=3, task_count=200,
+                                       history_seconds=100000, seconds_per_run=60)
+
+    def test_generates_the_same_history_for_the_same_seed(self):
+        first_history = TaskLifecycleSimulator(self.config, start_time=10 ** 6).make_history()
+        second_history = TaskLifecycleSimulator(self.config, start_time=10 ** 6).make_history()
+
+        self.assertEqual(first_history, second_history)
+
+    def test_history_holds_at_most_one_running_task_per_robot(self):
+        tasks = TaskLifecycleSimulator(self.config, start_time=10 ** 6).make_history()
+
+        running_robot_ids = [task.robot_id for task in tasks.values() if task.status == "running"]
+        self.assertEqual(len(running_robot_ids), len(set(running_robot_ids)))
+        self.assertTrue(all(task.successes <= task.attempts for task in tasks.values()
+                            if task.status == "finished"))
+
+    def test_runs_and_finishes_task_as_clock_advances(self):
+        simulator = TaskLifecycleSimulator(SimulationConfig(robot_count=1, task_count=0,
+                                                            seconds_per_run=60),
+                                           start_time=1000)
+        task = Task(1, creation_time=1000, robot_id=0, runs=2, branch="dev")
+        tasks = {task.task_id: task}
+
+        started = simulator.advance(tasks, 60)
+        for transition in started:
+            simulator.apply_transition(task, *transition[1:])
+        finished = simulator.advance(tasks, 60)
+
+        self.assertEqual(started, [(1, "running", None, None)])
+        self.assertEqual([transition[:2] for transition in finished], [(1, "finished")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import threading
+import time
+import unittest
+
+from read_write_lock import ReadWriteLock
+
+
+class TestReadWriteLock(unittest.TestCase):
+    def setUp(self):
+        self.lock = ReadWriteLock()
+
+    def test_lets_readers_in_together(self):
+        both_reading = threading.Barrier(2, timeout=5)
+
+        def read():
+            with self.lock.reading():
+                both_reading.wait()
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        read()
+        reader.join()
+
+    def test_writer_waits_for_readers_and_keeps_new_readers_out(self):
+        events = []
+        reading = threading.Event()
+
+        def write():
+            reading.wait()
+            with self.lock.writing():
+                events.append("write")
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        with self.lock.reading():
+            reading.set()
+            time.sleep(0.1)
+            events.append("read")
+        writer.join()
+        with self.lock.reading():
+            events.append("read")
+
+        self.assertEqual(events, ["read", "write", "read"])
+
+    def test_writing_is_reentrant(self):
+        with self.lock.writing():
+            with self.lock.writing():
+                with self.lock.reading():
+                    pass
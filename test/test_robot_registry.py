@@ -0,0 +1,27 @@
+import unittest
+
+from robot_registry import RobotRegistry
+
+
+class TestRobotRegistry(unittest.TestCase):
+    def setUp(self):
+        self.robot_registry = RobotRegistry(["Molly", "Bosco", "Doretta"])
+
+    def test_maps_names_and_ids_both_ways(self):
+        self.assertEqual(self.robot_registry.get_id("Doretta"), 2)
+        self.assertEqual(self.robot_registry.get_name(1), "Bosco")
+
+    def test_returns_none_for_unknown_robots(self):
+        self.assertIsNone(self.robot_registry.get_id("Karl"))
+        self.assertIsNone(self.robot_registry.get_name(3))
+        self.assertIsNone(self.robot_registry.get_name(-1))
+
+    def test_converts_to_and_from_dict_of_names_by_id(self):
+        robot_dict = self.robot_registry.to_dict()
+
+        self.assertEqual(robot_dict, {0: "Molly", 1: "Bosco", 2: "Doretta"})
+        self.assertEqual(list(RobotRegistry.from_dict(robot_dict)), list(self.robot_registry))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,14 @@
+import unittest
+
+from task import Task
+
+
+class TestTask(unittest.TestCase):
+    def test_equal_tasks_are_interchangeable_in_sets_and_dicts(self):
+        task = Task(1, 100, robot_id=0, runs=5, branch="b")
+        same_task = Task.from_dict(task.to_dict())
+        finished_task = Task.from_dict(dict(task.to_dict(), status="finished"))
+
+        self.assertEqual(len({task, same_task}), 1)
+        self.assertEqual({task: "value"}[same_task], "value")
+        self.assertEqual(len({task, finished_task}), 2)
@@ -0,0 +1,42 @@
+import unittest
+
+from task import Task
+from task_aggregates import TaskAggregates
+
+
+def make_task(task_id: int, robot_id: int, branch: str, status: str = "waiting") -> Task:
+    task = Task(task_id, creation_time=1000 + task_id, robot_id=robot_id, runs=10, branch=branch)
+    task.status = status
+    return task
+
+
+class TestTaskAggregates(unittest.TestCase):
+    def setUp(self):
+        self.tasks = [make_task(1, 0, "dev"), make_task(2, 1, "dev"), make_task(3, 0, "main")]
+        self.aggregates = TaskAggregates(self.tasks)
+
+    def test_summarizes_added_tasks(self):
+        stats = self.aggregates.to_dict()
+
+        self.assertEqual(stats["statuses"], {"waiting": 3})
+        self.assertEqual(stats["total"]["runs"], 30)
+        self.assertEqual(stats["robots"][0]["tasks"], 2)
+        self.assertEqual(stats["branches"]["dev"]["tasks"], 2)
+        self.assertIsNone(stats["total"]["success_rate"])
+
+    def test_follows_task_changes(self):
+        task = self.tasks[2]
+        self.aggregates.remove(task)
+        task.status = "finished"
+        task.attempts = 20
+        task.successes = 15
+        self.aggregates.add(task)
+
+        stats = self.aggregates.to_dict()
+
+        self.assertEqual(stats["statuses"], {"waiting": 2, "finished": 1})
+        self.assertEqual(stats["robots"][0],
+                         {"tasks": 2, "finished": 1, "runs": 20, "attempts": 20,
+                          "successes": 15, "success_rate": 0.75})
+        self.assertEqual(stats["branches"]["main"]["success_rate"], 0.75)
+        self.assertEqual(stats["total"]["finished"], 1)
@@ -0,0 +1,62 @@
+import unittest
+
+from task_cache import TaskCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTaskCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.mod_time = 100
+        self.mod_time_requests = 0
+        self.cache = TaskCache(max_size=2, ttl=10, clock=self.clock)
+
+    def fetch_mod_time(self) -> int:
+        self.mod_time_requests += 1
+        return self.mod_time
+
+    def test_serves_entry_without_validation_within_ttl(self):
+        self.cache.get("a", self.fetch_mod_time)
+        self.cache.put("a", 1)
+
+        self.assertEqual(self.cache.get("a", self.fetch_mod_time), 1)
+        self.assertEqual(self.mod_time_requests, 1)
+
+    def test_revalidates_entry_after_ttl(self):
+        self.cache.get("a", self.fetch_mod_time)
+        self.cache.put("a", 1)
+        self.clock.now = 11
+
+        self.assertEqual(self.cache.get("a", self.fetch_mod_time), 1)
+        self.assertEqual(self.mod_time_requests, 2)
+
+    def test_drops_entries_if_modification_time_changed(self):
+        self.cache.get("a", self.fetch_mod_time)
+        self.cache.put("a", 1)
+        self.clock.now = 11
+        self.mod_time = 101
+
+        self.assertIsNone(self.cache.get("a", self.fetch_mod_time))
+        self.assertEqual(self.cache.get_stats()["invalidations"], 1)
+
+    def test_evicts_least_recently_used_entry(self):
+        self.cache.get("a", self.fetch_mod_time)
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.cache.get("a", self.fetch_mod_time)
+        self.cache.put("c", 3)
+
+        self.assertIsNone(self.cache.get("b", self.fetch_mod_time))
+        self.assertEqual(self.cache.get("a", self.fetch_mod_time), 1)
+        self.assertEqual(self.cache.get_stats()["evictions"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
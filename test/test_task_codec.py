@@ -0,0 +1,88 @@
+import gc
+import json
+import struct
+import threading
+import unittest
+
+import task_codec
+from task import Task
+
+
+def make_task(task_id: int, branch: str, status: str, attempts: int = None,
+              successes: int = None) -> Task:
+    task = Task(task_id, creation_time=1000 + task_id, robot_id=task_id % 2, runs=10,
+                branch=branch)
+    task.status = status
+    task.attempts = attempts
+    task.successes = successes
+    return task
+
+
+def replace_header(content: bytes, change) -> bytes:
+    """:param change: callable changing the decoded header in place."""
+    (header_length,) = struct.unpack_from("<I", content)
+    header = json.loads(content[4:4 + header_length])
+    change(header)
+    new_header = json.dumps(header).encode()
+    return struct.pack("<I", len(new_header)) + new_header + content[4 + header_length:]
+
+
+class TestTaskCodec(unittest.TestCase):
+    def setUp(self):
+        self.tasks = [make_task(1, "dev", "finished", attempts=12, successes=10),
+                      make_task(2, "dev", "running"),
+                      make_task(3, "main", "finished", attempts=20, successes=0)]
+
+    def test_decodes_equal_tasks(self):
+        content = task_codec.encode_task_dicts([task.to_dict() for task in self.tasks])
+
+        self.assertEqual(task_codec.decode_tasks(content), self.tasks)
+
+    def test_decodes_projected_fields_as_dicts(self):
+        task_dicts = [{"task_id": task.task_id, "status": task.status, "attempts": task.attempts}
+                      for task in self.tasks]
+
+        content = task_codec.encode_task_dicts(task_dicts)
+
+        self.assertEqual(task_codec.decode_dicts(content), task_dicts)
+        self.assertRaises(ValueError, task_codec.decode_tasks, content)
+
+    def test_decodes_empty_list(self):
+        self.assertEqual(task_codec.decode_tasks(task_codec.encode_task_dicts([])), [])
+
+    def test_is_smaller_than_json(self):
+        many_tasks = [make_task(task_id, "configs_dev_0_1_2", "waiting")
+                      for task_id in range(1000)]
+        task_dicts = [task.to_dict() for task in many_tasks]
+
+        content = task_codec.encode_task_dicts(task_dicts)
+
+        self.assertLess(len(content) * 2, len(str(task_dicts)))
+
+    def test_raises_value_error_for_truncated_content(self):
+        content = task_codec.encode_task_dicts([task.to_dict() for task in self.tasks])
+
+        self.assertRaises(ValueError, task_codec.decode_tasks, content[:-1])
+        self.assertRaises(ValueError, task_codec.decode_tasks, content[:2])
+
+    def test_raises_value_error_for_invalid_dictionaries(self):
+        content = task_codec.encode_task_dicts([task.to_dict() for task in self.tasks])
+
+        without_dictionaries = replace_header(content, lambda header: header.pop("dictionaries"))
+        short_dictionary = replace_header(
+            content, lambda header: header["dictionaries"].update(branch=["dev"]))
+
+        self.assertRaises(ValueError, task_codec.decode_tasks, without_dictionaries)
+        self.assertRaises(ValueError, task_codec.decode_tasks, short_dictionary)
+
+    def test_restores_garbage_collection_after_concurrent_decodes(self):
+        content = task_codec.encode_task_dicts([task.to_dict() for task in self.tasks] * 1000)
+        threads = [threading.Thread(target=task_codec.decode_tasks, args=(content,))
+                   for _ in range(8)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(gc.isenabled())
@@ -0,0 +1,55 @@
+import unittest
+
+from task import Task
+from task_index import TaskIndex
+
+
+class TestTaskIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TaskIndex()
+        self.index.add(Task(3, 300, robot_id=0, runs=1, branch="b"))
+        self.index.add(Task(1, 100, robot_id=0, runs=1, branch="b"))
+        self.index.add(Task(2, 200, robot_id=1, runs=1, branch="b"))
+
+    def test_selects_all_ids_in_order_without_filters(self):
+        self.assertEqual(self.index.select(), [1, 2, 3])
+
+    def test_intersects_robot_and_status_filters(self):
+        self.index.update_status(3, "waiting", "finished")
+
+        self.assertEqual(self.index.select(robot_id=0, status="finished"), [3])
+        self.assertEqual(self.index.select(robot_id=0, status="waiting"), [1])
+
+    def test_selects_ids_by_value_ranges_and_branch_prefix(self):
+        self.index.add(Task(4, 400, robot_id=1, runs=5, branch="configs_b"))
+        self.index.add(Task(5, 500, robot_id=1, runs=9, branch="configs_a"))
+
+        self.assertEqual(self.index.select(creation_time_range=(200, 400)), [2, 3, 4])
+        self.assertEqual(self.index.select(runs_range=(5, None)), [4, 5])
+        self.assertEqual(self.index.select(branch_prefix="configs"), [4, 5])
+        self.assertEqual(self.index.select(robot_id=1, runs_range=(None, 5),
+                                           branch_prefix="configs"), [4])
+
+    def test_indexes_initial_tasks_like_added_ones(self):
+        tasks = [Task(task_id, 1000 - task_id, robot_id=task_id % 2, runs=task_id % 3,
+                      branch=f"b{task_id % 4}") for task_id in (5, 1, 4, 2, 3)]
+        added_index = TaskIndex()
+        for task in tasks:
+            added_index.add(task)
+
+        initial_index = TaskIndex(tasks)
+
+        self.assertEqual(initial_index.select(), [1, 2, 3, 4, 5])
+        self.assertEqual(initial_index.select(robot_id=1, runs_range=(1, 2)),
+                         added_index.select(robot_id=1, runs_range=(1, 2)))
+        self.assertEqual(initial_index.select(branch_prefix="b1"), [1, 5])
+        self.assertEqual(list(initial_index.iter_ordered("runs")),
+                         list(added_index.iter_ordered("runs")))
+
+    def test_iterates_ids_in_field_order(self):
+        self.assertEqual(list(self.index.iter_ordered("creation_time", descending=True)),
+                         [3, 2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import threading
+import unittest
+
+from task import Task
+from task_store import TaskStore
+
+
+class TestTaskStore(unittest.TestCase):
+    def setUp(self):
+        self.store = TaskStore([Task(1, 0, 0, 1, "a"), Task(20, 0, 1, 2, "b")], shard_count=4)
+
+    def test_allocates_ids_after_greatest_id(self):
+        self.assertEqual(self.store.allocate_id(), 21)
+        self.assertEqual(self.store.allocate_id(), 22)
+        self.assertEqual(TaskStore(next_id=1701).allocate_id(), 1701)
+
+    def test_allocates_unique_ids_to_concurrent_threads(self):
+        allocated_ids = []
+
+        def allocate_ids():
+            allocated_ids.extend([self.store.allocate_id() for _ in range(1000)])
+
+        threads = [threading.Thread(target=allocate_ids) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(allocated_ids), list(range(21, 8021)))
+
+    def test_gets_tasks_in_requested_order(self):
+        self.assertEqual(self.store.get(20).branch, "b")
+        self.assertIsNone(self.store.get(2))
+        self.assertEqual([task and task.task_id for task in self.store.get_many([20, 3, 1, 20])],
+                         [20, None, 1, 20])
+
+    def test_unlocked_read_gets_the_same_tasks(self):
+        self.assertEqual(self.store.get_many_unlocked([20, 3, 1]),
+                         self.store.get_many([20, 3, 1]))
+
+    def test_replaces_task_with_same_id(self):
+        changed_task = Task(1, 0, 0, 1, "a")
+        changed_task.status = "running"
+
+        self.store.put(changed_task)
+        self.store.put(Task(5, 0, 0, 1, "c"))
+
+        self.assertIs(self.store.get(1), changed_task)
+        self.assertEqual(len(self.store), 3)
+        self.assertIn(5, self.store)
+        self.assertNotIn("5", self.store)
+
+    def test_snapshot_is_not_affected_by_later_puts(self):
+        snapshot = self.store.snapshot()
+        self.store.put(Task(2, 0, 0, 1, "c"))
+
+        self.assertEqual(sorted(snapshot), [1, 20])
+        self.assertEqual(len(self.store.snapshot()), 3)
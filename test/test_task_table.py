@@ -0,0 +1,52 @@
+import unittest
+
+import task_codec
+from task import Task
+from task_table import TaskTable
+
+
+def make_task(task_id: int, robot_id: int, branch: str, status: str, attempts: int = None,
+              successes: int = None) -> Task:
+    task = Task(task_id, creation_time=1000 + task_id, robot_id=robot_id, runs=10, branch=branch)
+    task.status = status
+    task.attempts = attempts
+    task.successes = successes
+    return task
+
+
+class TestTaskTable(unittest.TestCase):
+    def setUp(self):
+        self.tasks = [make_task(1, 0, "dev", "finished", attempts=12, successes=10),
+                      make_task(2, 1, "dev", "running"),
+                      make_task(3, 0, "main", "finished", attempts=20, successes=5)]
+        self.table = TaskTable.from_tasks(self.tasks)
+
+    def test_iterates_over_equal_tasks(self):
+        self.assertEqual(list(self.table), self.tasks)
+
+    def test_wraps_columnar_encoded_tasks(self):
+        content = task_codec.encode_task_dicts([task.to_dict() for task in self.tasks])
+
+        table = TaskTable.from_columns(content)
+
+        self.assertEqual(list(table), self.tasks)
+        self.assertEqual(table.group_sum("branch", "successes"), {"dev": 10, "main": 5})
+
+    def test_filters_rows_matching_all_values(self):
+        filtered_table = self.table.where(robot_id=0, status="finished", branch="main")
+
+        self.assertEqual([task.task_id for task in filtered_table], [3])
+
+    def test_filter_with_unknown_value_matches_no_rows(self):
+        self.assertEqual(len(self.table.where(status="cancelled")), 0)
+
+    def test_sums_skip_missing_values(self):
+        self.assertEqual(self.table.sum("attempts"), 32)
+
+    def test_sums_values_per_group(self):
+        self.assertEqual(self.table.group_sum("branch", "successes"), {"dev": 10, "main": 5})
+        self.assertEqual(self.table.group_sum("robot_id", "runs"), {0: 20, 1: 10})
+
+
+if __name__ == '__main__':
+    unittest.main()
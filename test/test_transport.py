@@ -0,0 +1,72 @@
+import unittest
+
+import requests
+import requests_mock
+
+from transport import Transport, TransportConfig, get_shared_transport
+
+
+class TestTransport(unittest.TestCase):
+    def setUp(self):
+        self.delays = []
+        self.adapter = requests_mock.Adapter()
+        self.config = TransportConfig(max_retries=2, backoff_factor=0.1)
+        self.transport = Transport(self.config, self.adapter, sleep=self.delays.append)
+        self.url = "https-mock://server.ai:5000/tasks"
+
+    def test_retries_server_errors_with_exponential_backoff(self):
+        self.adapter.register_uri("GET", self.url, [{"status_code": 503},
+                                                    {"status_code": 500},
+                                                    {"status_code": 200, "text": "ok"}])
+
+        response, retry_count = self.transport.request("GET", self.url, headers={})
+
+        self.assertEqual(response.text, "ok")
+        self.assertEqual(retry_count, 2)
+        self.assertEqual(self.delays, [0.1, 0.2])
+
+    def test_returns_last_failure_when_retries_run_out(self):
+        self.adapter.register_uri("GET", self.url, status_code=500)
+
+        response, retry_count = self.transport.request("GET", self.url, headers={})
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(retry_count, 2)
+
+    def test_does_not_retry_post_requests(self):
+        self.adapter.register_uri("POST", self.url, status_code=500)
+
+        response, retry_count = self.transport.request("POST", self.url, headers={}, json={})
+
+        self.assertEqual(retry_count, 0)
+        self.assertEqual(self.adapter.call_count, 1)
+
+    def test_retries_timeouts_and_raises_the_last_one(self):
+        self.adapter.register_uri("GET", self.url, exc=requests.exceptions.ConnectTimeout)
+
+        self.assertRaises(requests.Timeout, self.transport.request, "GET", self.url, {})
+        self.assertEqual(self.adapter.call_count, 3)
+
+    def test_extends_timeout_of_long_polls_and_does_not_retry_them(self):
+        self.adapter.register_uri("GET", self.url, exc=requests.exceptions.ReadTimeout)
+
+        self.assertRaises(requests.ReadTimeout, self.transport.request, "GET", self.url, {},
+                          server_wait=5)
+        self.assertEqual(self.adapter.call_count, 1)
+        self.assertEqual(self.adapter.last_request.timeout, self.config.timeout + 5)
+
+
+class TestSharedTransport(unittest.TestCase):
+    def test_shares_transport_between_sessions_with_equal_address_and_config(self):
+        config = TransportConfig(use_real_http=True)
+        transport = get_shared_transport("http://server.ai:5000", config)
+
+        self.assertIs(get_shared_transport("http://server.ai:5000", TransportConfig(
+            use_real_http=True)), transport)
+        self.assertIsNot(get_shared_transport("http://server.ai:5001", config), transport)
+        self.assertIsNot(get_shared_transport("http://server.ai:5000", TransportConfig(
+            use_real_http=True, pool_size=20)), transport)
+
+
+if __name__ == '__main__':
+    unittest.main()
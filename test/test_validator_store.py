@@ -0,0 +1,25 @@
+import unittest
+
+from validator_store import ValidatorStore
+
+
+class TestValidatorStore(unittest.TestCase):
+    def setUp(self):
+        self.store = ValidatorStore(max_size=2)
+
+    def test_returns_tag_and_value_of_last_response(self):
+        self.store.put("a", "\"v1\"", 1)
+        self.store.put("a", "\"v2\"", 2)
+
+        self.assertEqual(self.store.get("a"), ("\"v2\"", 2))
+        self.assertEqual(self.store.get("b"), (None, None))
+
+    def test_evicts_least_recently_used_entry(self):
+        self.store.put("a", "\"a\"", 1)
+        self.store.put("b", "\"b\"", 2)
+        self.store.get("a")
+        self.store.put("c", "\"c\"", 3)
+
+        self.assertEqual(self.store.get("b"), (None, None))
+        self.assertEqual(self.store.get("a"), ("\"a\"", 1))
+        self.assertEqual(len(self.store), 2)
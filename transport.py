@@ -0,0 +1,106 @@
+import threading
+import time
+from typing import Any, Callable
+
+import requests
+import requests.adapters
+
+
+class TransportConfig:
+    """
+    Connection settings of the Server transport.
+
+    :param pool_size: maximum number of kept connections per host.
+    :param keep_alive: whether connections are reused between requests.
+    :param max_retries: number of times a GET request is repeated after a 5xx response, a timeout
+        or a connection error. Other methods are not retried, as they are not idempotent.
+    :param backoff_factor: the n-th retry waits backoff_factor * 2 ** (n - 1) seconds.
+    :param timeout: seconds to wait for the connection and for the response.
+    :param use_real_http: send requests over the network with the http scheme, instead of
+        serving them in process by a mock Server.
+    :param compress: let the Server gzip-compress responses.
+    """
+
+    retried_status_codes = (500, 502, 503, 504)
+
+    def __init__(self, pool_size: int = 10, keep_alive: bool = True, max_retries: int = 2,
+                 backoff_factor: float = 0.05, timeout: float = 10.0,
+                 use_real_http: bool = False, compress: bool = True) -> None:
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.use_real_http = use_real_http
+        self.compress = compress
+
+    def get_scheme(self) -> str:
+        return "http" if self.use_real_http else "https-mock"
+
+    def get_key(self) -> tuple:
+        return (self.pool_size, self.keep_alive, self.max_retries, self.backoff_factor,
+                self.timeout, self.use_real_http, self.compress)
+
+
+class Transport:
+    """A requests Session with connection pooling, timeouts and retries. Safe to share."""
+
+    def __init__(self, config: TransportConfig, adapter: requests.adapters.BaseAdapter,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        self._config = config
+        self._sleep = sleep
+        self._session = requests.Session()
+        self._session.mount(f"{config.get_scheme()}://", adapter)
+        if not config.keep_alive:
+            self._session.headers["Connection"] = "close"
+        if not config.compress:
+            self._session.headers["Accept-Encoding"] = "identity"
+
+    def request(self, method: str, url: str, headers: dict, json: Any = None,
+                server_wait: float = 0) -> tuple:
+        """
+        Sends the request, retrying failures of idempotent requests with exponential backoff.
+
+        :param server_wait: seconds the Server may hold the request before responding, like in
+            long polls. It is added to the response timeout, and such requests are not retried
+            after timing out, as the Server may have been waiting as asked.
+        :return: last response and the number of retries
+        :raises requests.RequestException: if the last attempt timed out or could not connect.
+        """
+        retry_count = 0
+        while True:
+            try:
+                response = self._session.request(method, url, headers=headers, json=json,
+                                                 timeout=self._config.timeout + server_wait)
+                if not self._should_retry(method, retry_count) or \
+                        response.status_code not in TransportConfig.retried_status_codes:
+                    return response, retry_count
+            except requests.ReadTimeout:
+                if server_wait > 0 or not self._should_retry(method, retry_count):
+                    raise
+            except (requests.Timeout, requests.ConnectionError):
+                if not self._should_retry(method, retry_count):
+                    raise
+            self._sleep(self._config.backoff_factor * 2 ** retry_count)
+            retry_count += 1
+
+    def _should_retry(self, method: str, retry_count: int) -> bool:
+        return method == "GET" and retry_count < self._config.max_retries
+
+
+_shared_transports = {}
+_shared_transports_lock = threading.Lock()
+
+
+def get_shared_transport(server_address: str, config: TransportConfig) -> Transport:
+    """
+    :return: transport over pooled real HTTP connections, shared by all sessions with the same
+        Server address and config
+    """
+    key = (server_address, config.get_key())
+    with _shared_transports_lock:
+        if key not in _shared_transports:
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1,
+                                                    pool_maxsize=config.pool_size)
+            _shared_transports[key] = Transport(config, adapter)
+        return _shared_transports[key]
@@ -1,6 +1,9 @@
 import cmd
+import json
+from typing import Iterable
 
-import commands
+from commands.command_base import get_metrics
+from commands.command_registry import CommandRegistry
 from exceptions import ExecutionError, ParserExitWarning, ParsingError
 
 
@@ -42,7 +45,7 @@ class UserInterface(cmd.Cmd):
         self.intro = self.__make_welcome_message()
         self._was_exit_called = False
         self._client_session = None
-        self._commands = self._build_command_dict()
+        self._commands = self.build_command_registry()
 
     def has_session(self) -> bool:
         return self._client_session is not None
@@ -69,6 +72,17 @@ class UserInterface(cmd.Cmd):
         created_task_id = self._commands["create_task"].execute(arguments, self._client_session)
         print(f"Created new Task with id: {created_task_id}")
 
+    @requires_session
+    @raises_command_exceptions
+    def do_create_tasks(self, arguments: str) -> None:
+        """Sends Task creation requests for records of a CSV or JSON lines file."""
+        results = self._commands["create_tasks"].execute(arguments, self._client_session)
+        for record_number, (task_id, error_reason) in enumerate(results, start=1):
+            if task_id is None:
+                print(f"Record {record_number} rejected: {error_reason}")
+            else:
+                print(f"Created new Task with id: {task_id}")
+
     @requires_session
     @raises_command_exceptions
     def do_get_robots(self, arguments: str) -> None:
@@ -79,17 +93,90 @@ class UserInterface(cmd.Cmd):
     @requires_session
     @raises_command_exceptions
     def do_get_task(self, arguments: str) -> None:
-        """Requests one Task by its id and prints it."""
-        task = self._commands["get_task"].execute(arguments, self._client_session)
-        print(task.__dict__)
+        """Requests Tasks one by one by their ids and prints them."""
+        results = self._commands["get_task"].execute(arguments, self._client_session)
+        self._print_task_results(results)
+
+    @requires_session
+    @raises_command_exceptions
+    def do_get_tasks(self, arguments: str) -> None:
+        """Requests many Tasks by their ids in a single request and prints them."""
+        task_list, missing_ids = self._commands["get_tasks"].execute(arguments,
+                                                                     self._client_session)
+        for task in task_list:
+            print(task.to_dict())
+        if missing_ids:
+            print(f"Tasks not found: {missing_ids}")
 
     @requires_session
     @raises_command_exceptions
     def do_get_many_tasks(self, arguments: str) -> None:
         """Queries Tasks using given filter parameters and prints them."""
-        task_list = self._commands["get_many_tasks"].execute(arguments, self._client_session)
-        for task in task_list:
-            print(task.__dict__)
+        results = self._commands["get_many_tasks"].execute(arguments, self._client_session)
+        self._print_task_results(results)
+
+    @requires_session
+    @raises_command_exceptions
+    def do_watch_tasks(self, arguments: str) -> None:
+        """Prints the Tasks, and then each of their status changes, until all of them finish."""
+        tasks = self._commands["watch_tasks"].execute(arguments, self._client_session)
+        for task in tasks:
+            print(task.to_dict())
+
+    @requires_session
+    @raises_command_exceptions
+    def do_advance_task(self, arguments: str) -> None:
+        """Makes the mock Server move a Task to its next status."""
+        task = self._commands["advance_task"].execute(arguments, self._client_session)
+        print(f"Task {task.task_id} is now {task.status}")
+
+    @requires_session
+    @raises_command_exceptions
+    def do_advance_clock(self, arguments: str) -> None:
+        """Moves the simulation clock of the mock Server forward."""
+        change_count = self._commands["advance_clock"].execute(arguments, self._client_session)
+        print(f"Task state changes: {change_count}")
+
+    @requires_session
+    @raises_command_exceptions
+    def do_task_stats(self, arguments: str) -> None:
+        """Prints evaluation success rates and run totals of the queried Tasks."""
+        task_stats = self._commands["task_stats"].execute(arguments, self._client_session)
+        print(f"Total: {task_stats['total']}")
+        print(f"Attempts per finished Task percentiles: {task_stats['attempt_percentiles']}")
+        print("Per robot:")
+        for robot_name, summary in task_stats["robots"].items():
+            print(f"    {robot_name}: {summary}")
+        print("Per branch:")
+        for branch, summary in task_stats["branches"].items():
+            print(f"    {branch}: {summary}")
+
+    @requires_session
+    @raises_command_exceptions
+    def do_fleet_stats(self, arguments: str) -> None:
+        """Prints Task counts per status and success rates of all Tasks, aggregated by Server."""
+        fleet_stats = self._commands["fleet_stats"].execute(arguments, self._client_session)
+        print(f"Total: {fleet_stats['total']}")
+        print(f"Tasks per status: {fleet_stats['statuses']}")
+        print("Per robot:")
+        for robot_name, summary in fleet_stats["robots"].items():
+            print(f"    {robot_name}: {summary}")
+        print("Per branch:")
+        for branch, summary in fleet_stats["branches"].items():
+            print(f"    {branch}: {summary}")
+
+    @requires_session
+    @raises_command_exceptions
+    def do_cache_stats(self, arguments: str) -> None:
+        """Prints the Task cache hit, miss and eviction counters."""
+        cache_stats = self._commands["cache_stats"].execute(arguments, self._client_session)
+        print(cache_stats)
+
+    @raises_command_exceptions
+    def do_stats(self, arguments: str) -> None:
+        """Prints request phase timings, response sizes and status code counts."""
+        stats = self._commands["stats"].execute(arguments, self._client_session)
+        print(stats if isinstance(stats, str) else json.dumps(stats, indent=2))
 
     def do_exit(self, _) -> None:
         """Sets the exit flag, resulting in program termination. Ignores any arguments."""
@@ -108,6 +195,14 @@ class UserInterface(cmd.Cmd):
         print_command("help", "Displays this message.")
         print_command("exit", "Sets the exit flag, resulting in program termination.")
 
+    def onecmd(self, line: str) -> bool:
+        """Records the time each command takes, with its output. Overridden method."""
+        command_name = self.parseline(line)[0]
+        if command_name not in self._commands:
+            command_name = "other"
+        with get_metrics(self._client_session).time("command_seconds", {"command": command_name}):
+            return super().onecmd(line)
+
     def postcmd(self, _1: bool, _2: str) -> bool:
         """Triggers main interface loop termination if exit flag was set. Overridden method."""
         if self._was_exit_called:
@@ -116,6 +211,17 @@ class UserInterface(cmd.Cmd):
             print()
         return self._was_exit_called
 
+    @staticmethod
+    def _print_task_results(results: Iterable) -> None:
+        """Prints Tasks from command ItemResults, and the errors of the items that failed."""
+        for result in results:
+            if result.error is None:
+                print(result.value if isinstance(result.value, dict) else result.value.to_dict())
+            elif result.item is None:
+                print(result.error)
+            else:
+                print(f"{result.item}: {result.error}")
+
     @staticmethod
     def __make_welcome_message() -> str:
         message = "\nRobot Test API Demo\n"
@@ -126,11 +232,19 @@ class UserInterface(cmd.Cmd):
         return message
 
     @staticmethod
-    def _build_command_dict() -> dict:
-        return {"connect": commands.Connect(),
-                "get_modification_time": commands.GetModificationTime(),
-                "get_robots": commands.GetRobots(),
-                "create_task": commands.CreateTask(),
-                "get_task": commands.GetTask(),
-                "get_many_tasks": commands.GetManyTasks(),
-                }
+    def build_command_registry() -> CommandRegistry:
+        return CommandRegistry({"connect": "Connect",
+                                "get_modification_time": "GetModificationTime",
+                                "get_robots": "GetRobots",
+                                "create_task": "CreateTask",
+                                "create_tasks": "CreateTasks",
+                                "get_task": "GetTask",
+                                "get_tasks": "GetTasks",
+                                "get_many_tasks": "GetManyTasks",
+                                "watch_tasks": "WatchTasks",
+                                "advance_task": "AdvanceTask",
+                                "advance_clock": "AdvanceClock",
+                                "task_stats": "GetTaskStats",
+                                "fleet_stats": "GetFleetStats",
+                                "cache_stats": "GetCacheStats",
+                                "stats": "GetStats"})
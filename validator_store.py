@@ -0,0 +1,34 @@
+import collections
+import threading
+from typing import Any, Hashable
+
+
+class ValidatorStore:
+    """
+    Bounded LRU store of the entity tags of Server responses, with the values decoded from them.
+    A value is reused when the Server confirms with 304 Not Modified that its tag is still
+    current, so that repeated reads only transfer headers. Safe to share between threads.
+    """
+
+    def __init__(self, max_size: int = 256) -> None:
+        self._entries = collections.OrderedDict()
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> tuple:
+        """:return: entity tag and decoded value of the last response, or (None, None)"""
+        with self._lock:
+            if key not in self._entries:
+                return None, None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Hashable, entity_tag: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (entity_tag, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)